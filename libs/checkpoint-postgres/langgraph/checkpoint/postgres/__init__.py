@@ -14,6 +14,7 @@ from langgraph.checkpoint.base import (
     ChannelVersions,
     Checkpoint,
     CheckpointMetadata,
+    CheckpointMetadataTuple,
     CheckpointTuple,
     get_checkpoint_id,
     get_checkpoint_metadata,
@@ -22,6 +23,7 @@ from langgraph.checkpoint.postgres import _internal
 from langgraph.checkpoint.postgres.base import BasePostgresSaver
 from langgraph.checkpoint.postgres.shallow import ShallowPostgresSaver
 from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.delta import AppendLog
 
 Conn = _internal.Conn  # For backward compatibility
 
@@ -36,8 +38,10 @@ class PostgresSaver(BasePostgresSaver):
         conn: _internal.Conn,
         pipe: Optional[Pipeline] = None,
         serde: Optional[SerializerProtocol] = None,
+        append_log: Optional[AppendLog] = None,
     ) -> None:
         super().__init__(serde=serde)
+        self.append_log = append_log
         if isinstance(conn, ConnectionPool) and pipe is not None:
             raise ValueError(
                 "Pipeline should be used only with a single Connection, not ConnectionPool."
@@ -138,40 +142,60 @@ class PostgresSaver(BasePostgresSaver):
             [CheckpointTuple(...), ...]
         """
         where, args = self._search_where(config, filter, before)
-        query = self.SELECT_SQL + where + " ORDER BY checkpoint_id DESC"
+        query = self.SELECT_CHECKPOINTS_SQL + where + " ORDER BY checkpoint_id DESC"
         if limit:
             query += f" LIMIT {limit}"
-        # if we change this to use .stream() we need to make sure to close the cursor
+        # blobs and writes are fetched for the whole page at once, rather than
+        # with correlated subqueries per checkpoint
         with self._cursor() as cur:
             cur.execute(query, args, binary=True)
-            for value in cur:
-                yield CheckpointTuple(
-                    {
-                        "configurable": {
-                            "thread_id": value["thread_id"],
-                            "checkpoint_ns": value["checkpoint_ns"],
-                            "checkpoint_id": value["checkpoint_id"],
-                        }
-                    },
-                    self._load_checkpoint(
-                        value["checkpoint"],
-                        value["channel_values"],
-                        value["pending_sends"],
-                    ),
-                    self._load_metadata(value["metadata"]),
-                    (
-                        {
-                            "configurable": {
-                                "thread_id": value["thread_id"],
-                                "checkpoint_ns": value["checkpoint_ns"],
-                                "checkpoint_id": value["parent_checkpoint_id"],
-                            }
-                        }
-                        if value["parent_checkpoint_id"]
-                        else None
-                    ),
-                    self._load_writes(value["pending_writes"]),
-                )
+            rows = cur.fetchall()
+            if not rows:
+                return
+            cur.execute(
+                self.SELECT_BLOBS_BATCH_SQL, self._batch_blob_args(rows), binary=True
+            )
+            blobs = self._index_blobs(cur.fetchall())
+            if snapshot_args := self._batch_snapshot_args(blobs):
+                cur.execute(self.SELECT_BLOBS_BATCH_SQL, snapshot_args, binary=True)
+                blobs.update(self._index_blobs(cur.fetchall()))
+            cur.execute(
+                self.SELECT_WRITES_BATCH_SQL, self._batch_write_args(rows), binary=True
+            )
+            write_rows = cur.fetchall()
+        yield from self._load_checkpoint_tuples(rows, blobs, write_rows)
+
+    def list_metadata(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointMetadataTuple]:
+        """List the metadata of checkpoints from the database.
+
+        Like `list`, but only reads the checkpoints table, without loading
+        channel values or pending writes.
+
+        Args:
+            config: The config to use for listing the checkpoints.
+            filter: Additional filtering criteria for metadata. Defaults to None.
+            before: If provided, only checkpoints before the specified checkpoint ID are returned. Defaults to None.
+            limit: The maximum number of checkpoints to return. Defaults to None.
+
+        Yields:
+            Iterator[CheckpointMetadataTuple]: An iterator of checkpoint metadata tuples.
+        """
+        where, args = self._search_where(config, filter, before)
+        query = self.SELECT_METADATA_SQL + where + " ORDER BY checkpoint_id DESC"
+        if limit:
+            query += f" LIMIT {limit}"
+        with self._cursor() as cur:
+            cur.execute(query, args, binary=True)
+            rows = cur.fetchall()
+        for row in rows:
+            yield self._load_metadata_tuple(row)
 
     def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
         """Get a checkpoint tuple from the database.
@@ -226,6 +250,16 @@ class PostgresSaver(BasePostgresSaver):
             )
 
             for value in cur:
+                checkpoint = self._load_checkpoint(
+                    value["checkpoint"],
+                    value["channel_values"],
+                    value["pending_sends"],
+                )
+                if snapshot_args := self._snapshot_args(
+                    thread_id, checkpoint_ns, checkpoint["channel_values"]
+                ):
+                    cur.execute(self.SELECT_SNAPSHOTS_SQL, snapshot_args, binary=True)
+                    self._load_snapshots(checkpoint["channel_values"], cur.fetchall())
                 return CheckpointTuple(
                     {
                         "configurable": {
@@ -234,11 +268,7 @@ class PostgresSaver(BasePostgresSaver):
                             "checkpoint_id": value["checkpoint_id"],
                         }
                     },
-                    self._load_checkpoint(
-                        value["checkpoint"],
-                        value["channel_values"],
-                        value["pending_sends"],
-                    ),
+                    checkpoint,
                     self._load_metadata(value["metadata"]),
                     (
                         {
@@ -302,6 +332,22 @@ class PostgresSaver(BasePostgresSaver):
             }
         }
 
+        if bases := self._cached_bases(thread_id, checkpoint_ns, new_versions):
+            with self._cursor() as cur:
+                cur.execute(
+                    self.SELECT_BLOB_VERSIONS_SQL,
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        [k for k, _ in bases],
+                        [v for _, v in bases],
+                    ),
+                )
+                self._discard_missing_snapshots(
+                    thread_id, checkpoint_ns, bases, cur.fetchall()
+                )
+
+        snapshots: dict = {}
         with self._cursor(pipeline=True) as cur:
             cur.executemany(
                 self.UPSERT_CHECKPOINT_BLOBS_SQL,
@@ -310,6 +356,7 @@ class PostgresSaver(BasePostgresSaver):
                     checkpoint_ns,
                     copy.pop("channel_values"),  # type: ignore[misc]
                     new_versions,
+                    snapshots,
                 ),
             )
             cur.execute(
@@ -323,6 +370,8 @@ class PostgresSaver(BasePostgresSaver):
                     self._dump_metadata(get_checkpoint_metadata(config, metadata)),
                 ),
             )
+        if self.append_log is not None:
+            self.append_log.commit(snapshots)
         return next_config
 
     def put_writes(
@@ -359,6 +408,23 @@ class PostgresSaver(BasePostgresSaver):
                 ),
             )
 
+    def put_writes_batch(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Sequence[tuple[str, Any]], str]],
+    ) -> None:
+        """Store intermediate writes of several tasks linked to the same checkpoint.
+
+        The writes of all tasks are saved in a single pipeline.
+
+        Args:
+            config: Configuration of the related checkpoint.
+            writes: List of (task_id, writes, task_path) tuples, one per task.
+        """
+        with self._cursor(pipeline=True) as cur:
+            for query, params in self._dump_writes_batch(config, writes):
+                cur.executemany(query, params)
+
     def delete_thread(self, thread_id: str) -> None:
         """Delete all checkpoints and writes associated with a thread ID.
 
@@ -381,6 +447,8 @@ class PostgresSaver(BasePostgresSaver):
                 "DELETE FROM checkpoint_writes WHERE thread_id = %s",
                 (str(thread_id),),
             )
+        if self.append_log is not None:
+            self.append_log.forget(str(thread_id))
 
     @contextmanager
     def _cursor(self, *, pipeline: bool = False) -> Iterator[Cursor[DictRow]]:
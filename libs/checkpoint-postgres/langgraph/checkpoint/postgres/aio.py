@@ -14,6 +14,7 @@ from langgraph.checkpoint.base import (
     ChannelVersions,
     Checkpoint,
     CheckpointMetadata,
+    CheckpointMetadataTuple,
     CheckpointTuple,
     get_checkpoint_id,
     get_checkpoint_metadata,
@@ -22,6 +23,7 @@ from langgraph.checkpoint.postgres import _ainternal
 from langgraph.checkpoint.postgres.base import BasePostgresSaver
 from langgraph.checkpoint.postgres.shallow import AsyncShallowPostgresSaver
 from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.delta import AppendLog
 
 Conn = _ainternal.Conn  # For backward compatibility
 
@@ -36,8 +38,10 @@ class AsyncPostgresSaver(BasePostgresSaver):
         conn: _ainternal.Conn,
         pipe: Optional[AsyncPipeline] = None,
         serde: Optional[SerializerProtocol] = None,
+        append_log: Optional[AppendLog] = None,
     ) -> None:
         super().__init__(serde=serde)
+        self.append_log = append_log
         if isinstance(conn, AsyncConnectionPool) and pipe is not None:
             raise ValueError(
                 "Pipeline should be used only with a single AsyncConnection, not AsyncConnectionPool."
@@ -125,41 +129,65 @@ class AsyncPostgresSaver(BasePostgresSaver):
             AsyncIterator[CheckpointTuple]: An asynchronous iterator of matching checkpoint tuples.
         """
         where, args = self._search_where(config, filter, before)
-        query = self.SELECT_SQL + where + " ORDER BY checkpoint_id DESC"
+        query = self.SELECT_CHECKPOINTS_SQL + where + " ORDER BY checkpoint_id DESC"
         if limit:
             query += f" LIMIT {limit}"
-        # if we change this to use .stream() we need to make sure to close the cursor
+        # blobs and writes are fetched for the whole page at once, rather than
+        # with correlated subqueries per checkpoint
         async with self._cursor() as cur:
             await cur.execute(query, args, binary=True)
-            async for value in cur:
-                yield CheckpointTuple(
-                    {
-                        "configurable": {
-                            "thread_id": value["thread_id"],
-                            "checkpoint_ns": value["checkpoint_ns"],
-                            "checkpoint_id": value["checkpoint_id"],
-                        }
-                    },
-                    await asyncio.to_thread(
-                        self._load_checkpoint,
-                        value["checkpoint"],
-                        value["channel_values"],
-                        value["pending_sends"],
-                    ),
-                    self._load_metadata(value["metadata"]),
-                    (
-                        {
-                            "configurable": {
-                                "thread_id": value["thread_id"],
-                                "checkpoint_ns": value["checkpoint_ns"],
-                                "checkpoint_id": value["parent_checkpoint_id"],
-                            }
-                        }
-                        if value["parent_checkpoint_id"]
-                        else None
-                    ),
-                    await asyncio.to_thread(self._load_writes, value["pending_writes"]),
+            rows = await cur.fetchall()
+            if not rows:
+                return
+            await cur.execute(
+                self.SELECT_BLOBS_BATCH_SQL, self._batch_blob_args(rows), binary=True
+            )
+            blobs = self._index_blobs(await cur.fetchall())
+            if snapshot_args := self._batch_snapshot_args(blobs):
+                await cur.execute(
+                    self.SELECT_BLOBS_BATCH_SQL, snapshot_args, binary=True
                 )
+                blobs.update(self._index_blobs(await cur.fetchall()))
+            await cur.execute(
+                self.SELECT_WRITES_BATCH_SQL, self._batch_write_args(rows), binary=True
+            )
+            write_rows = await cur.fetchall()
+        for value in await asyncio.to_thread(
+            self._load_checkpoint_tuples, rows, blobs, write_rows
+        ):
+            yield value
+
+    async def alist_metadata(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointMetadataTuple]:
+        """List the metadata of checkpoints from the database asynchronously.
+
+        Like `alist`, but only reads the checkpoints table, without loading
+        channel values or pending writes.
+
+        Args:
+            config: Base configuration for filtering checkpoints.
+            filter: Additional filtering criteria for metadata.
+            before: If provided, only checkpoints before the specified checkpoint ID are returned. Defaults to None.
+            limit: Maximum number of checkpoints to return.
+
+        Yields:
+            AsyncIterator[CheckpointMetadataTuple]: An asynchronous iterator of checkpoint metadata tuples.
+        """
+        where, args = self._search_where(config, filter, before)
+        query = self.SELECT_METADATA_SQL + where + " ORDER BY checkpoint_id DESC"
+        if limit:
+            query += f" LIMIT {limit}"
+        async with self._cursor() as cur:
+            await cur.execute(query, args, binary=True)
+            rows = await cur.fetchall()
+        for row in rows:
+            yield self._load_metadata_tuple(row)
 
     async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
         """Get a checkpoint tuple from the database asynchronously.
@@ -193,6 +221,23 @@ class AsyncPostgresSaver(BasePostgresSaver):
             )
 
             async for value in cur:
+                checkpoint = await asyncio.to_thread(
+                    self._load_checkpoint,
+                    value["checkpoint"],
+                    value["channel_values"],
+                    value["pending_sends"],
+                )
+                if snapshot_args := self._snapshot_args(
+                    thread_id, checkpoint_ns, checkpoint["channel_values"]
+                ):
+                    await cur.execute(
+                        self.SELECT_SNAPSHOTS_SQL, snapshot_args, binary=True
+                    )
+                    await asyncio.to_thread(
+                        self._load_snapshots,
+                        checkpoint["channel_values"],
+                        await cur.fetchall(),
+                    )
                 return CheckpointTuple(
                     {
                         "configurable": {
@@ -201,12 +246,7 @@ class AsyncPostgresSaver(BasePostgresSaver):
                             "checkpoint_id": value["checkpoint_id"],
                         }
                     },
-                    await asyncio.to_thread(
-                        self._load_checkpoint,
-                        value["checkpoint"],
-                        value["channel_values"],
-                        value["pending_sends"],
-                    ),
+                    checkpoint,
                     self._load_metadata(value["metadata"]),
                     (
                         {
@@ -259,6 +299,22 @@ class AsyncPostgresSaver(BasePostgresSaver):
             }
         }
 
+        if bases := self._cached_bases(thread_id, checkpoint_ns, new_versions):
+            async with self._cursor() as cur:
+                await cur.execute(
+                    self.SELECT_BLOB_VERSIONS_SQL,
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        [k for k, _ in bases],
+                        [v for _, v in bases],
+                    ),
+                )
+                self._discard_missing_snapshots(
+                    thread_id, checkpoint_ns, bases, await cur.fetchall()
+                )
+
+        snapshots: dict = {}
         async with self._cursor(pipeline=True) as cur:
             await cur.executemany(
                 self.UPSERT_CHECKPOINT_BLOBS_SQL,
@@ -268,6 +324,7 @@ class AsyncPostgresSaver(BasePostgresSaver):
                     checkpoint_ns,
                     copy.pop("channel_values"),  # type: ignore[misc]
                     new_versions,
+                    snapshots,
                 ),
             )
             await cur.execute(
@@ -281,6 +338,8 @@ class AsyncPostgresSaver(BasePostgresSaver):
                     self._dump_metadata(get_checkpoint_metadata(config, metadata)),
                 ),
             )
+        if self.append_log is not None:
+            self.append_log.commit(snapshots)
         return next_config
 
     async def aput_writes(
@@ -316,6 +375,24 @@ class AsyncPostgresSaver(BasePostgresSaver):
         async with self._cursor(pipeline=True) as cur:
             await cur.executemany(query, params)
 
+    async def aput_writes_batch(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Sequence[tuple[str, Any]], str]],
+    ) -> None:
+        """Store intermediate writes of several tasks linked to the same checkpoint asynchronously.
+
+        The writes of all tasks are saved in a single pipeline.
+
+        Args:
+            config: Configuration of the related checkpoint.
+            writes: List of (task_id, writes, task_path) tuples, one per task.
+        """
+        batches = await asyncio.to_thread(self._dump_writes_batch, config, writes)
+        async with self._cursor(pipeline=True) as cur:
+            for query, params in batches:
+                await cur.executemany(query, params)
+
     async def adelete_thread(self, thread_id: str) -> None:
         """Delete all checkpoints and writes associated with a thread ID.
 
@@ -338,6 +415,8 @@ class AsyncPostgresSaver(BasePostgresSaver):
                 "DELETE FROM checkpoint_writes WHERE thread_id = %s",
                 (str(thread_id),),
             )
+        if self.append_log is not None:
+            self.append_log.forget(str(thread_id))
 
     @asynccontextmanager
     async def _cursor(
@@ -430,6 +509,47 @@ class AsyncPostgresSaver(BasePostgresSaver):
             except StopAsyncIteration:
                 break
 
+    def list_metadata(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointMetadataTuple]:
+        """List the metadata of checkpoints from the database.
+
+        This method is a synchronous wrapper around `alist_metadata`.
+
+        Args:
+            config: Base configuration for filtering checkpoints.
+            filter: Additional filtering criteria for metadata.
+            before: If provided, only checkpoints before the specified checkpoint ID are returned. Defaults to None.
+            limit: Maximum number of checkpoints to return.
+
+        Yields:
+            Iterator[CheckpointMetadataTuple]: An iterator of checkpoint metadata tuples.
+        """
+        try:
+            if asyncio.get_running_loop() is self.loop:
+                raise asyncio.InvalidStateError(
+                    "Synchronous calls to AsyncPostgresSaver are only allowed from a "
+                    "different thread. From the main thread, use the async interface. "
+                    "For example, use `checkpointer.alist_metadata(...)` or `await "
+                    "graph.aget_state_history(...)`."
+                )
+        except RuntimeError:
+            pass
+        aiter_ = self.alist_metadata(config, filter=filter, before=before, limit=limit)
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(
+                    anext(aiter_),  # noqa: F821
+                    self.loop,
+                ).result()
+            except StopAsyncIteration:
+                break
+
     def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
         """Get a checkpoint tuple from the database.
 
@@ -506,6 +626,23 @@ class AsyncPostgresSaver(BasePostgresSaver):
             self.aput_writes(config, writes, task_id, task_path), self.loop
         ).result()
 
+    def put_writes_batch(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Sequence[tuple[str, Any]], str]],
+    ) -> None:
+        """Store intermediate writes of several tasks linked to the same checkpoint.
+
+        This method is a synchronous wrapper around `aput_writes_batch`.
+
+        Args:
+            config: Configuration of the related checkpoint.
+            writes: List of (task_id, writes, task_path) tuples, one per task.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.aput_writes_batch(config, writes), self.loop
+        ).result()
+
     def delete_thread(self, thread_id: str) -> None:
         """Delete all checkpoints and writes associated with a thread ID.
 
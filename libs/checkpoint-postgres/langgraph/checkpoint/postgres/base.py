@@ -1,6 +1,8 @@
 import random
-from collections.abc import Sequence
-from typing import Any, Optional, cast
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from functools import partial
+from typing import Any, Optional, Union, cast
 
 from langchain_core.runnables import RunnableConfig
 from psycopg.types.json import Jsonb
@@ -11,9 +13,13 @@ from langgraph.checkpoint.base import (
     ChannelVersions,
     Checkpoint,
     CheckpointMetadata,
+    CheckpointMetadataTuple,
+    CheckpointTuple,
     get_checkpoint_id,
 )
+from langgraph.checkpoint.serde.delta import AppendLog, Delta, MissingSnapshotError
 from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.serde.lazy import Deferred, LazyDict
 from langgraph.checkpoint.serde.types import TASKS, ChannelProtocol
 
 MetadataInput = Optional[dict[str, Any]]
@@ -107,12 +113,64 @@ select
     ) as pending_sends
 from checkpoints """
 
+SELECT_CHECKPOINTS_SQL = """
+select
+    thread_id,
+    checkpoint,
+    checkpoint_ns,
+    checkpoint_id,
+    parent_checkpoint_id,
+    metadata
+from checkpoints """
+
+SELECT_METADATA_SQL = """
+select
+    thread_id,
+    checkpoint_ns,
+    checkpoint_id,
+    parent_checkpoint_id,
+    metadata,
+    checkpoint ->> 'ts' as ts
+from checkpoints """
+
+SELECT_BLOBS_BATCH_SQL = """
+select bl.thread_id, bl.checkpoint_ns, bl.channel, bl.version, bl.type, bl.blob
+from unnest(%s::text[], %s::text[], %s::text[], %s::text[])
+    as k(thread_id, checkpoint_ns, channel, version)
+inner join checkpoint_blobs bl
+    on bl.thread_id = k.thread_id
+    and bl.checkpoint_ns = k.checkpoint_ns
+    and bl.channel = k.channel
+    and bl.version = k.version
+"""
+
+SELECT_WRITES_BATCH_SQL = f"""
+select cw.thread_id, cw.checkpoint_ns, cw.checkpoint_id, cw.task_id, cw.task_path, cw.idx, cw.channel, cw.type, cw.blob
+from unnest(%s::text[], %s::text[], %s::text[], %s::bool[])
+    as k(thread_id, checkpoint_ns, checkpoint_id, all_writes)
+inner join checkpoint_writes cw
+    on cw.thread_id = k.thread_id
+    and cw.checkpoint_ns = k.checkpoint_ns
+    and cw.checkpoint_id = k.checkpoint_id
+where k.all_writes or cw.channel = '{TASKS}'
+"""
+
 UPSERT_CHECKPOINT_BLOBS_SQL = """
     INSERT INTO checkpoint_blobs (thread_id, checkpoint_ns, channel, version, type, blob)
     VALUES (%s, %s, %s, %s, %s, %s)
     ON CONFLICT (thread_id, checkpoint_ns, channel, version) DO NOTHING
 """
 
+SELECT_SNAPSHOTS_SQL = """
+    SELECT channel, version, type, blob FROM checkpoint_blobs
+    WHERE thread_id = %s AND checkpoint_ns = %s AND channel = ANY(%s) AND version = ANY(%s)
+"""
+
+SELECT_BLOB_VERSIONS_SQL = """
+    SELECT channel, version FROM checkpoint_blobs
+    WHERE thread_id = %s AND checkpoint_ns = %s AND channel = ANY(%s) AND version = ANY(%s)
+"""
+
 UPSERT_CHECKPOINTS_SQL = """
     INSERT INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, checkpoint, metadata)
     VALUES (%s, %s, %s, %s, %s, %s)
@@ -142,12 +200,19 @@ class BasePostgresSaver(BaseCheckpointSaver[str]):
     SELECT_SQL = SELECT_SQL
     MIGRATIONS = MIGRATIONS
     UPSERT_CHECKPOINT_BLOBS_SQL = UPSERT_CHECKPOINT_BLOBS_SQL
+    SELECT_SNAPSHOTS_SQL = SELECT_SNAPSHOTS_SQL
+    SELECT_BLOB_VERSIONS_SQL = SELECT_BLOB_VERSIONS_SQL
+    SELECT_CHECKPOINTS_SQL = SELECT_CHECKPOINTS_SQL
+    SELECT_METADATA_SQL = SELECT_METADATA_SQL
+    SELECT_BLOBS_BATCH_SQL = SELECT_BLOBS_BATCH_SQL
+    SELECT_WRITES_BATCH_SQL = SELECT_WRITES_BATCH_SQL
     UPSERT_CHECKPOINTS_SQL = UPSERT_CHECKPOINTS_SQL
     UPSERT_CHECKPOINT_WRITES_SQL = UPSERT_CHECKPOINT_WRITES_SQL
     INSERT_CHECKPOINT_WRITES_SQL = INSERT_CHECKPOINT_WRITES_SQL
 
     jsonplus_serde = JsonPlusSerializer()
     supports_pipeline: bool
+    append_log: Optional[AppendLog] = None
 
     def _load_checkpoint(
         self,
@@ -171,11 +236,73 @@ class BasePostgresSaver(BaseCheckpointSaver[str]):
     ) -> dict[str, Any]:
         if not blob_values:
             return {}
-        return {
-            k.decode(): self.serde.loads_typed((t.decode(), v))
-            for k, t, v in blob_values
-            if t.decode() != "empty"
-        }
+        values = LazyDict()
+        for k, t, v in blob_values:
+            type_ = t.decode()
+            if type_ == "empty":
+                continue
+            elif AppendLog.is_delta(type_):
+                # resolved against its snapshot by _load_snapshots()
+                values[k.decode()] = AppendLog.loads_delta(self.serde, (type_, v))
+            else:
+                values[k.decode()] = Deferred(
+                    partial(self.serde.loads_typed, (type_, v))
+                )
+        return values
+
+    def _snapshot_args(
+        self, thread_id: str, checkpoint_ns: str, channel_values: dict[str, Any]
+    ) -> Optional[tuple[str, str, list[str], list[str]]]:
+        # dict.items() doesn't resolve the deferred values of a LazyDict
+        deltas = {k: v for k, v in dict.items(channel_values) if isinstance(v, Delta)}
+        if not deltas:
+            return None
+        return (
+            thread_id,
+            checkpoint_ns,
+            list(deltas),
+            [cast(str, d.base_version) for d in deltas.values()],
+        )
+
+    def _load_snapshots(
+        self, channel_values: dict[str, Any], rows: Sequence[dict[str, Any]]
+    ) -> None:
+        snapshots = {(r["channel"], r["version"]): (r["type"], r["blob"]) for r in rows}
+        for k, v in dict.items(channel_values):
+            if isinstance(v, Delta):
+                snapshot = snapshots.get((k, v.base_version))
+                if snapshot is None:
+                    raise MissingSnapshotError(k, v.base_version)
+                channel_values[k] = Deferred(partial(self._apply_delta, v, snapshot))
+
+    def _cached_bases(
+        self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> list[tuple[str, str]]:
+        """Snapshots of the append log that new versions would be deltas against."""
+        if self.append_log is None:
+            return []
+        return [
+            (k, cast(str, v))
+            for k, v in self.append_log.cached_bases(thread_id, checkpoint_ns, versions)
+        ]
+
+    def _discard_missing_snapshots(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        bases: list[tuple[str, str]],
+        rows: Sequence[dict[str, Any]],
+    ) -> None:
+        """Discard cached snapshots of the append log that were deleted from the
+        database, eg. by another saver, so that they're written in full again."""
+        assert self.append_log is not None
+        found = {(r["channel"], r["version"]) for r in rows}
+        self.append_log.discard(
+            thread_id, checkpoint_ns, [k for k, v in bases if (k, v) not in found]
+        )
+
+    def _apply_delta(self, delta: Delta, snapshot: tuple[str, bytes]) -> list:
+        return delta.apply(self.serde.loads_typed(snapshot))
 
     def _dump_blobs(
         self,
@@ -183,10 +310,35 @@ class BasePostgresSaver(BaseCheckpointSaver[str]):
         checkpoint_ns: str,
         values: dict[str, Any],
         versions: ChannelVersions,
+        snapshots: Optional[dict] = None,
     ) -> list[tuple[str, str, str, str, str, Optional[bytes]]]:
         if not versions:
             return []
 
+        if self.append_log is not None and snapshots is not None:
+            return [
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    k,
+                    cast(str, ver),
+                    *(
+                        self.append_log.dumps_typed(
+                            self.serde,
+                            thread_id,
+                            checkpoint_ns,
+                            k,
+                            ver,
+                            values[k],
+                            snapshots,
+                        )
+                        if k in values
+                        else ("empty", None)
+                    ),
+                )
+                for k, ver in versions.items()
+            ]
+
         return [
             (
                 thread_id,
@@ -202,6 +354,190 @@ class BasePostgresSaver(BaseCheckpointSaver[str]):
             for k, ver in versions.items()
         ]
 
+    def _batch_blob_args(
+        self, rows: Sequence[dict[str, Any]]
+    ) -> tuple[list[str], list[str], list[str], list[str]]:
+        """Keys of the blobs referenced by a page of checkpoint rows, deduplicated."""
+        keys = {
+            (row["thread_id"], row["checkpoint_ns"], channel, str(version))
+            for row in rows
+            for channel, version in row["checkpoint"]["channel_versions"].items()
+        }
+        return _unzip4(keys)
+
+    def _batch_write_args(
+        self, rows: Sequence[dict[str, Any]]
+    ) -> tuple[list[str], list[str], list[str], list[bool]]:
+        """Keys of the checkpoints whose writes (or only sends, for parents) are needed."""
+        keys: dict[tuple[str, str, str], bool] = {}
+        for row in rows:
+            if row["parent_checkpoint_id"]:
+                keys.setdefault(
+                    (
+                        row["thread_id"],
+                        row["checkpoint_ns"],
+                        row["parent_checkpoint_id"],
+                    ),
+                    False,
+                )
+        for row in rows:
+            keys[(row["thread_id"], row["checkpoint_ns"], row["checkpoint_id"])] = True
+        return _unzip4((*k, v) for k, v in keys.items())
+
+    def _index_blobs(
+        self, blob_rows: Sequence[dict[str, Any]]
+    ) -> dict[tuple[str, str, str, str], Union[tuple[str, Optional[bytes]], Delta]]:
+        blobs: dict[
+            tuple[str, str, str, str], Union[tuple[str, Optional[bytes]], Delta]
+        ] = {}
+        for r in blob_rows:
+            key = (r["thread_id"], r["checkpoint_ns"], r["channel"], r["version"])
+            if AppendLog.is_delta(r["type"]):
+                blobs[key] = AppendLog.loads_delta(self.serde, (r["type"], r["blob"]))
+            else:
+                blobs[key] = (r["type"], r["blob"])
+        return blobs
+
+    def _batch_snapshot_args(
+        self,
+        blobs: dict[
+            tuple[str, str, str, str], Union[tuple[str, Optional[bytes]], Delta]
+        ],
+    ) -> Optional[tuple[list[str], list[str], list[str], list[str]]]:
+        """Keys of the snapshots of delta blobs, not already fetched."""
+        keys = {
+            (thread_id, checkpoint_ns, channel, cast(str, v.base_version))
+            for (thread_id, checkpoint_ns, channel, _), v in blobs.items()
+            if isinstance(v, Delta)
+        }
+        keys.difference_update(blobs)
+        return _unzip4(keys) if keys else None
+
+    def _load_checkpoint_tuples(
+        self,
+        rows: Sequence[dict[str, Any]],
+        blobs: dict[
+            tuple[str, str, str, str], Union[tuple[str, Optional[bytes]], Delta]
+        ],
+        write_rows: Sequence[dict[str, Any]],
+    ) -> list[CheckpointTuple]:
+        """Assemble checkpoint tuples from a page of rows and its batch-fetched blobs and writes."""
+        writes: dict[tuple[str, str, str], list[dict[str, Any]]] = defaultdict(list)
+        for w in write_rows:
+            writes[(w["thread_id"], w["checkpoint_ns"], w["checkpoint_id"])].append(w)
+        tuples: list[CheckpointTuple] = []
+        for row in rows:
+            thread_id = row["thread_id"]
+            checkpoint_ns = row["checkpoint_ns"]
+            values = LazyDict()
+            for channel, version in row["checkpoint"]["channel_versions"].items():
+                blob = blobs.get((thread_id, checkpoint_ns, channel, str(version)))
+                if blob is None:
+                    continue
+                elif isinstance(blob, Delta):
+                    snapshot = blobs.get(
+                        (
+                            thread_id,
+                            checkpoint_ns,
+                            channel,
+                            cast(str, blob.base_version),
+                        )
+                    )
+                    if (
+                        snapshot is None
+                        or isinstance(snapshot, Delta)
+                        or snapshot[1] is None
+                    ):
+                        raise MissingSnapshotError(channel, blob.base_version)
+                    values[channel] = Deferred(
+                        partial(self._apply_delta, blob, (snapshot[0], snapshot[1]))
+                    )
+                elif blob[0] != "empty" and blob[1] is not None:
+                    values[channel] = Deferred(
+                        partial(self.serde.loads_typed, (blob[0], blob[1]))
+                    )
+            if parent_checkpoint_id := row["parent_checkpoint_id"]:
+                sends = sorted(
+                    (
+                        w
+                        for w in writes.get(
+                            (thread_id, checkpoint_ns, parent_checkpoint_id), ()
+                        )
+                        if w["channel"] == TASKS
+                    ),
+                    key=lambda w: (w["task_path"], w["task_id"], w["idx"]),
+                )
+            else:
+                sends = []
+            pending_writes = sorted(
+                writes.get((thread_id, checkpoint_ns, row["checkpoint_id"]), ()),
+                key=lambda w: (w["task_id"], w["idx"]),
+            )
+            tuples.append(
+                CheckpointTuple(
+                    {
+                        "configurable": {
+                            "thread_id": thread_id,
+                            "checkpoint_ns": checkpoint_ns,
+                            "checkpoint_id": row["checkpoint_id"],
+                        }
+                    },
+                    {
+                        **row["checkpoint"],
+                        "pending_sends": [
+                            self.serde.loads_typed((w["type"], w["blob"]))
+                            for w in sends
+                        ],
+                        "channel_values": values,
+                    },
+                    self._load_metadata(row["metadata"]),
+                    (
+                        {
+                            "configurable": {
+                                "thread_id": thread_id,
+                                "checkpoint_ns": checkpoint_ns,
+                                "checkpoint_id": parent_checkpoint_id,
+                            }
+                        }
+                        if parent_checkpoint_id
+                        else None
+                    ),
+                    [
+                        (
+                            w["task_id"],
+                            w["channel"],
+                            self.serde.loads_typed((w["type"], w["blob"])),
+                        )
+                        for w in pending_writes
+                    ],
+                )
+            )
+        return tuples
+
+    def _load_metadata_tuple(self, row: dict[str, Any]) -> CheckpointMetadataTuple:
+        return CheckpointMetadataTuple(
+            {
+                "configurable": {
+                    "thread_id": row["thread_id"],
+                    "checkpoint_ns": row["checkpoint_ns"],
+                    "checkpoint_id": row["checkpoint_id"],
+                }
+            },
+            self._load_metadata(row["metadata"]),
+            (
+                {
+                    "configurable": {
+                        "thread_id": row["thread_id"],
+                        "checkpoint_ns": row["checkpoint_ns"],
+                        "checkpoint_id": row["parent_checkpoint_id"],
+                    }
+                }
+                if row["parent_checkpoint_id"]
+                else None
+            ),
+            row["ts"],
+        )
+
     def _load_writes(
         self, writes: list[tuple[bytes, bytes, bytes, bytes]]
     ) -> list[tuple[str, str, Any]]:
@@ -241,6 +577,36 @@ class BasePostgresSaver(BaseCheckpointSaver[str]):
             for idx, (channel, value) in enumerate(writes)
         ]
 
+    def _dump_writes_batch(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Sequence[tuple[str, Any]], str]],
+    ) -> list[tuple[str, list[tuple[str, str, str, str, str, int, str, str, bytes]]]]:
+        """Group the writes of several tasks by the query that saves them."""
+        upserts: list[tuple[str, str, str, str, str, int, str, str, bytes]] = []
+        inserts: list[tuple[str, str, str, str, str, int, str, str, bytes]] = []
+        for task_id, task_writes, task_path in writes:
+            params = self._dump_writes(
+                config["configurable"]["thread_id"],
+                config["configurable"]["checkpoint_ns"],
+                config["configurable"]["checkpoint_id"],
+                task_id,
+                task_path,
+                task_writes,
+            )
+            if all(w[0] in WRITES_IDX_MAP for w in task_writes):
+                upserts.extend(params)
+            else:
+                inserts.extend(params)
+        return [
+            (query, params)
+            for query, params in (
+                (self.UPSERT_CHECKPOINT_WRITES_SQL, upserts),
+                (self.INSERT_CHECKPOINT_WRITES_SQL, inserts),
+            )
+            if params
+        ]
+
     def _load_metadata(self, metadata: dict[str, Any]) -> CheckpointMetadata:
         return self.jsonplus_serde.loads(self.jsonplus_serde.dumps(metadata))
 
@@ -303,3 +669,16 @@ class BasePostgresSaver(BaseCheckpointSaver[str]):
             "WHERE " + " AND ".join(wheres) if wheres else "",
             param_values,
         )
+
+
+def _unzip4(rows: Iterable[tuple[Any, Any, Any, Any]]) -> tuple[list, list, list, list]:
+    a: list = []
+    b: list = []
+    c: list = []
+    d: list = []
+    for w, x, y, z in rows:
+        a.append(w)
+        b.append(x)
+        c.append(y)
+        d.append(z)
+    return a, b, c, d
@@ -21,6 +21,8 @@ from langgraph.checkpoint.postgres.aio import (
     AsyncPostgresSaver,
     AsyncShallowPostgresSaver,
 )
+from langgraph.checkpoint.serde.delta import AppendLog
+from langgraph.checkpoint.serde.types import ERROR, TASKS
 from tests.conftest import DEFAULT_POSTGRES_URI
 
 
@@ -296,3 +298,114 @@ async def test_null_chars(saver_name: str, test_data) -> None:
         assert [c async for c in saver.alist(None, filter={"my_key": "abc"})][
             0
         ].metadata["my_key"] == "abc"
+
+
+@pytest.mark.parametrize("saver_name", ["base", "pool", "pipe"])
+async def test_aappend_log(saver_name: str) -> None:
+    async with _saver(saver_name) as saver:
+        saver.append_log = AppendLog(["messages"], snapshot_every=2)
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        version = None
+        messages: list[str] = []
+        expected = []
+        for step in range(5):
+            messages = messages + [f"msg-{step}"]
+            version = saver.get_next_version(version, None)
+            checkpoint = create_checkpoint(checkpoint, None, step)
+            checkpoint["channel_values"] = {"messages": messages}
+            checkpoint["channel_versions"] = {"messages": version}
+            config = await saver.aput(config, checkpoint, {}, {"messages": version})
+            expected.append((config, list(messages)))
+
+        for saved_config, saved_messages in expected:
+            saved = await saver.aget_tuple(saved_config)
+            assert saved.checkpoint["channel_values"]["messages"] == saved_messages
+        assert [
+            c.checkpoint["channel_values"]["messages"]
+            for c in [
+                c
+                async for c in saver.alist({"configurable": {"thread_id": "thread-1"}})
+            ]
+        ] == [m for _, m in reversed(expected)]
+
+
+@pytest.mark.parametrize("saver_name", ["base", "pool", "pipe"])
+async def test_alist_matches_aget_tuple(saver_name: str) -> None:
+    async with _saver(saver_name) as saver:
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        version = None
+        for step in range(4):
+            version = saver.get_next_version(version, None)
+            checkpoint = create_checkpoint(checkpoint, None, step)
+            checkpoint["channel_values"] = {"foo": f"foo-{step}", "bar": step}
+            checkpoint["channel_versions"] = {"foo": version, "bar": version}
+            config = await saver.aput(
+                config, checkpoint, {"step": step}, {"foo": version, "bar": version}
+            )
+            await saver.aput_writes(
+                config, [("foo", f"write-{step}"), (TASKS, f"send-{step}")], "task-1"
+            )
+            await saver.aput_writes(config, [("bar", step)], "task-0")
+
+        listed = [
+            c async for c in saver.alist({"configurable": {"thread_id": "thread-1"}})
+        ]
+        assert len(listed) == 4
+        for tup in listed:
+            assert tup == await saver.aget_tuple(tup.config)
+        assert listed[0].checkpoint["pending_sends"] == ["send-2"]
+        assert listed[0].pending_writes == [
+            ("task-0", "bar", 3),
+            ("task-1", "foo", "write-3"),
+            ("task-1", TASKS, "send-3"),
+        ]
+        assert listed[-1].checkpoint["pending_sends"] == []
+
+        assert [
+            tuple(t)
+            async for t in saver.alist_metadata(
+                {"configurable": {"thread_id": "thread-1"}}
+            )
+        ] == [
+            (t.config, t.metadata, t.parent_config, t.checkpoint["ts"]) for t in listed
+        ]
+        assert [
+            t.config
+            async for t in saver.alist_metadata(
+                {"configurable": {"thread_id": "thread-1"}}, filter={"step": 1}
+            )
+        ] == [listed[2].config]
+
+
+@pytest.mark.parametrize("saver_name", ["base", "pool", "pipe", "shallow"])
+async def test_aput_writes_batch(saver_name: str) -> None:
+    async with _saver(saver_name) as saver:
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        config = await saver.aput(config, empty_checkpoint(), {}, {})
+        await saver.aput_writes_batch(
+            config,
+            [
+                ("task-1", [("foo", 1), ("bar", 2)], ""),
+                ("task-2", [(ERROR, "first")], "path"),
+            ],
+        )
+        # special writes are replaced, regular writes are kept
+        await saver.aput_writes_batch(
+            config,
+            [("task-1", [("foo", 3)], ""), ("task-2", [(ERROR, "second")], "path")],
+        )
+        tup = await saver.aget_tuple(config)
+        assert tup is not None
+        assert sorted(tup.pending_writes) == [
+            ("task-1", "bar", 2),
+            ("task-1", "foo", 1),
+            ("task-2", ERROR, "second"),
+        ]
@@ -19,6 +19,8 @@ from langgraph.checkpoint.base import (
     empty_checkpoint,
 )
 from langgraph.checkpoint.postgres import PostgresSaver, ShallowPostgresSaver
+from langgraph.checkpoint.serde.delta import AppendLog, MissingSnapshotError
+from langgraph.checkpoint.serde.types import ERROR, TASKS
 from tests.conftest import DEFAULT_POSTGRES_URI
 
 
@@ -284,3 +286,144 @@ def test_nonnull_migrations() -> None:
     for migration in PostgresSaver.MIGRATIONS:
         statement = _leading_comment_remover.sub("", migration).split()[0]
         assert statement.strip()
+
+
+@pytest.mark.parametrize("saver_name", ["base", "pool", "pipe"])
+def test_append_log(saver_name: str) -> None:
+    with _saver(saver_name) as saver:
+        saver.append_log = AppendLog(["messages"], snapshot_every=2)
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        version = None
+        messages: list[str] = []
+        expected = []
+        for step in range(5):
+            messages = messages + [f"msg-{step}"]
+            version = saver.get_next_version(version, None)
+            checkpoint = create_checkpoint(checkpoint, None, step)
+            checkpoint["channel_values"] = {"messages": messages}
+            checkpoint["channel_versions"] = {"messages": version}
+            config = saver.put(config, checkpoint, {}, {"messages": version})
+            expected.append((config, list(messages)))
+
+        for saved_config, saved_messages in expected:
+            saved = saver.get_tuple(saved_config)
+            assert saved.checkpoint["channel_values"]["messages"] == saved_messages
+        assert [
+            c.checkpoint["channel_values"]["messages"]
+            for c in saver.list({"configurable": {"thread_id": "thread-1"}})
+        ] == [m for _, m in reversed(expected)]
+
+
+@pytest.mark.parametrize("saver_name", ["base", "pool"])
+def test_append_log_thread_deleted_by_other_saver(saver_name: str) -> None:
+    with _saver(saver_name) as saver:
+        saver.append_log = AppendLog(["messages"], snapshot_every=10)
+        other = PostgresSaver(saver.conn)
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+
+        def put(config: RunnableConfig, step: int) -> RunnableConfig:
+            checkpoint = create_checkpoint(empty_checkpoint(), None, step)
+            checkpoint["channel_values"] = {
+                "messages": [f"msg-{j}" for j in range(step)]
+            }
+            checkpoint["channel_versions"] = {"messages": str(step)}
+            return saver.put(config, checkpoint, {}, {"messages": str(step)})
+
+        put(put(config, 1), 2)
+        # the thread is deleted by another saver, then its ID is reused
+        other.delete_thread("thread-1")
+        latest = put(put(config, 1), 2)
+        saved = saver.get_tuple(latest)
+        assert saved.checkpoint["channel_values"]["messages"] == ["msg-0", "msg-1"]
+        assert [
+            c.checkpoint["channel_values"]["messages"]
+            for c in saver.list({"configurable": {"thread_id": "thread-1"}})
+        ] == [["msg-0", "msg-1"], ["msg-0"]]
+
+        # deltas whose snapshot is missing fail with a clear error
+        with saver._cursor() as cur:
+            cur.execute("DELETE FROM checkpoint_blobs WHERE version = '1'")
+        with pytest.raises(MissingSnapshotError):
+            saver.get_tuple(latest)
+        with pytest.raises(MissingSnapshotError):
+            list(saver.list({"configurable": {"thread_id": "thread-1"}}))
+
+
+@pytest.mark.parametrize("saver_name", ["base", "pool", "pipe"])
+def test_list_matches_get_tuple(saver_name: str) -> None:
+    with _saver(saver_name) as saver:
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        checkpoint = empty_checkpoint()
+        version = None
+        for step in range(4):
+            version = saver.get_next_version(version, None)
+            checkpoint = create_checkpoint(checkpoint, None, step)
+            checkpoint["channel_values"] = {"foo": f"foo-{step}", "bar": step}
+            checkpoint["channel_versions"] = {"foo": version, "bar": version}
+            config = saver.put(
+                config, checkpoint, {"step": step}, {"foo": version, "bar": version}
+            )
+            saver.put_writes(
+                config, [("foo", f"write-{step}"), (TASKS, f"send-{step}")], "task-1"
+            )
+            saver.put_writes(config, [("bar", step)], "task-0")
+
+        listed = list(saver.list({"configurable": {"thread_id": "thread-1"}}))
+        assert len(listed) == 4
+        for tup in listed:
+            assert tup == saver.get_tuple(tup.config)
+        assert listed[0].checkpoint["pending_sends"] == ["send-2"]
+        assert listed[0].pending_writes == [
+            ("task-0", "bar", 3),
+            ("task-1", "foo", "write-3"),
+            ("task-1", TASKS, "send-3"),
+        ]
+        assert listed[-1].checkpoint["pending_sends"] == []
+
+        assert [
+            tuple(t)
+            for t in saver.list_metadata({"configurable": {"thread_id": "thread-1"}})
+        ] == [
+            (t.config, t.metadata, t.parent_config, t.checkpoint["ts"]) for t in listed
+        ]
+        assert [
+            t.config
+            for t in saver.list_metadata(
+                {"configurable": {"thread_id": "thread-1"}}, filter={"step": 1}
+            )
+        ] == [listed[2].config]
+
+
+@pytest.mark.parametrize("saver_name", ["base", "pool", "pipe", "shallow"])
+def test_put_writes_batch(saver_name: str) -> None:
+    with _saver(saver_name) as saver:
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+        config = saver.put(config, empty_checkpoint(), {}, {})
+        saver.put_writes_batch(
+            config,
+            [
+                ("task-1", [("foo", 1), ("bar", 2)], ""),
+                ("task-2", [(ERROR, "first")], "path"),
+            ],
+        )
+        # special writes are replaced, regular writes are kept
+        saver.put_writes_batch(
+            config,
+            [("task-1", [("foo", 3)], ""), ("task-2", [(ERROR, "second")], "path")],
+        )
+        tup = saver.get_tuple(config)
+        assert tup is not None
+        assert sorted(tup.pending_writes) == [
+            ("task-1", "bar", 2),
+            ("task-1", "foo", 1),
+            ("task-2", ERROR, "second"),
+        ]
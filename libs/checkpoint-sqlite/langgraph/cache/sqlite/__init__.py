@@ -1,26 +1,69 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import datetime
+import logging
 import sqlite3
 import threading
-from collections.abc import Mapping, Sequence
+import weakref
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Any
 
 from langgraph.cache.base import BaseCache, FullKey, Namespace, ValueT
 from langgraph.checkpoint.serde.base import SerializerProtocol
 
+logger = logging.getLogger(__name__)
+
+
+class _ThreadConnection:
+    """Holds the connection of a thread, closed when the thread ends."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+
+
+def _close_thread_connection(
+    conns: set[sqlite3.Connection], lock: threading.RLock, conn: sqlite3.Connection
+) -> None:
+    with lock:
+        conns.discard(conn)
+    conn.close()
+
 
 class SqliteCache(BaseCache[ValueT]):
-    """File-based cache using SQLite."""
+    """File-based cache using SQLite.
+
+    Reads never write: expired entries are skipped, and deleted by `sweep()`,
+    or periodically by a background thread started with `start_sweeper()`.
+
+    By default all threads share one connection, guarded by a lock. With
+    `connection_per_thread=True`, each thread opens its own connection, so
+    concurrent readers don't wait for each other (the database is in WAL mode).
+    This requires a file path, as each `:memory:` connection is a separate database.
+    The connection of a thread is closed when the thread ends.
+
+    Call `close()` to close all connections once the cache is no longer needed.
+    """
 
     def __init__(
         self,
         *,
         path: str,
         serde: SerializerProtocol | None = None,
+        connection_per_thread: bool = False,
     ) -> None:
         """Initialize the cache with a file path."""
         super().__init__(serde=serde)
+        if connection_per_thread and (path == ":memory:" or path == ""):
+            raise ValueError(
+                "connection_per_thread requires a file path, not an in-memory database"
+            )
+        self.path = path
+        self.connection_per_thread = connection_per_thread
         # SQLite backing store
         self._conn = sqlite3.connect(
             path,
@@ -28,6 +71,10 @@ class SqliteCache(BaseCache[ValueT]):
         )
         # Serialize access to the shared connection across threads
         self._lock = threading.RLock()
+        self._local = threading.local()
+        self._thread_conns: set[sqlite3.Connection] = set()
+        self._sweeper_thread: threading.Thread | None = None
+        self._sweeper_stop_event = threading.Event()
         # Better concurrency & atomicity
         self._conn.execute("PRAGMA journal_mode=WAL;")
         # Schema: key -> (expiry, encoding, value)
@@ -41,35 +88,57 @@ class SqliteCache(BaseCache[ValueT]):
                 PRIMARY KEY (ns, key)
             )"""
         )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_expiry_idx ON cache (expiry) WHERE expiry IS NOT NULL"
+        )
         self._conn.commit()
 
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Get a connection for the current thread, in a transaction."""
+        lock: AbstractContextManager[Any]
+        if self.connection_per_thread:
+            holder = getattr(self._local, "conn", None)
+            if holder is None:
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                holder = self._local.conn = _ThreadConnection(conn)
+                with self._lock:
+                    self._thread_conns.add(conn)
+                # thread-local values are released when their thread ends
+                weakref.finalize(
+                    holder,
+                    _close_thread_connection,
+                    self._thread_conns,
+                    self._lock,
+                    conn,
+                )
+            conn = holder.conn
+            lock = nullcontext()
+        else:
+            conn = self._conn
+            lock = self._lock
+        with lock, conn:
+            yield conn
+
     def get(self, keys: Sequence[FullKey]) -> dict[FullKey, ValueT]:
         """Get the cached values for the given keys."""
-        with self._lock, self._conn:
-            now = datetime.datetime.now(datetime.timezone.utc).timestamp()
-            if not keys:
-                return {}
-            placeholders = ",".join("(?, ?)" for _ in keys)
-            params: list[str] = []
-            for ns_tuple, key in keys:
-                params.extend((",".join(ns_tuple), key))
-            cursor = self._conn.execute(
-                f"SELECT ns, key, expiry, encoding, val FROM cache WHERE (ns, key) IN ({placeholders})",
+        if not keys:
+            return {}
+        now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        placeholders = ",".join("(?, ?)" for _ in keys)
+        params: list[str | float] = []
+        for ns_tuple, key in keys:
+            params.extend((",".join(ns_tuple), key))
+        params.append(now)
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT ns, key, encoding, val FROM cache WHERE (ns, key) IN ({placeholders}) AND (expiry IS NULL OR expiry > ?)",
                 tuple(params),
-            )
-            values: dict[FullKey, ValueT] = {}
-            rows = cursor.fetchall()
-            for ns, key, expiry, encoding, raw in rows:
-                if expiry is not None and now > expiry:
-                    # purge expired entry
-                    self._conn.execute(
-                        "DELETE FROM cache WHERE (ns, key) = (?, ?)", (ns, key)
-                    )
-                    continue
-                values[(tuple(ns.split(",")), key)] = self.serde.loads_typed(
-                    (encoding, raw)
-                )
-            return values
+            ).fetchall()
+        return {
+            (tuple(ns.split(",")), key): self.serde.loads_typed((encoding, raw))
+            for ns, key, encoding, raw in rows
+        }
 
     async def aget(self, keys: Sequence[FullKey]) -> dict[FullKey, ValueT]:
         """Asynchronously get the cached values for the given keys."""
@@ -77,19 +146,23 @@ class SqliteCache(BaseCache[ValueT]):
 
     def set(self, mapping: Mapping[FullKey, tuple[ValueT, int | None]]) -> None:
         """Set the cached values for the given keys and TTLs."""
-        with self._lock, self._conn:
-            now = datetime.datetime.now(datetime.timezone.utc)
-            for key, (value, ttl) in mapping.items():
-                if ttl is not None:
-                    delta = datetime.timedelta(seconds=ttl)
-                    expiry: float | None = (now + delta).timestamp()
-                else:
-                    expiry = None
-                encoding, raw = self.serde.dumps_typed(value)
-                self._conn.execute(
-                    "INSERT OR REPLACE INTO cache (ns, key, expiry, encoding, val) VALUES (?, ?, ?, ?, ?)",
-                    (",".join(key[0]), key[1], expiry, encoding, raw),
-                )
+        if not mapping:
+            return
+        now = datetime.datetime.now(datetime.timezone.utc)
+        rows = []
+        for key, (value, ttl) in mapping.items():
+            if ttl is not None:
+                delta = datetime.timedelta(seconds=ttl)
+                expiry: float | None = (now + delta).timestamp()
+            else:
+                expiry = None
+            encoding, raw = self.serde.dumps_typed(value)
+            rows.append((",".join(key[0]), key[1], expiry, encoding, raw))
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache (ns, key, expiry, encoding, val) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
 
     async def aset(self, mapping: Mapping[FullKey, tuple[ValueT, int | None]]) -> None:
         """Asynchronously set the cached values for the given keys and TTLs."""
@@ -98,12 +171,12 @@ class SqliteCache(BaseCache[ValueT]):
     def clear(self, namespaces: Sequence[Namespace] | None = None) -> None:
         """Delete the cached values for the given namespaces.
         If no namespaces are provided, clear all cached values."""
-        with self._lock, self._conn:
+        with self._connection() as conn:
             if namespaces is None:
-                self._conn.execute("DELETE FROM cache")
+                conn.execute("DELETE FROM cache")
             else:
                 placeholders = ",".join("?" for _ in namespaces)
-                self._conn.execute(
+                conn.execute(
                     f"DELETE FROM cache WHERE (ns) IN ({placeholders})",
                     tuple(",".join(key) for key in namespaces),
                 )
@@ -113,8 +186,86 @@ class SqliteCache(BaseCache[ValueT]):
         If no namespaces are provided, clear all cached values."""
         await asyncio.to_thread(self.clear, namespaces)
 
+    def sweep(self) -> int:
+        """Delete expired entries.
+
+        Returns:
+            int: The number of deleted entries.
+        """
+        now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        with self._connection() as conn:
+            return conn.execute(
+                "DELETE FROM cache WHERE expiry IS NOT NULL AND expiry <= ?", (now,)
+            ).rowcount
+
+    def start_sweeper(
+        self, sweep_interval_seconds: float = 60
+    ) -> concurrent.futures.Future[None]:
+        """Periodically delete expired entries, in a background thread.
+
+        Returns:
+            Future that can be waited on or cancelled.
+        """
+        future: concurrent.futures.Future[None] = concurrent.futures.Future()
+        future.add_done_callback(
+            lambda f: self._sweeper_stop_event.set() if f.cancelled() else None
+        )
+        if self._sweeper_thread and self._sweeper_thread.is_alive():
+            logger.info("Cache sweeper thread is already running")
+            return future
+
+        self._sweeper_stop_event.clear()
+
+        def _sweep_loop() -> None:
+            try:
+                while not self._sweeper_stop_event.wait(sweep_interval_seconds):
+                    try:
+                        if expired := self.sweep():
+                            logger.debug(f"Cache swept {expired} expired entries")
+                    except Exception as exc:
+                        logger.exception("Cache sweep iteration failed", exc_info=exc)
+                if not future.done():
+                    future.set_result(None)
+            except Exception as exc:
+                future.set_exception(exc)
+
+        thread = threading.Thread(target=_sweep_loop, daemon=True, name="cache-sweeper")
+        self._sweeper_thread = thread
+        thread.start()
+        return future
+
+    def stop_sweeper(self, timeout: float | None = None) -> bool:
+        """Stop the background sweeper thread, if it's running.
+
+        Args:
+            timeout: Maximum time to wait for the thread to stop, in seconds.
+
+        Returns:
+            bool: True if the thread was stopped (or wasn't running), False if
+                the timeout was reached first.
+        """
+        if not self._sweeper_thread or not self._sweeper_thread.is_alive():
+            return True
+        self._sweeper_stop_event.set()
+        self._sweeper_thread.join(timeout)
+        if self._sweeper_thread.is_alive():
+            return False
+        self._sweeper_thread = None
+        return True
+
+    def close(self) -> None:
+        """Stop the background sweeper thread, if it's running, and close all
+        connections. The cache can't be used afterwards."""
+        self._sweeper_stop_event.set()
+        with self._lock:
+            conns = list(self._thread_conns)
+            self._thread_conns.clear()
+            for conn in conns:
+                conn.close()
+            self._conn.close()
+
     def __del__(self) -> None:
         try:
-            self._conn.close()
+            self.close()
         except Exception:
             pass
@@ -13,14 +13,32 @@ from langgraph.checkpoint.base import (
     ChannelVersions,
     Checkpoint,
     CheckpointMetadata,
+    CheckpointMetadataTuple,
     CheckpointTuple,
     SerializerProtocol,
     get_checkpoint_id,
     get_checkpoint_metadata,
 )
+from langgraph.checkpoint.serde.delta import AppendLog
 from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 from langgraph.checkpoint.serde.types import ChannelProtocol
-from langgraph.checkpoint.sqlite.utils import search_where
+from langgraph.checkpoint.sqlite.utils import (
+    INSERT_CHECKPOINT_BLOBS_SQL,
+    MIGRATE_INLINE_VALUES_V,
+    MIGRATIONS,
+    SELECT_INLINE_CHECKPOINTS_SQL,
+    UPDATE_INLINE_CHECKPOINT_SQL,
+    BlobKey,
+    blob_keys,
+    dump_blobs,
+    index_blobs,
+    load_channel_values,
+    metadata_index_sql,
+    search_where,
+    select_blobs,
+    snapshot_keys,
+    split_inline_values,
+)
 
 _AIO_ERROR_MSG = (
     "The SqliteSaver does not support async methods. "
@@ -46,6 +64,8 @@ class SqliteSaver(BaseCheckpointSaver[str]):
     Args:
         conn (sqlite3.Connection): The SQLite database connection.
         serde (Optional[SerializerProtocol]): The serializer to use for serializing and deserializing checkpoints. Defaults to JsonPlusSerializerCompat.
+        append_log (Optional[AppendLog]): Store the configured list channels as append-logs, see [AppendLog][langgraph.checkpoint.serde.delta.AppendLog]. Defaults to None.
+        indexed_metadata (Sequence[str]): Metadata keys to index, so that listing checkpoints filtered on them doesn't scan every checkpoint. Nested keys are separated by dots. Indexes are created on setup, which can take a while for existing large databases. Defaults to ().
 
     Examples:
 
@@ -78,12 +98,16 @@ class SqliteSaver(BaseCheckpointSaver[str]):
         conn: sqlite3.Connection,
         *,
         serde: Optional[SerializerProtocol] = None,
+        append_log: Optional[AppendLog] = None,
+        indexed_metadata: Sequence[str] = (),
     ) -> None:
         super().__init__(serde=serde)
         self.jsonplus_serde = JsonPlusSerializer()
         self.conn = conn
         self.is_setup = False
         self.lock = threading.Lock()
+        self.append_log = append_log
+        self._metadata_index_sql = [metadata_index_sql(k) for k in indexed_metadata]
 
     @classmethod
     @contextmanager
@@ -121,41 +145,101 @@ class SqliteSaver(BaseCheckpointSaver[str]):
         """Set up the checkpoint database.
 
         This method creates the necessary tables in the SQLite database if they don't
-        already exist. It is called automatically when needed and should not be called
-        directly by the user.
+        already exist, and runs database migrations. It is called automatically when
+        needed and should not be called directly by the user.
         """
         if self.is_setup:
             return
 
-        self.conn.executescript(
-            """
-            PRAGMA journal_mode=WAL;
-            CREATE TABLE IF NOT EXISTS checkpoints (
-                thread_id TEXT NOT NULL,
-                checkpoint_ns TEXT NOT NULL DEFAULT '',
-                checkpoint_id TEXT NOT NULL,
-                parent_checkpoint_id TEXT,
-                type TEXT,
-                checkpoint BLOB,
-                metadata BLOB,
-                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
-            );
-            CREATE TABLE IF NOT EXISTS writes (
-                thread_id TEXT NOT NULL,
-                checkpoint_ns TEXT NOT NULL DEFAULT '',
-                checkpoint_id TEXT NOT NULL,
-                task_id TEXT NOT NULL,
-                idx INTEGER NOT NULL,
-                channel TEXT NOT NULL,
-                type TEXT,
-                value BLOB,
-                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
-            );
-            """
-        )
+        self.conn.executescript("PRAGMA journal_mode=WAL;\n" + MIGRATIONS[0])
+        with closing(self.conn.cursor()) as cur:
+            cur.execute("SELECT v FROM checkpoint_migrations ORDER BY v DESC LIMIT 1")
+            row = cur.fetchone()
+            version = -1 if row is None else row[0]
+            for v, migration in zip(
+                range(version + 1, len(MIGRATIONS)),
+                MIGRATIONS[version + 1 :],
+            ):
+                cur.execute(migration)
+                if v == MIGRATE_INLINE_VALUES_V:
+                    self._migrate_inline_values(cur)
+                cur.execute(
+                    "INSERT OR IGNORE INTO checkpoint_migrations (v) VALUES (?)", (v,)
+                )
+            for index in self._metadata_index_sql:
+                cur.execute(index)
+        self.conn.commit()
 
         self.is_setup = True
 
+    def _migrate_inline_values(self, cur: sqlite3.Cursor) -> None:
+        rowid = 0
+        while True:
+            cur.execute(SELECT_INLINE_CHECKPOINTS_SQL, (rowid,))
+            rows = cur.fetchall()
+            if not rows:
+                return
+            for rowid, thread_id, checkpoint_ns, type_, checkpoint in rows:
+                migrated, blobs = split_inline_values(
+                    self.serde, thread_id, checkpoint_ns, type_, checkpoint
+                )
+                cur.executemany(INSERT_CHECKPOINT_BLOBS_SQL, blobs)
+                if migrated is not None:
+                    cur.execute(UPDATE_INLINE_CHECKPOINT_SQL, (*migrated, rowid))
+
+    def _load_checkpoint(
+        self,
+        cur: sqlite3.Cursor,
+        thread_id: str,
+        checkpoint_ns: str,
+        type_: str,
+        checkpoint: bytes,
+    ) -> Checkpoint:
+        loaded = self.serde.loads_typed((type_, checkpoint))
+        # checkpoints that couldn't be migrated still store values inline
+        if "channel_values" not in loaded:
+            blobs = self._select_blobs(cur, thread_id, checkpoint_ns, blob_keys(loaded))
+            if keys := snapshot_keys(blobs):
+                blobs.update(self._select_blobs(cur, thread_id, checkpoint_ns, keys))
+            loaded["channel_values"] = load_channel_values(self.serde, loaded, blobs)
+        return loaded
+
+    def _discard_missing_snapshots(
+        self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> None:
+        """Discard cached snapshots of the append log that were deleted from the
+        database, eg. by another saver, so that they're written in full again."""
+        assert self.append_log is not None
+        bases = [
+            (k, str(v))
+            for k, v in self.append_log.cached_bases(thread_id, checkpoint_ns, versions)
+        ]
+        if not bases:
+            return
+        found: set[tuple[str, str]] = set()
+        with self.cursor(transaction=False) as cur:
+            for query, params in select_blobs(
+                thread_id, checkpoint_ns, bases, "channel, version"
+            ):
+                cur.execute(query, params)
+                found.update((row[0], row[1]) for row in cur.fetchall())
+        self.append_log.discard(
+            thread_id, checkpoint_ns, [k for k, v in bases if (k, v) not in found]
+        )
+
+    def _select_blobs(
+        self,
+        cur: sqlite3.Cursor,
+        thread_id: str,
+        checkpoint_ns: str,
+        keys: Sequence[BlobKey],
+    ) -> dict[BlobKey, Any]:
+        blobs: dict[BlobKey, Any] = {}
+        for query, params in select_blobs(thread_id, checkpoint_ns, keys):
+            cur.execute(query, params)
+            blobs.update(index_blobs(self.serde, cur.fetchall()))
+        return blobs
+
     @contextmanager
     def cursor(self, transaction: bool = True) -> Iterator[sqlite3.Cursor]:
         """Get a cursor for the SQLite database.
@@ -249,6 +333,10 @@ class SqliteSaver(BaseCheckpointSaver[str]):
                             "checkpoint_id": checkpoint_id,
                         }
                     }
+                # deserialize the checkpoint, loading its channel values
+                loaded = self._load_checkpoint(
+                    cur, thread_id, checkpoint_ns, type, checkpoint
+                )
                 # find any pending writes
                 cur.execute(
                     "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
@@ -258,10 +346,10 @@ class SqliteSaver(BaseCheckpointSaver[str]):
                         str(config["configurable"]["checkpoint_id"]),
                     ),
                 )
-                # deserialize the checkpoint and metadata
+                # deserialize the metadata
                 return CheckpointTuple(
                     config,
-                    self.serde.loads_typed((type, checkpoint)),
+                    loaded,
                     cast(
                         CheckpointMetadata,
                         self.jsonplus_serde.loads(metadata)
@@ -342,6 +430,9 @@ class SqliteSaver(BaseCheckpointSaver[str]):
                 checkpoint,
                 metadata,
             ) in cur:
+                loaded = self._load_checkpoint(
+                    wcur, thread_id, checkpoint_ns, type, checkpoint
+                )
                 wcur.execute(
                     "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
                     (thread_id, checkpoint_ns, checkpoint_id),
@@ -354,7 +445,7 @@ class SqliteSaver(BaseCheckpointSaver[str]):
                             "checkpoint_id": checkpoint_id,
                         }
                     },
-                    self.serde.loads_typed((type, checkpoint)),
+                    loaded,
                     cast(
                         CheckpointMetadata,
                         self.jsonplus_serde.loads(metadata)
@@ -378,6 +469,75 @@ class SqliteSaver(BaseCheckpointSaver[str]):
                     ],
                 )
 
+    def list_metadata(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointMetadataTuple]:
+        """List the metadata of checkpoints from the database.
+
+        Like `list`, but without loading pending writes.
+
+        Args:
+            config: The config to use for listing the checkpoints.
+            filter: Additional filtering criteria for metadata. Defaults to None.
+            before: If provided, only checkpoints before the specified checkpoint ID are returned. Defaults to None.
+            limit: The maximum number of checkpoints to return. Defaults to None.
+
+        Yields:
+            Iterator[CheckpointMetadataTuple]: An iterator of checkpoint metadata tuples.
+        """
+        where, param_values = search_where(config, filter, before)
+        query = f"""SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata
+        FROM checkpoints
+        {where}
+        ORDER BY checkpoint_id DESC"""
+        if limit:
+            query += f" LIMIT {limit}"
+        with self.cursor(transaction=False) as cur:
+            cur.execute(query, param_values)
+            for (
+                thread_id,
+                checkpoint_ns,
+                checkpoint_id,
+                parent_checkpoint_id,
+                type,
+                checkpoint,
+                metadata,
+            ) in cur:
+                yield CheckpointMetadataTuple(
+                    {
+                        "configurable": {
+                            "thread_id": thread_id,
+                            "checkpoint_ns": checkpoint_ns,
+                            "checkpoint_id": checkpoint_id,
+                        }
+                    },
+                    cast(
+                        CheckpointMetadata,
+                        self.jsonplus_serde.loads(metadata)
+                        if metadata is not None
+                        else {},
+                    ),
+                    (
+                        {
+                            "configurable": {
+                                "thread_id": thread_id,
+                                "checkpoint_ns": checkpoint_ns,
+                                "checkpoint_id": parent_checkpoint_id,
+                            }
+                        }
+                        if parent_checkpoint_id
+                        else None
+                    ),
+                    # channel values are stored in checkpoint_blobs, so the
+                    # checkpoint blob decoded for its timestamp is small
+                    self.serde.loads_typed((type, checkpoint))["ts"],
+                )
+
     def put(
         self,
         config: RunnableConfig,
@@ -411,11 +571,26 @@ class SqliteSaver(BaseCheckpointSaver[str]):
         """
         thread_id = config["configurable"]["thread_id"]
         checkpoint_ns = config["configurable"]["checkpoint_ns"]
-        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        if self.append_log is not None:
+            self._discard_missing_snapshots(str(thread_id), checkpoint_ns, new_versions)
+        copy = checkpoint.copy()
+        # only channels updated since the parent checkpoint are written
+        snapshots: dict = {}
+        blobs = dump_blobs(
+            self.serde,
+            str(thread_id),
+            checkpoint_ns,
+            copy.pop("channel_values"),  # type: ignore[misc]
+            new_versions,
+            self.append_log,
+            snapshots,
+        )
+        type_, serialized_checkpoint = self.serde.dumps_typed(copy)
         serialized_metadata = self.jsonplus_serde.dumps(
             get_checkpoint_metadata(config, metadata)
         )
         with self.cursor() as cur:
+            cur.executemany(INSERT_CHECKPOINT_BLOBS_SQL, blobs)
             cur.execute(
                 "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata) VALUES (?, ?, ?, ?, ?, ?, ?)",
                 (
@@ -428,6 +603,8 @@ class SqliteSaver(BaseCheckpointSaver[str]):
                     serialized_metadata,
                 ),
             )
+        if self.append_log is not None:
+            self.append_log.commit(snapshots)
         return {
             "configurable": {
                 "thread_id": thread_id,
@@ -489,10 +666,16 @@ class SqliteSaver(BaseCheckpointSaver[str]):
                 "DELETE FROM checkpoints WHERE thread_id = ?",
                 (str(thread_id),),
             )
+            cur.execute(
+                "DELETE FROM checkpoint_blobs WHERE thread_id = ?",
+                (str(thread_id),),
+            )
             cur.execute(
                 "DELETE FROM writes WHERE thread_id = ?",
                 (str(thread_id),),
             )
+        if self.append_log is not None:
+            self.append_log.forget(str(thread_id))
 
     async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
         """Get a checkpoint tuple from the database asynchronously.
@@ -1,7 +1,7 @@
 import asyncio
 import random
 from collections.abc import AsyncIterator, Iterator, Sequence
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Any, Callable, Optional, TypeVar, cast
 
 import aiosqlite
@@ -13,14 +13,32 @@ from langgraph.checkpoint.base import (
     ChannelVersions,
     Checkpoint,
     CheckpointMetadata,
+    CheckpointMetadataTuple,
     CheckpointTuple,
     SerializerProtocol,
     get_checkpoint_id,
     get_checkpoint_metadata,
 )
+from langgraph.checkpoint.serde.delta import AppendLog
 from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 from langgraph.checkpoint.serde.types import ChannelProtocol
-from langgraph.checkpoint.sqlite.utils import search_where
+from langgraph.checkpoint.sqlite.utils import (
+    INSERT_CHECKPOINT_BLOBS_SQL,
+    MIGRATE_INLINE_VALUES_V,
+    MIGRATIONS,
+    SELECT_INLINE_CHECKPOINTS_SQL,
+    UPDATE_INLINE_CHECKPOINT_SQL,
+    BlobKey,
+    blob_keys,
+    dump_blobs,
+    index_blobs,
+    load_channel_values,
+    metadata_index_sql,
+    search_where,
+    select_blobs,
+    snapshot_keys,
+    split_inline_values,
+)
 
 T = TypeVar("T", bound=Callable)
 
@@ -34,7 +52,14 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
 
     Attributes:
         conn (aiosqlite.Connection): The asynchronous SQLite database connection.
+        readers (Sequence[aiosqlite.Connection]): Connections to the same database
+            used for reads. Without readers, reads and writes share `conn`, one at a
+            time; with readers, reads use a free reader connection instead and run
+            concurrently with each other and with writes (the database is in WAL
+            mode), while only writes go through `conn`.
         serde (SerializerProtocol): The serializer used for encoding/decoding checkpoints.
+        append_log (Optional[AppendLog]): Store the configured list channels as append-logs, see [AppendLog][langgraph.checkpoint.serde.delta.AppendLog].
+        indexed_metadata (Sequence[str]): Metadata keys to index, so that listing checkpoints filtered on them doesn't scan every checkpoint. Nested keys are separated by dots.
 
     Tip:
         Requires the [aiosqlite](https://pypi.org/project/aiosqlite/) package.
@@ -110,6 +135,9 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
         conn: aiosqlite.Connection,
         *,
         serde: Optional[SerializerProtocol] = None,
+        append_log: Optional[AppendLog] = None,
+        indexed_metadata: Sequence[str] = (),
+        readers: Sequence[aiosqlite.Connection] = (),
     ):
         super().__init__(serde=serde)
         self.jsonplus_serde = JsonPlusSerializer()
@@ -117,22 +145,56 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
         self.lock = asyncio.Lock()
         self.loop = asyncio.get_running_loop()
         self.is_setup = False
+        self.append_log = append_log
+        self._metadata_index_sql = [metadata_index_sql(k) for k in indexed_metadata]
+        self.readers = readers
+        self._free_readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        for reader in readers:
+            self._free_readers.put_nowait(reader)
 
     @classmethod
     @asynccontextmanager
     async def from_conn_string(
-        cls, conn_string: str
+        cls, conn_string: str, *, readers: int = 0
     ) -> AsyncIterator["AsyncSqliteSaver"]:
         """Create a new AsyncSqliteSaver instance from a connection string.
 
         Args:
             conn_string: The SQLite connection string.
+            readers: Number of connections to open for reads, so that reads of
+                concurrent runs don't wait for each other. Requires a database
+                file. Defaults to 0, ie. reads share the connection used for writes.
 
         Yields:
             AsyncSqliteSaver: A new AsyncSqliteSaver instance.
         """
-        async with aiosqlite.connect(conn_string) as conn:
-            yield cls(conn)
+        if readers and conn_string == ":memory:":
+            raise ValueError(
+                "Reader connections can't be used with an in-memory database, "
+                "as each connection would open a different database."
+            )
+        async with AsyncExitStack() as stack:
+            conn = await stack.enter_async_context(aiosqlite.connect(conn_string))
+            yield cls(
+                conn,
+                readers=[
+                    await stack.enter_async_context(aiosqlite.connect(conn_string))
+                    for _ in range(readers)
+                ],
+            )
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Get a connection for reads, waiting for one to be free."""
+        if not self.readers:
+            async with self.lock:
+                yield self.conn
+            return
+        reader = await self._free_readers.get()
+        try:
+            yield reader
+        finally:
+            self._free_readers.put_nowait(reader)
 
     def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
         """Get a checkpoint tuple from the database.
@@ -208,6 +270,47 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
             except StopAsyncIteration:
                 break
 
+    def list_metadata(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointMetadataTuple]:
+        """List the metadata of checkpoints from the database.
+
+        This method is a synchronous wrapper around `alist_metadata`.
+
+        Args:
+            config: Base configuration for filtering checkpoints.
+            filter: Additional filtering criteria for metadata.
+            before: If provided, only checkpoints before the specified checkpoint ID are returned. Defaults to None.
+            limit: Maximum number of checkpoints to return.
+
+        Yields:
+            Iterator[CheckpointMetadataTuple]: An iterator of checkpoint metadata tuples.
+        """
+        try:
+            if asyncio.get_running_loop() is self.loop:
+                raise asyncio.InvalidStateError(
+                    "Synchronous calls to AsyncSqliteSaver are only allowed from a "
+                    "different thread. From the main thread, use the async interface. "
+                    "For example, use `checkpointer.alist_metadata(...)` or `await "
+                    "graph.aget_state_history(...)`."
+                )
+        except RuntimeError:
+            pass
+        aiter_ = self.alist_metadata(config, filter=filter, before=before, limit=limit)
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(
+                    anext(aiter_),  # noqa: F821
+                    self.loop,
+                ).result()
+            except StopAsyncIteration:
+                break
+
     def put(
         self,
         config: RunnableConfig,
@@ -273,44 +376,118 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
         """Set up the checkpoint database asynchronously.
 
         This method creates the necessary tables in the SQLite database if they don't
-        already exist. It is called automatically when needed and should not be called
-        directly by the user.
+        already exist, and runs database migrations. It is called automatically when
+        needed and should not be called directly by the user.
         """
+        if self.is_setup:
+            return
         async with self.lock:
             if self.is_setup:
                 return
             if not self.conn.is_alive():
                 await self.conn
+            for reader in self.readers:
+                if not reader.is_alive():
+                    await reader
             async with self.conn.executescript(
-                """
-                PRAGMA journal_mode=WAL;
-                CREATE TABLE IF NOT EXISTS checkpoints (
-                    thread_id TEXT NOT NULL,
-                    checkpoint_ns TEXT NOT NULL DEFAULT '',
-                    checkpoint_id TEXT NOT NULL,
-                    parent_checkpoint_id TEXT,
-                    type TEXT,
-                    checkpoint BLOB,
-                    metadata BLOB,
-                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
-                );
-                CREATE TABLE IF NOT EXISTS writes (
-                    thread_id TEXT NOT NULL,
-                    checkpoint_ns TEXT NOT NULL DEFAULT '',
-                    checkpoint_id TEXT NOT NULL,
-                    task_id TEXT NOT NULL,
-                    idx INTEGER NOT NULL,
-                    channel TEXT NOT NULL,
-                    type TEXT,
-                    value BLOB,
-                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
-                );
-                """
+                "PRAGMA journal_mode=WAL;\n" + MIGRATIONS[0]
             ):
-                await self.conn.commit()
+                pass
+            async with self.conn.cursor() as cur:
+                await cur.execute(
+                    "SELECT v FROM checkpoint_migrations ORDER BY v DESC LIMIT 1"
+                )
+                row = await cur.fetchone()
+                version = -1 if row is None else row[0]
+                for v, migration in zip(
+                    range(version + 1, len(MIGRATIONS)),
+                    MIGRATIONS[version + 1 :],
+                ):
+                    await cur.execute(migration)
+                    if v == MIGRATE_INLINE_VALUES_V:
+                        await self._migrate_inline_values(cur)
+                    await cur.execute(
+                        "INSERT OR IGNORE INTO checkpoint_migrations (v) VALUES (?)",
+                        (v,),
+                    )
+                for index in self._metadata_index_sql:
+                    await cur.execute(index)
+            await self.conn.commit()
 
             self.is_setup = True
 
+    async def _migrate_inline_values(self, cur: aiosqlite.Cursor) -> None:
+        rowid = 0
+        while True:
+            await cur.execute(SELECT_INLINE_CHECKPOINTS_SQL, (rowid,))
+            rows = await cur.fetchall()
+            if not rows:
+                return
+            for rowid, thread_id, checkpoint_ns, type_, checkpoint in rows:
+                migrated, blobs = split_inline_values(
+                    self.serde, thread_id, checkpoint_ns, type_, checkpoint
+                )
+                await cur.executemany(INSERT_CHECKPOINT_BLOBS_SQL, blobs)
+                if migrated is not None:
+                    await cur.execute(UPDATE_INLINE_CHECKPOINT_SQL, (*migrated, rowid))
+
+    async def _load_checkpoint(
+        self,
+        cur: aiosqlite.Cursor,
+        thread_id: str,
+        checkpoint_ns: str,
+        type_: str,
+        checkpoint: bytes,
+    ) -> Checkpoint:
+        loaded = self.serde.loads_typed((type_, checkpoint))
+        # checkpoints that couldn't be migrated still store values inline
+        if "channel_values" not in loaded:
+            blobs = await self._select_blobs(
+                cur, thread_id, checkpoint_ns, blob_keys(loaded)
+            )
+            if keys := snapshot_keys(blobs):
+                blobs.update(
+                    await self._select_blobs(cur, thread_id, checkpoint_ns, keys)
+                )
+            loaded["channel_values"] = load_channel_values(self.serde, loaded, blobs)
+        return loaded
+
+    async def _discard_missing_snapshots(
+        self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> None:
+        """Discard cached snapshots of the append log that were deleted from the
+        database, eg. by another saver, so that they're written in full again."""
+        assert self.append_log is not None
+        bases = [
+            (k, str(v))
+            for k, v in self.append_log.cached_bases(thread_id, checkpoint_ns, versions)
+        ]
+        if not bases:
+            return
+        found: set[tuple[str, str]] = set()
+        async with self.lock, self.conn.cursor() as cur:
+            for query, params in select_blobs(
+                thread_id, checkpoint_ns, bases, "channel, version"
+            ):
+                await cur.execute(query, params)
+                found.update((row[0], row[1]) for row in await cur.fetchall())
+        self.append_log.discard(
+            thread_id, checkpoint_ns, [k for k, v in bases if (k, v) not in found]
+        )
+
+    async def _select_blobs(
+        self,
+        cur: aiosqlite.Cursor,
+        thread_id: str,
+        checkpoint_ns: str,
+        keys: Sequence[BlobKey],
+    ) -> dict[BlobKey, Any]:
+        blobs: dict[BlobKey, Any] = {}
+        for query, params in select_blobs(thread_id, checkpoint_ns, keys):
+            await cur.execute(query, params)
+            blobs.update(index_blobs(self.serde, await cur.fetchall()))
+        return blobs
+
     async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
         """Get a checkpoint tuple from the database asynchronously.
 
@@ -327,7 +504,7 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
         """
         await self.setup()
         checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
-        async with self.lock, self.conn.cursor() as cur:
+        async with self._reader() as conn, conn.cursor() as cur:
             # find the latest checkpoint for the thread_id
             if checkpoint_id := get_checkpoint_id(config):
                 await cur.execute(
@@ -361,6 +538,10 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
                             "checkpoint_id": checkpoint_id,
                         }
                     }
+                # deserialize the checkpoint, loading its channel values
+                loaded = await self._load_checkpoint(
+                    cur, thread_id, checkpoint_ns, type, checkpoint
+                )
                 # find any pending writes
                 await cur.execute(
                     "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
@@ -370,10 +551,10 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
                         str(config["configurable"]["checkpoint_id"]),
                     ),
                 )
-                # deserialize the checkpoint and metadata
+                # deserialize the metadata
                 return CheckpointTuple(
                     config,
-                    self.serde.loads_typed((type, checkpoint)),
+                    loaded,
                     cast(
                         CheckpointMetadata,
                         self.jsonplus_serde.loads(metadata)
@@ -428,9 +609,9 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
         if limit:
             query += f" LIMIT {limit}"
         async with (
-            self.lock,
-            self.conn.execute(query, params) as cur,
-            self.conn.cursor() as wcur,
+            self._reader() as conn,
+            conn.execute(query, params) as cur,
+            conn.cursor() as wcur,
         ):
             async for (
                 thread_id,
@@ -441,6 +622,9 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
                 checkpoint,
                 metadata,
             ) in cur:
+                loaded = await self._load_checkpoint(
+                    wcur, thread_id, checkpoint_ns, type, checkpoint
+                )
                 await wcur.execute(
                     "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
                     (thread_id, checkpoint_ns, checkpoint_id),
@@ -453,7 +637,7 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
                             "checkpoint_id": checkpoint_id,
                         }
                     },
-                    self.serde.loads_typed((type, checkpoint)),
+                    loaded,
                     cast(
                         CheckpointMetadata,
                         self.jsonplus_serde.loads(metadata)
@@ -477,6 +661,75 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
                     ],
                 )
 
+    async def alist_metadata(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointMetadataTuple]:
+        """List the metadata of checkpoints from the database asynchronously.
+
+        Like `alist`, but without loading pending writes.
+
+        Args:
+            config: Base configuration for filtering checkpoints.
+            filter: Additional filtering criteria for metadata.
+            before: If provided, only checkpoints before the specified checkpoint ID are returned. Defaults to None.
+            limit: Maximum number of checkpoints to return.
+
+        Yields:
+            AsyncIterator[CheckpointMetadataTuple]: An asynchronous iterator of checkpoint metadata tuples.
+        """
+        await self.setup()
+        where, params = search_where(config, filter, before)
+        query = f"""SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata
+        FROM checkpoints
+        {where}
+        ORDER BY checkpoint_id DESC"""
+        if limit:
+            query += f" LIMIT {limit}"
+        async with self._reader() as conn, conn.execute(query, params) as cur:
+            async for (
+                thread_id,
+                checkpoint_ns,
+                checkpoint_id,
+                parent_checkpoint_id,
+                type,
+                checkpoint,
+                metadata,
+            ) in cur:
+                yield CheckpointMetadataTuple(
+                    {
+                        "configurable": {
+                            "thread_id": thread_id,
+                            "checkpoint_ns": checkpoint_ns,
+                            "checkpoint_id": checkpoint_id,
+                        }
+                    },
+                    cast(
+                        CheckpointMetadata,
+                        self.jsonplus_serde.loads(metadata)
+                        if metadata is not None
+                        else {},
+                    ),
+                    (
+                        {
+                            "configurable": {
+                                "thread_id": thread_id,
+                                "checkpoint_ns": checkpoint_ns,
+                                "checkpoint_id": parent_checkpoint_id,
+                            }
+                        }
+                        if parent_checkpoint_id
+                        else None
+                    ),
+                    # channel values are stored in checkpoint_blobs, so the
+                    # checkpoint blob decoded for its timestamp is small
+                    self.serde.loads_typed((type, checkpoint))["ts"],
+                )
+
     async def aput(
         self,
         config: RunnableConfig,
@@ -501,13 +754,29 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
         await self.setup()
         thread_id = config["configurable"]["thread_id"]
         checkpoint_ns = config["configurable"]["checkpoint_ns"]
-        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        copy = checkpoint.copy()
+        if self.append_log is not None:
+            await self._discard_missing_snapshots(
+                str(thread_id), checkpoint_ns, new_versions
+            )
+        # only channels updated since the parent checkpoint are written
+        snapshots: dict = {}
+        blobs = dump_blobs(
+            self.serde,
+            str(thread_id),
+            checkpoint_ns,
+            copy.pop("channel_values"),  # type: ignore[misc]
+            new_versions,
+            self.append_log,
+            snapshots,
+        )
+        type_, serialized_checkpoint = self.serde.dumps_typed(copy)
         serialized_metadata = self.jsonplus_serde.dumps(
             get_checkpoint_metadata(config, metadata)
         )
-        async with (
-            self.lock,
-            self.conn.execute(
+        async with self.lock, self.conn.cursor() as cur:
+            await cur.executemany(INSERT_CHECKPOINT_BLOBS_SQL, blobs)
+            await cur.execute(
                 "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata) VALUES (?, ?, ?, ?, ?, ?, ?)",
                 (
                     str(config["configurable"]["thread_id"]),
@@ -518,9 +787,10 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
                     serialized_checkpoint,
                     serialized_metadata,
                 ),
-            ),
-        ):
+            )
             await self.conn.commit()
+        if self.append_log is not None:
+            self.append_log.commit(snapshots)
         return {
             "configurable": {
                 "thread_id": thread_id,
@@ -584,11 +854,17 @@ class AsyncSqliteSaver(BaseCheckpointSaver[str]):
                 "DELETE FROM checkpoints WHERE thread_id = ?",
                 (str(thread_id),),
             )
+            await cur.execute(
+                "DELETE FROM checkpoint_blobs WHERE thread_id = ?",
+                (str(thread_id),),
+            )
             await cur.execute(
                 "DELETE FROM writes WHERE thread_id = ?",
                 (str(thread_id),),
             )
             await self.conn.commit()
+        if self.append_log is not None:
+            self.append_log.forget(str(thread_id))
 
     def get_next_version(self, current: Optional[str], channel: ChannelProtocol) -> str:
         """Generate the next version ID for a channel.
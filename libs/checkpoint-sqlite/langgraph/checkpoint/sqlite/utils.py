@@ -1,10 +1,97 @@
 import json
-from collections.abc import Sequence
-from typing import Any, Optional
+import re
+from collections.abc import Iterable, Iterator, Sequence
+from functools import partial
+from typing import Any, Optional, Union, cast
 
 from langchain_core.runnables import RunnableConfig
 
-from langgraph.checkpoint.base import get_checkpoint_id
+from langgraph.checkpoint.base import ChannelVersions, get_checkpoint_id
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.delta import AppendLog, Delta, MissingSnapshotError
+from langgraph.checkpoint.serde.lazy import Deferred, LazyDict
+
+"""
+To add a new migration, add a new string to the MIGRATIONS list.
+The position of the migration in the list is the version number.
+"""
+MIGRATIONS = [
+    """CREATE TABLE IF NOT EXISTS checkpoint_migrations (
+    v INTEGER PRIMARY KEY
+);""",
+    """CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);""",
+    """CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);""",
+    """CREATE TABLE IF NOT EXISTS checkpoint_blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);""",
+]
+
+# once the checkpoint_blobs table is created, channel values stored inline in
+# checkpoints written by earlier versions are moved to it
+MIGRATE_INLINE_VALUES_V = 3
+
+INSERT_CHECKPOINT_BLOBS_SQL = "INSERT OR IGNORE INTO checkpoint_blobs (thread_id, checkpoint_ns, channel, version, type, blob) VALUES (?, ?, ?, ?, ?, ?)"
+
+SELECT_INLINE_CHECKPOINTS_SQL = "SELECT rowid, thread_id, checkpoint_ns, type, checkpoint FROM checkpoints WHERE rowid > ? ORDER BY rowid LIMIT 100"
+
+UPDATE_INLINE_CHECKPOINT_SQL = (
+    "UPDATE checkpoints SET type = ?, checkpoint = ? WHERE rowid = ?"
+)
+
+# keep well below SQLITE_MAX_VARIABLE_NUMBER, which is 999 in older versions
+_MAX_BLOB_KEYS = 400
+
+_METADATA_KEY = re.compile(r"\w+(\.\w+)*")
+
+BlobKey = tuple[str, str]
+"""(channel, version) of a blob, within a thread and checkpoint NS."""
+
+BlobRow = tuple[str, str, str, str, str, Optional[bytes]]
+"""(thread_id, checkpoint_ns, channel, version, type, blob) of a blob."""
+
+
+def _metadata_expr(key: str) -> str:
+    return f"json_extract(CAST(metadata AS TEXT), '$.{key}')"
+
+
+def metadata_index_sql(key: str) -> str:
+    """Return the statement creating an index on a metadata key.
+
+    The index is on the same expression that `search_where` filters on, so
+    SQLite uses it to filter on that key, instead of scanning the checkpoints.
+    Nested keys are separated by dots, eg. "writes.node".
+    """
+    if not _METADATA_KEY.fullmatch(key):
+        raise ValueError(f"Invalid metadata key to index: {key!r}")
+    return (
+        f'CREATE INDEX IF NOT EXISTS "checkpoints_metadata_{key}_idx" '
+        f"ON checkpoints({_metadata_expr(key)}, checkpoint_id)"
+    )
 
 
 def _metadata_predicate(
@@ -43,9 +130,7 @@ def _metadata_predicate(
     # process metadata query
     for query_key, query_value in metadata_filter.items():
         operator, param_value = _where_value(query_value)
-        predicates.append(
-            f"json_extract(CAST(metadata AS TEXT), '$.{query_key}') {operator}"
-        )
+        predicates.append(f"{_metadata_expr(query_key)} {operator}")
         param_values.append(param_value)
 
     return (predicates, param_values)
@@ -92,3 +177,152 @@ def search_where(
         param_values.append(get_checkpoint_id(before))
 
     return ("WHERE " + " AND ".join(wheres) if wheres else "", param_values)
+
+
+def dump_blobs(
+    serde: SerializerProtocol,
+    thread_id: str,
+    checkpoint_ns: str,
+    values: dict[str, Any],
+    versions: ChannelVersions,
+    append_log: Optional[AppendLog] = None,
+    snapshots: Optional[dict] = None,
+) -> list[BlobRow]:
+    """Serialize the channel values written at new versions, one row per channel.
+
+    Channels without a value (eg. cleared ones) are stored as "empty" blobs.
+    With an append log, snapshots written are recorded in `snapshots`, to be
+    committed once the rows are persisted.
+    """
+    rows: list[BlobRow] = []
+    for k, ver in versions.items():
+        if k not in values:
+            rows.append((thread_id, checkpoint_ns, k, str(ver), "empty", None))
+        elif append_log is not None and snapshots is not None:
+            rows.append(
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    k,
+                    str(ver),
+                    *append_log.dumps_typed(
+                        serde, thread_id, checkpoint_ns, k, ver, values[k], snapshots
+                    ),
+                )
+            )
+        else:
+            rows.append(
+                (thread_id, checkpoint_ns, k, str(ver), *serde.dumps_typed(values[k]))
+            )
+    return rows
+
+
+def select_blobs(
+    thread_id: str,
+    checkpoint_ns: str,
+    keys: Sequence[BlobKey],
+    columns: str = "channel, version, type, blob",
+) -> Iterator[tuple[str, list[Any]]]:
+    """Yield the (query, params) pairs selecting the blobs with the given keys."""
+    for i in range(0, len(keys), _MAX_BLOB_KEYS):
+        chunk = keys[i : i + _MAX_BLOB_KEYS]
+        yield (
+            f"SELECT {columns} FROM checkpoint_blobs "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND (channel, version) IN "
+            f"(VALUES {', '.join(['(?, ?)'] * len(chunk))})",
+            [thread_id, checkpoint_ns, *(p for key in chunk for p in key)],
+        )
+
+
+def index_blobs(
+    serde: SerializerProtocol, rows: Iterable[Sequence[Any]]
+) -> dict[BlobKey, Union[tuple[str, Optional[bytes]], Delta]]:
+    """Index selected (channel, version, type, blob) rows by key, decoding delta
+    blobs (but not applying them)."""
+    return {
+        (channel, version): (
+            AppendLog.loads_delta(serde, (type_, cast(bytes, blob)))
+            if AppendLog.is_delta(type_)
+            else (type_, blob)
+        )
+        for channel, version, type_, blob in rows
+    }
+
+
+def blob_keys(checkpoint: dict[str, Any]) -> list[BlobKey]:
+    """Keys of the blobs of the channel versions of a checkpoint."""
+    return [(k, str(v)) for k, v in checkpoint["channel_versions"].items()]
+
+
+def snapshot_keys(
+    blobs: dict[BlobKey, Union[tuple[str, Optional[bytes]], Delta]],
+) -> list[BlobKey]:
+    """Keys of the snapshots of delta blobs, not already fetched."""
+    return list(
+        {
+            (k, str(v.base_version))
+            for (k, _), v in blobs.items()
+            if isinstance(v, Delta)
+        }.difference(blobs)
+    )
+
+
+def load_channel_values(
+    serde: SerializerProtocol,
+    checkpoint: dict[str, Any],
+    blobs: dict[BlobKey, Union[tuple[str, Optional[bytes]], Delta]],
+) -> LazyDict:
+    """Channel values of a checkpoint, deserialized on first access."""
+    values = LazyDict()
+    for channel, version in checkpoint["channel_versions"].items():
+        blob = blobs.get((channel, str(version)))
+        if blob is None:
+            continue
+        elif isinstance(blob, Delta):
+            snapshot = blobs.get((channel, str(blob.base_version)))
+            if snapshot is None or isinstance(snapshot, Delta) or snapshot[1] is None:
+                raise MissingSnapshotError(channel, blob.base_version)
+            values[channel] = Deferred(
+                partial(_apply_delta, serde, blob, (snapshot[0], snapshot[1]))
+            )
+        elif blob[0] != "empty" and blob[1] is not None:
+            values[channel] = Deferred(partial(serde.loads_typed, (blob[0], blob[1])))
+    return values
+
+
+def _apply_delta(
+    serde: SerializerProtocol, delta: Delta, snapshot: tuple[str, bytes]
+) -> list[Any]:
+    return delta.apply(serde.loads_typed(snapshot))
+
+
+def split_inline_values(
+    serde: SerializerProtocol,
+    thread_id: str,
+    checkpoint_ns: str,
+    type_: str,
+    checkpoint: bytes,
+) -> tuple[Optional[tuple[str, bytes]], list[BlobRow]]:
+    """Move the channel values of a checkpoint stored inline to blob rows.
+
+    Returns the checkpoint re-serialized without its channel values (or None if
+    it should be kept as is), and the blob rows of its versioned channel values.
+    Values of channels without a version can't be stored as blobs, so
+    checkpoints that have some are kept inline, which reads still support.
+    """
+    loaded = serde.loads_typed((type_, checkpoint))
+    if "channel_values" not in loaded:
+        return None, []
+    values = loaded["channel_values"]
+    versions = loaded["channel_versions"]
+    rows = dump_blobs(
+        serde,
+        thread_id,
+        checkpoint_ns,
+        values,
+        {k: v for k, v in versions.items() if k in values},
+    )
+    if not all(k in versions for k in values):
+        return None, rows
+    del loaded["channel_values"]
+    return serde.dumps_typed(loaded), rows
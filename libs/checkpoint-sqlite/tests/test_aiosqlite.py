@@ -1,5 +1,8 @@
+import asyncio
+from pathlib import Path
 from typing import Any
 
+import aiosqlite
 import pytest
 from langchain_core.runnables import RunnableConfig
 
@@ -9,6 +12,8 @@ from langgraph.checkpoint.base import (
     create_checkpoint,
     empty_checkpoint,
 )
+from langgraph.checkpoint.serde.delta import AppendLog
+from langgraph.checkpoint.serde.lazy import LazyDict
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 
 
@@ -75,6 +80,136 @@ class TestAsyncSqliteSaver:
                 "run_id": "my_run_id",
             }
 
+    async def test_alist_metadata(self) -> None:
+        async with AsyncSqliteSaver.from_conn_string(":memory:") as saver:
+            await saver.aput(self.config_1, self.chkpnt_1, self.metadata_1, {})
+            await saver.aput(self.config_2, self.chkpnt_2, self.metadata_2, {})
+            await saver.aput(self.config_3, self.chkpnt_3, self.metadata_3, {})
+
+            for config, filter in (
+                (None, {}),
+                (None, {"source": "input"}),
+                ({"configurable": {"thread_id": "thread-2"}}, None),
+            ):
+                assert [
+                    tuple(t) async for t in saver.alist_metadata(config, filter=filter)
+                ] == [
+                    (t.config, t.metadata, t.parent_config, t.checkpoint["ts"])
+                    async for t in saver.alist(config, filter=filter)
+                ]
+            assert len([t async for t in saver.alist_metadata(None, limit=2)]) == 2
+
+    async def test_versioned_blobs(self) -> None:
+        async with aiosqlite.connect(":memory:") as conn:
+            # a row written by earlier versions, with inline values
+            await conn.executescript(
+                """
+                CREATE TABLE checkpoints (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL DEFAULT '',
+                    checkpoint_id TEXT NOT NULL,
+                    parent_checkpoint_id TEXT,
+                    type TEXT,
+                    checkpoint BLOB,
+                    metadata BLOB,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                );
+                """
+            )
+            saver = AsyncSqliteSaver(conn)
+            chkpnt_1 = self.chkpnt_1.copy()
+            chkpnt_1["channel_values"] = {"a": 1, "b": ["x"]}
+            chkpnt_1["channel_versions"] = {"a": "1", "b": "1"}
+            await conn.execute(
+                "INSERT INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, type, checkpoint) VALUES ('thread-1', '', ?, ?, ?)",
+                (chkpnt_1["id"], *saver.serde.dumps_typed(chkpnt_1)),
+            )
+            await conn.commit()
+
+            config_1 = {
+                "configurable": {
+                    "thread_id": "thread-1",
+                    "checkpoint_ns": "",
+                    "checkpoint_id": chkpnt_1["id"],
+                }
+            }
+            tup = await saver.aget_tuple(config_1)
+            assert tup is not None and tup.checkpoint == chkpnt_1
+            chkpnt_2 = create_checkpoint(chkpnt_1, None, 1)
+            chkpnt_2["channel_values"] = {"a": 1, "b": ["x", "y"]}
+            chkpnt_2["channel_versions"] = {"a": "1", "b": "2"}
+            config_2 = await saver.aput(config_1, chkpnt_2, {}, {"b": "2"})
+
+            async with conn.execute(
+                "SELECT channel, version FROM checkpoint_blobs ORDER BY channel, version"
+            ) as cur:
+                assert await cur.fetchall() == [("a", "1"), ("b", "1"), ("b", "2")]
+            tup = await saver.aget_tuple(config_2)
+            assert tup is not None and tup.checkpoint == chkpnt_2
+            assert isinstance(tup.checkpoint["channel_values"], LazyDict)
+            assert [
+                t.checkpoint
+                async for t in saver.alist({"configurable": {"thread_id": "thread-1"}})
+            ] == [chkpnt_2, chkpnt_1]
+
+    async def test_readers(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError):
+            async with AsyncSqliteSaver.from_conn_string(":memory:", readers=2):
+                pass
+
+        path = str(tmp_path / "checkpoints.sqlite")
+        async with AsyncSqliteSaver.from_conn_string(path, readers=2) as saver:
+            assert len(saver.readers) == 2
+            configs = await asyncio.gather(
+                saver.aput(self.config_1, self.chkpnt_1, self.metadata_1, {}),
+                saver.aput(self.config_2, self.chkpnt_2, self.metadata_2, {}),
+            )
+            # reads don't wait for the connection used for writes
+            async with saver.lock:
+                tuples = await asyncio.wait_for(
+                    asyncio.gather(*(saver.aget_tuple(c) for c in configs)), 1
+                )
+                assert [t.checkpoint["id"] for t in tuples if t] == [
+                    self.chkpnt_1["id"],
+                    self.chkpnt_2["id"],
+                ]
+                assert [t.checkpoint["id"] async for t in saver.alist(None)] == [
+                    self.chkpnt_2["id"],
+                    self.chkpnt_1["id"],
+                ]
+                assert len([t async for t in saver.alist_metadata(None)]) == 2
+            assert saver._free_readers.qsize() == 2
+
+    async def test_append_log_thread_deleted_by_other_saver(
+        self, tmp_path: Path
+    ) -> None:
+        path = str(tmp_path / "checkpoints.sqlite")
+        async with (
+            aiosqlite.connect(path) as conn,
+            aiosqlite.connect(path) as other_conn,
+        ):
+            saver = AsyncSqliteSaver(
+                conn, append_log=AppendLog(["messages"], snapshot_every=10)
+            )
+            other = AsyncSqliteSaver(other_conn)
+            config: RunnableConfig = {
+                "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+            }
+
+            async def put(config: RunnableConfig, step: int) -> RunnableConfig:
+                chkpnt = create_checkpoint(self.chkpnt_1, None, step)
+                chkpnt["channel_values"] = {"messages": [f"m{j}" for j in range(step)]}
+                chkpnt["channel_versions"] = {"messages": str(step)}
+                return await saver.aput(config, chkpnt, {}, {"messages": str(step)})
+
+            await put(await put(config, 1), 2)
+            # the thread is deleted by another saver, then its ID is reused
+            await other.adelete_thread("thread-1")
+            await put(await put(config, 1), 2)
+            latest = await saver.aget_tuple(config)
+            assert latest is not None
+            assert latest.checkpoint["channel_values"]["messages"] == ["m0", "m1"]
+
     async def test_asearch(self) -> None:
         async with AsyncSqliteSaver.from_conn_string(":memory:") as saver:
             await saver.aput(self.config_1, self.chkpnt_1, self.metadata_1, {})
@@ -0,0 +1,102 @@
+import datetime
+import gc
+import sqlite3
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from langgraph.cache.sqlite import SqliteCache
+
+
+@pytest.mark.parametrize("connection_per_thread", [False, True])
+def test_sqlite_cache(tmp_path: Path, connection_per_thread: bool) -> None:
+    cache: SqliteCache[str] = SqliteCache(
+        path=str(tmp_path / "cache.db"), connection_per_thread=connection_per_thread
+    )
+    cache.set({(("a", "b"), str(i)): (str(i), None) for i in range(100)})
+    cache.set({(("a", "b"), "expired"): ("expired", 0)})
+    keys = [(("a", "b"), str(i)) for i in range(100)]
+
+    results: list[dict] = []
+
+    def read() -> None:
+        results.append(cache.get([*keys, (("a", "b"), "expired")]))
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [{k: k[1] for k in keys}] * 4
+
+    # reads leave expired entries in place, for the sweep to delete
+    assert cache.sweep() == 1
+    assert cache.sweep() == 0
+
+    cache.clear([("a", "b")])
+    assert cache.get(keys) == {}
+
+
+def test_sqlite_cache_per_thread_requires_file() -> None:
+    with pytest.raises(ValueError):
+        SqliteCache(path=":memory:", connection_per_thread=True)
+
+
+def test_sqlite_cache_sweeper(tmp_path: Path) -> None:
+    cache: SqliteCache[str] = SqliteCache(path=str(tmp_path / "cache.db"))
+    cache.set({(("ns",), "a"): ("a", 0), (("ns",), "b"): ("b", None)})
+    future = cache.start_sweeper(0.01)
+    try:
+        future.result(timeout=0.2)
+    except TimeoutError:
+        pass
+    assert cache.stop_sweeper(timeout=5)
+    assert future.done()
+    assert cache.sweep() == 0
+    assert cache.get([(("ns",), "b")]) == {(("ns",), "b"): "b"}
+
+
+def test_sqlite_cache_closes_thread_connections(tmp_path: Path) -> None:
+    cache: SqliteCache[str] = SqliteCache(
+        path=str(tmp_path / "cache.db"), connection_per_thread=True
+    )
+
+    def use() -> None:
+        cache.set({(("ns",), threading.current_thread().name): ("a", None)})
+        cache.get([(("ns",), "a")])
+
+    # connections of threads that ended are closed
+    for _ in range(3):
+        threads = [threading.Thread(target=use) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        gc.collect()
+        assert len(cache._thread_conns) == 0
+    assert len(cache.get([(("ns",), t.name) for t in threads])) == 20
+
+    # close() closes the connections of running threads too
+    use()
+    assert len(cache._thread_conns) == 1
+    cache.close()
+    assert len(cache._thread_conns) == 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        use()
+
+
+def test_sqlite_cache_expiry_boundary(tmp_path: Path) -> None:
+    cache: SqliteCache[str] = SqliteCache(path=str(tmp_path / "cache.db"))
+    now = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    with patch("langgraph.cache.sqlite.datetime") as mock_datetime:
+        mock_datetime.timedelta = datetime.timedelta
+        mock_datetime.timezone = datetime.timezone
+        mock_datetime.datetime.now.return_value = now
+        cache.set({(("ns",), "a"): ("a", 10)})
+        assert cache.get([(("ns",), "a")]) == {(("ns",), "a"): "a"}
+        # an entry is expired from its expiry time on, as in InMemoryCache
+        mock_datetime.datetime.now.return_value = now + datetime.timedelta(seconds=10)
+        assert cache.get([(("ns",), "a")]) == {}
+        assert cache.sweep() == 1
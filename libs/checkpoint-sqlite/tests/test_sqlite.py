@@ -1,3 +1,5 @@
+import sqlite3
+from pathlib import Path
 from typing import Any, cast
 
 import pytest
@@ -9,6 +11,8 @@ from langgraph.checkpoint.base import (
     create_checkpoint,
     empty_checkpoint,
 )
+from langgraph.checkpoint.serde.delta import AppendLog, MissingSnapshotError
+from langgraph.checkpoint.serde.lazy import LazyDict
 from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.checkpoint.sqlite.utils import _metadata_predicate, search_where
 
@@ -126,6 +130,213 @@ class TestSqliteSaver:
 
             # TODO: test before and limit params
 
+    def test_list_metadata(self) -> None:
+        with SqliteSaver.from_conn_string(":memory:") as saver:
+            saver.put(self.config_1, self.chkpnt_1, self.metadata_1, {})
+            saver.put(self.config_2, self.chkpnt_2, self.metadata_2, {})
+            saver.put(self.config_3, self.chkpnt_3, self.metadata_3, {})
+
+            for config, filter in (
+                (None, {}),
+                (None, {"source": "input"}),
+                ({"configurable": {"thread_id": "thread-2"}}, None),
+            ):
+                assert [
+                    tuple(t) for t in saver.list_metadata(config, filter=filter)
+                ] == [
+                    (t.config, t.metadata, t.parent_config, t.checkpoint["ts"])
+                    for t in saver.list(config, filter=filter)
+                ]
+            assert len(list(saver.list_metadata(None, limit=2))) == 2
+
+    def test_versioned_blobs(self) -> None:
+        with SqliteSaver.from_conn_string(":memory:") as saver:
+            chkpnt_1 = self.chkpnt_1.copy()
+            chkpnt_1["channel_values"] = {"a": 1, "b": ["x"]}
+            chkpnt_1["channel_versions"] = {"a": "1", "b": "1"}
+            config_1 = saver.put(self.config_1, chkpnt_1, {}, {"a": "1", "b": "1"})
+            chkpnt_2 = create_checkpoint(chkpnt_1, None, 1)
+            chkpnt_2["channel_values"] = {"a": 1, "b": ["x", "y"]}
+            chkpnt_2["channel_versions"] = {"a": "1", "b": "2"}
+            config_2 = saver.put(config_1, chkpnt_2, {}, {"b": "2"})
+
+            # only the updated channel is written
+            assert saver.conn.execute(
+                "SELECT channel, version FROM checkpoint_blobs ORDER BY channel, version"
+            ).fetchall() == [("a", "1"), ("b", "1"), ("b", "2")]
+            for config, chkpnt in ((config_1, chkpnt_1), (config_2, chkpnt_2)):
+                tup = saver.get_tuple(config)
+                assert tup is not None
+                assert isinstance(tup.checkpoint["channel_values"], LazyDict)
+                assert tup.checkpoint == chkpnt
+            assert [
+                t.checkpoint
+                for t in saver.list({"configurable": {"thread_id": "thread-1"}})
+            ] == [
+                chkpnt_2,
+                chkpnt_1,
+            ]
+
+            saver.delete_thread("thread-1")
+            assert saver.conn.execute(
+                "SELECT COUNT(*) FROM checkpoint_blobs"
+            ).fetchone() == (0,)
+
+    def test_append_log(self) -> None:
+        with SqliteSaver.from_conn_string(":memory:") as saver:
+            saver.append_log = AppendLog(["messages"], snapshot_every=2)
+            config = self.config_1
+            chkpnt = self.chkpnt_1
+            expected = []
+            for i in range(5):
+                chkpnt = create_checkpoint(chkpnt, None, i)
+                chkpnt["channel_values"] = {"messages": [f"m{j}" for j in range(i + 1)]}
+                chkpnt["channel_versions"] = {"messages": str(i + 1)}
+                config = saver.put(config, chkpnt, {}, {"messages": str(i + 1)})
+                expected.append(chkpnt)
+
+            assert [
+                t.startswith("delta:")
+                for (t,) in saver.conn.execute(
+                    "SELECT type FROM checkpoint_blobs ORDER BY version"
+                )
+            ] == [False, True, True, False, True]
+            assert [
+                t.checkpoint
+                for t in saver.list({"configurable": {"thread_id": "thread-1"}})
+            ] == expected[::-1]
+
+    def test_append_log_thread_deleted_by_other_saver(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "checkpoints.sqlite")
+        saver = SqliteSaver(
+            sqlite3.connect(path, check_same_thread=False),
+            append_log=AppendLog(["messages"], snapshot_every=10),
+        )
+        other = SqliteSaver(sqlite3.connect(path, check_same_thread=False))
+        config: RunnableConfig = {
+            "configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}
+        }
+
+        def put(config: RunnableConfig, step: int) -> RunnableConfig:
+            chkpnt = create_checkpoint(self.chkpnt_1, None, step)
+            chkpnt["channel_values"] = {"messages": [f"m{j}" for j in range(step)]}
+            chkpnt["channel_versions"] = {"messages": str(step)}
+            return saver.put(config, chkpnt, {}, {"messages": str(step)})
+
+        put(put(config, 1), 2)
+        # the thread is deleted by another saver, then its ID is reused
+        other.delete_thread("thread-1")
+        put(put(config, 1), 2)
+        assert [
+            t.startswith("delta:")
+            for (t,) in saver.conn.execute(
+                "SELECT type FROM checkpoint_blobs ORDER BY version"
+            )
+        ] == [False, True]
+        latest = saver.get_tuple(config)
+        assert latest is not None
+        assert latest.checkpoint["channel_values"]["messages"] == ["m0", "m1"]
+
+        # deltas whose snapshot was deleted out of band can't be loaded
+        saver.conn.execute("DELETE FROM checkpoint_blobs WHERE version = '1'")
+        with pytest.raises(MissingSnapshotError):
+            saver.get_tuple(config)
+
+    def test_migrate_inline_values(self) -> None:
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        # schema and rows written by earlier versions, with inline values
+        conn.executescript(
+            """
+            CREATE TABLE checkpoints (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                parent_checkpoint_id TEXT,
+                type TEXT,
+                checkpoint BLOB,
+                metadata BLOB,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+            );
+            """
+        )
+        saver = SqliteSaver(conn)
+        chkpnt_1 = self.chkpnt_1.copy()
+        chkpnt_1["channel_values"] = {"a": 1, "b": ["x"]}
+        chkpnt_1["channel_versions"] = {"a": "1", "b": "1"}
+        # values without a version can't be moved to checkpoint_blobs
+        chkpnt_2 = create_checkpoint(chkpnt_1, None, 1)
+        chkpnt_2["channel_values"] = {"a": 1, "b": ["x"], "c": 3}
+        for thread_id, chkpnt in (("thread-1", chkpnt_1), ("thread-2", chkpnt_2)):
+            conn.execute(
+                "INSERT INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, type, checkpoint) VALUES (?, '', ?, ?, ?)",
+                (thread_id, chkpnt["id"], *saver.serde.dumps_typed(chkpnt)),
+            )
+        conn.commit()
+
+        tup = saver.get_tuple({"configurable": {"thread_id": "thread-1"}})
+        assert tup is not None and tup.checkpoint == chkpnt_1
+        assert isinstance(tup.checkpoint["channel_values"], LazyDict)
+        tup = saver.get_tuple({"configurable": {"thread_id": "thread-2"}})
+        assert tup is not None and tup.checkpoint == chkpnt_2
+        assert conn.execute(
+            "SELECT thread_id, channel, version FROM checkpoint_blobs ORDER BY thread_id, channel"
+        ).fetchall() == [
+            ("thread-1", "a", "1"),
+            ("thread-1", "b", "1"),
+            ("thread-2", "a", "1"),
+            ("thread-2", "b", "1"),
+        ]
+
+        # unchanged channels of a migrated checkpoint are read from its blobs
+        chkpnt_3 = create_checkpoint(chkpnt_1, None, 2)
+        chkpnt_3["channel_values"] = {"a": 2, "b": ["x"]}
+        chkpnt_3["channel_versions"] = {"a": "2", "b": "1"}
+        config = saver.put(
+            {"configurable": {"thread_id": "thread-1", "checkpoint_ns": ""}},
+            chkpnt_3,
+            {},
+            {"a": "2"},
+        )
+        tup = saver.get_tuple(config)
+        assert tup is not None and tup.checkpoint == chkpnt_3
+
+        # migrations run once
+        saver = SqliteSaver(conn)
+        saver.setup()
+        assert conn.execute("SELECT MAX(v) FROM checkpoint_migrations").fetchone() == (
+            3,
+        )
+        conn.close()
+
+    def test_indexed_metadata(self) -> None:
+        with pytest.raises(ValueError):
+            SqliteSaver(sqlite3.connect(":memory:"), indexed_metadata=["a'b"])
+
+        saver = SqliteSaver(
+            sqlite3.connect(":memory:", check_same_thread=False),
+            indexed_metadata=["source", "writes.foo"],
+        )
+        saver.put(self.config_1, self.chkpnt_1, self.metadata_1, {})
+        saver.put(self.config_2, self.chkpnt_2, self.metadata_2, {})
+        saver.put(self.config_3, self.chkpnt_3, self.metadata_3, {})
+
+        for filter, expected in (
+            ({"source": "input"}, [self.chkpnt_1]),
+            ({"source": "loop", "step": 1}, [self.chkpnt_2]),
+            ({"writes": {"foo": "bar"}}, [self.chkpnt_2]),
+            ({"writes.foo": "bar"}, [self.chkpnt_2]),
+        ):
+            assert [t.checkpoint["id"] for t in saver.list(None, filter=filter)] == [
+                c["id"] for c in expected
+            ]
+        where, params = search_where(None, {"source": "input", "step": 2})
+        plan = saver.conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT * FROM checkpoints {where} ORDER BY checkpoint_id DESC",
+            params,
+        ).fetchall()
+        assert "USING INDEX checkpoints_metadata_source_idx" in plan[0][-1]
+        saver.conn.close()
+
     def test_search_where(self) -> None:
         # call method / assertions
         expected_predicate_1 = "WHERE json_extract(CAST(metadata AS TEXT), '$.source') = ? AND json_extract(CAST(metadata AS TEXT), '$.step') = ? AND json_extract(CAST(metadata AS TEXT), '$.writes') = ? AND json_extract(CAST(metadata AS TEXT), '$.score') = ? AND checkpoint_id < ?"
@@ -1,18 +1,77 @@
 from __future__ import annotations
 
+import concurrent.futures
 import datetime
+import logging
 import threading
+from collections import OrderedDict
 from collections.abc import Mapping, Sequence
+from typing import Literal, NamedTuple
 
 from langgraph.cache.base import BaseCache, FullKey, Namespace, ValueT
 from langgraph.checkpoint.serde.base import SerializerProtocol
 
+logger = logging.getLogger(__name__)
+
+
+class CacheStats(NamedTuple):
+    """Counters of an `InMemoryCache`, since it was created."""
+
+    hits: int
+    misses: int
+    evictions: int
+    """Entries removed to stay within `max_entries` or `max_bytes`."""
+    expirations: int
+    """Entries removed because their TTL elapsed."""
+    entries: int
+    bytes: int
+    """Total size of the serialized values currently cached."""
+
 
 class InMemoryCache(BaseCache[ValueT]):
-    def __init__(self, *, serde: SerializerProtocol | None = None):
+    """A cache that keeps serialized values in memory.
+
+    By default the cache is unbounded. Set `max_entries` and/or `max_bytes`
+    (counting the size of serialized values) to bound it, in which case the least
+    recently used (`eviction="lru"`) or least frequently used (`eviction="lfu"`,
+    ties broken by recency) entries are evicted first.
+
+    Expired entries are removed when read, by `sweep()`, or periodically by a
+    background thread started with `start_sweeper()`.
+
+    Args:
+        serde: The serializer used for cached values.
+        max_entries: Maximum number of cached entries.
+        max_bytes: Maximum total size of cached values, in bytes. Values larger
+            than this are not cached.
+        eviction: Which entries to evict first when the cache is full.
+    """
+
+    def __init__(
+        self,
+        *,
+        serde: SerializerProtocol | None = None,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        eviction: Literal["lru", "lfu"] = "lru",
+    ):
         super().__init__(serde=serde)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.eviction = eviction
         self._cache: dict[Namespace, dict[str, tuple[str, bytes, float | None]]] = {}
         self._lock = threading.RLock()
+        # use counts (always 1 for LRU) -> entries with that count, oldest first
+        self._buckets: dict[int, OrderedDict[FullKey, None]] = {}
+        self._counts: dict[FullKey, int] = {}
+        self._min_count = 1
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._sweeper_thread: threading.Thread | None = None
+        self._sweeper_stop_event = threading.Event()
 
     def get(self, keys: Sequence[FullKey]) -> dict[FullKey, ValueT]:
         """Get the cached values for the given keys."""
@@ -27,8 +86,12 @@ class InMemoryCache(BaseCache[ValueT]):
                     enc, val, expiry = self._cache[ns][key]
                     if expiry is None or now < expiry:
                         values[(ns, key)] = self.serde.loads_typed((enc, val))
-                    else:
-                        del self._cache[ns][key]
+                        self._touch((ns, key))
+                        self._hits += 1
+                        continue
+                    self._remove(ns, key)
+                    self._expirations += 1
+                self._misses += 1
             return values
 
     async def aget(self, keys: Sequence[FullKey]) -> dict[FullKey, ValueT]:
@@ -45,12 +108,20 @@ class InMemoryCache(BaseCache[ValueT]):
                     expiry: float | None = (now + delta).timestamp()
                 else:
                     expiry = None
+                enc, val = self.serde.dumps_typed(value)
+                if ns in self._cache and key in self._cache[ns]:
+                    self._remove(ns, key)
+                if self.max_bytes is not None and len(val) > self.max_bytes:
+                    continue
+                # evict before inserting, so that LFU doesn't evict the new entry
+                self._evict(len(val))
                 if ns not in self._cache:
                     self._cache[ns] = {}
-                self._cache[ns][key] = (
-                    *self.serde.dumps_typed(value),
-                    expiry,
-                )
+                self._cache[ns][key] = (enc, val, expiry)
+                self._bytes += len(val)
+                self._counts[(ns, key)] = 1
+                self._buckets.setdefault(1, OrderedDict())[(ns, key)] = None
+                self._min_count = 1
 
     async def aset(self, keys: Mapping[FullKey, tuple[ValueT, int | None]]) -> None:
         """Asynchronously set the cached values for the given keys."""
@@ -62,12 +133,139 @@ class InMemoryCache(BaseCache[ValueT]):
         with self._lock:
             if namespaces is None:
                 self._cache.clear()
+                self._buckets.clear()
+                self._counts.clear()
+                self._bytes = 0
             else:
                 for ns in namespaces:
                     if ns in self._cache:
-                        del self._cache[ns]
+                        for key in list(self._cache[ns]):
+                            self._remove(ns, key)
 
     async def aclear(self, namespaces: Sequence[Namespace] | None = None) -> None:
         """Asynchronously delete the cached values for the given namespaces.
         If no namespaces are provided, clear all cached values."""
         self.clear(namespaces)
+
+    def stats(self) -> CacheStats:
+        """Return the hit, miss, eviction and expiration counters, and current size."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                entries=len(self._counts),
+                bytes=self._bytes,
+            )
+
+    def sweep(self) -> int:
+        """Delete expired entries.
+
+        Returns:
+            int: The number of deleted entries.
+        """
+        with self._lock:
+            now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+            expired = [
+                (ns, key)
+                for ns, entries in self._cache.items()
+                for key, (_, _, expiry) in entries.items()
+                if expiry is not None and expiry <= now
+            ]
+            for ns, key in expired:
+                self._remove(ns, key)
+            self._expirations += len(expired)
+            return len(expired)
+
+    def start_sweeper(
+        self, sweep_interval_seconds: float = 60
+    ) -> concurrent.futures.Future[None]:
+        """Periodically delete expired entries, in a background thread.
+
+        Returns:
+            Future that can be waited on or cancelled.
+        """
+        future: concurrent.futures.Future[None] = concurrent.futures.Future()
+        future.add_done_callback(
+            lambda f: self._sweeper_stop_event.set() if f.cancelled() else None
+        )
+        if self._sweeper_thread and self._sweeper_thread.is_alive():
+            logger.info("Cache sweeper thread is already running")
+            return future
+
+        self._sweeper_stop_event.clear()
+
+        def _sweep_loop() -> None:
+            try:
+                while not self._sweeper_stop_event.wait(sweep_interval_seconds):
+                    try:
+                        self.sweep()
+                    except Exception as exc:
+                        logger.exception("Cache sweep iteration failed", exc_info=exc)
+                if not future.done():
+                    future.set_result(None)
+            except Exception as exc:
+                future.set_exception(exc)
+
+        thread = threading.Thread(target=_sweep_loop, daemon=True, name="cache-sweeper")
+        self._sweeper_thread = thread
+        thread.start()
+        return future
+
+    def stop_sweeper(self, timeout: float | None = None) -> bool:
+        """Stop the background sweeper thread, if it's running.
+
+        Args:
+            timeout: Maximum time to wait for the thread to stop, in seconds.
+
+        Returns:
+            bool: True if the thread was stopped (or wasn't running), False if
+                the timeout was reached first.
+        """
+        if not self._sweeper_thread or not self._sweeper_thread.is_alive():
+            return True
+        self._sweeper_stop_event.set()
+        self._sweeper_thread.join(timeout)
+        if self._sweeper_thread.is_alive():
+            return False
+        self._sweeper_thread = None
+        return True
+
+    def _touch(self, full_key: FullKey) -> None:
+        """Record a use of a cached entry."""
+        count = self._counts[full_key]
+        bucket = self._buckets[count]
+        if self.eviction == "lru":
+            bucket.move_to_end(full_key)
+            return
+        del bucket[full_key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[full_key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[full_key] = None
+
+    def _remove(self, ns: Namespace, key: str) -> None:
+        _, val, _ = self._cache[ns].pop(key)
+        if not self._cache[ns]:
+            del self._cache[ns]
+        self._bytes -= len(val)
+        count = self._counts.pop((ns, key))
+        bucket = self._buckets[count]
+        del bucket[(ns, key)]
+        if not bucket:
+            del self._buckets[count]
+
+    def _evict(self, size: int) -> None:
+        """Evict entries until a new entry of the given size fits within the limits."""
+        while self._counts and (
+            (self.max_entries is not None and len(self._counts) >= self.max_entries)
+            or (self.max_bytes is not None and self._bytes + size > self.max_bytes)
+        ):
+            if self._min_count not in self._buckets:
+                self._min_count = min(self._buckets)
+            ns, key = next(iter(self._buckets[self._min_count]))
+            self._remove(ns, key)
+            self._evictions += 1
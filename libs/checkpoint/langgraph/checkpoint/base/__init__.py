@@ -168,6 +168,16 @@ class CheckpointTuple(NamedTuple):
     pending_writes: Optional[List[PendingWrite]] = None
 
 
+class CheckpointMetadataTuple(NamedTuple):
+    """A checkpoint's config and metadata, without its channel values or writes."""
+
+    config: RunnableConfig
+    metadata: CheckpointMetadata
+    parent_config: Optional[RunnableConfig] = None
+    ts: Optional[str] = None
+    """The timestamp of the checkpoint, if known."""
+
+
 CheckpointThreadId = ConfigurableFieldSpec(
     id="thread_id",
     annotation=str,
@@ -278,6 +288,34 @@ class BaseCheckpointSaver(Generic[V]):
         """
         raise NotImplementedError
 
+    def list_metadata(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointMetadataTuple]:
+        """List the metadata of checkpoints that match the given criteria.
+
+        Unlike `list`, channel values and pending writes are not returned, so
+        savers can avoid loading and deserializing them. The default
+        implementation falls back to `list`.
+
+        Args:
+            config: Base configuration for filtering checkpoints.
+            filter: Additional filtering criteria.
+            before: List checkpoints created before this configuration.
+            limit: Maximum number of checkpoints to return.
+
+        Returns:
+            Iterator[CheckpointMetadataTuple]: Iterator of matching checkpoint metadata tuples.
+        """
+        for tup in self.list(config, filter=filter, before=before, limit=limit):
+            yield CheckpointMetadataTuple(
+                tup.config, tup.metadata, tup.parent_config, tup.checkpoint.get("ts")
+            )
+
     def put(
         self,
         config: RunnableConfig,
@@ -321,6 +359,23 @@ class BaseCheckpointSaver(Generic[V]):
         """
         raise NotImplementedError
 
+    def put_writes_batch(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Sequence[Tuple[str, Any]], str]],
+    ) -> None:
+        """Store intermediate writes of several tasks linked to the same checkpoint.
+
+        The default implementation calls `put_writes` once per task. Override this
+        to save the writes of all tasks in a single round-trip.
+
+        Args:
+            config: Configuration of the related checkpoint.
+            writes: List of (task_id, writes, task_path) tuples, one per task.
+        """
+        for task_id, task_writes, task_path in writes:
+            self.put_writes(config, task_writes, task_id, task_path)
+
     def delete_thread(
         self,
         thread_id: str,
@@ -383,6 +438,34 @@ class BaseCheckpointSaver(Generic[V]):
         raise NotImplementedError
         yield
 
+    async def alist_metadata(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointMetadataTuple]:
+        """Asynchronously list the metadata of checkpoints that match the given criteria.
+
+        Unlike `alist`, channel values and pending writes are not returned, so
+        savers can avoid loading and deserializing them. The default
+        implementation falls back to `alist`.
+
+        Args:
+            config: Base configuration for filtering checkpoints.
+            filter: Additional filtering criteria for metadata.
+            before: List checkpoints created before this configuration.
+            limit: Maximum number of checkpoints to return.
+
+        Returns:
+            AsyncIterator[CheckpointMetadataTuple]: Async iterator of matching checkpoint metadata tuples.
+        """
+        async for tup in self.alist(config, filter=filter, before=before, limit=limit):
+            yield CheckpointMetadataTuple(
+                tup.config, tup.metadata, tup.parent_config, tup.checkpoint.get("ts")
+            )
+
     async def aput(
         self,
         config: RunnableConfig,
@@ -426,6 +509,23 @@ class BaseCheckpointSaver(Generic[V]):
         """
         raise NotImplementedError
 
+    async def aput_writes_batch(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Sequence[Tuple[str, Any]], str]],
+    ) -> None:
+        """Asynchronously store intermediate writes of several tasks linked to the same checkpoint.
+
+        The default implementation calls `aput_writes` once per task. Override this
+        to save the writes of all tasks in a single round-trip.
+
+        Args:
+            config: Configuration of the related checkpoint.
+            writes: List of (task_id, writes, task_path) tuples, one per task.
+        """
+        for task_id, task_writes, task_path in writes:
+            await self.aput_writes(config, task_writes, task_id, task_path)
+
     async def adelete_thread(
         self,
         thread_id: str,
@@ -1,3 +1,4 @@
+import bisect
 import logging
 import os
 import pickle
@@ -6,6 +7,7 @@ import shutil
 from collections import defaultdict
 from collections.abc import AsyncIterator, Iterator, Sequence
 from contextlib import AbstractAsyncContextManager, AbstractContextManager, ExitStack
+from functools import partial
 from types import TracebackType
 from typing import Any, Optional, Union
 
@@ -17,11 +19,14 @@ from langgraph.checkpoint.base import (
     ChannelVersions,
     Checkpoint,
     CheckpointMetadata,
+    CheckpointMetadataTuple,
     CheckpointTuple,
     SerializerProtocol,
     get_checkpoint_id,
     get_checkpoint_metadata,
 )
+from langgraph.checkpoint.serde.delta import AppendLog, MissingSnapshotError
+from langgraph.checkpoint.serde.lazy import Deferred, LazyDict
 from langgraph.checkpoint.serde.types import TASKS, ChannelProtocol
 
 logger = logging.getLogger(__name__)
@@ -42,6 +47,8 @@ class InMemorySaver(
 
     Args:
         serde: The serializer to use for serializing and deserializing checkpoints. Defaults to None.
+        append_log: Store the listed channels as append-logs, writing only the
+            items added since the last snapshot for each new version. Defaults to None.
 
     Examples:
 
@@ -85,8 +92,10 @@ class InMemorySaver(
         *,
         serde: Optional[SerializerProtocol] = None,
         factory: type[defaultdict] = defaultdict,
+        append_log: Optional[AppendLog] = None,
     ) -> None:
         super().__init__(serde=serde)
+        self.append_log = append_log
         self.storage = factory(lambda: defaultdict(dict))
         self.writes = factory(dict)
         self.blobs = factory()
@@ -121,15 +130,34 @@ class InMemorySaver(
     def _load_blobs(
         self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
     ) -> dict[str, Any]:
-        channel_values: dict[str, Any] = {}
+        channel_values = LazyDict()
         for k, v in versions.items():
             kk = (thread_id, checkpoint_ns, k, v)
             if kk in self.blobs:
                 vv = self.blobs[kk]
                 if vv[0] != "empty":
-                    channel_values[k] = self.serde.loads_typed(vv)
+                    channel_values[k] = Deferred(
+                        partial(self._load_blob, thread_id, checkpoint_ns, k, vv)
+                    )
         return channel_values
 
+    def _load_blob(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel: str,
+        value: tuple[str, bytes],
+    ) -> Any:
+        if AppendLog.is_delta(value[0]):
+            delta = AppendLog.loads_delta(self.serde, value)
+            base = self.blobs.get(
+                (thread_id, checkpoint_ns, channel, delta.base_version)
+            )
+            if base is None:
+                raise MissingSnapshotError(channel, delta.base_version)
+            return delta.apply(self.serde.loads_typed(base))
+        return self.serde.loads_typed(value)
+
     def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
         """Get a checkpoint tuple from the in-memory storage.
 
@@ -264,6 +292,134 @@ class InMemorySaver(
         Yields:
             Iterator[CheckpointTuple]: An iterator of matching checkpoint tuples.
         """
+        for (
+            thread_id,
+            checkpoint_ns,
+            checkpoint_id,
+            checkpoint,
+            metadata,
+            parent_checkpoint_id,
+        ) in self._search(config, filter, before, limit):
+            writes = self.writes[(thread_id, checkpoint_ns, checkpoint_id)].values()
+
+            if parent_checkpoint_id:
+                sends = sorted(
+                    (
+                        (*w, k[1])
+                        for k, w in self.writes[
+                            (thread_id, checkpoint_ns, parent_checkpoint_id)
+                        ].items()
+                        if w[1] == TASKS
+                    ),
+                    key=lambda w: (w[3], w[0], w[4]),
+                )
+            else:
+                sends = []
+
+            checkpoint_: Checkpoint = self.serde.loads_typed(checkpoint)
+
+            yield CheckpointTuple(
+                config={
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": checkpoint_id,
+                    }
+                },
+                checkpoint={
+                    **checkpoint_,
+                    "channel_values": self._load_blobs(
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint_["channel_versions"],
+                    ),
+                    "pending_sends": [self.serde.loads_typed(s[2]) for s in sends],
+                },
+                metadata=metadata,
+                parent_config=(
+                    {
+                        "configurable": {
+                            "thread_id": thread_id,
+                            "checkpoint_ns": checkpoint_ns,
+                            "checkpoint_id": parent_checkpoint_id,
+                        }
+                    }
+                    if parent_checkpoint_id
+                    else None
+                ),
+                pending_writes=[
+                    (id, c, self.serde.loads_typed(v)) for id, c, v, _ in writes
+                ],
+            )
+
+    def list_metadata(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointMetadataTuple]:
+        """List the metadata of checkpoints from the in-memory storage.
+
+        Channel values and pending writes are not loaded.
+
+        Args:
+            config: Base configuration for filtering checkpoints.
+            filter: Additional filtering criteria for metadata.
+            before: List checkpoints created before this configuration.
+            limit: Maximum number of checkpoints to return.
+
+        Yields:
+            Iterator[CheckpointMetadataTuple]: An iterator of matching checkpoint metadata tuples.
+        """
+        for (
+            thread_id,
+            checkpoint_ns,
+            checkpoint_id,
+            checkpoint,
+            metadata,
+            parent_checkpoint_id,
+        ) in self._search(config, filter, before, limit):
+            # channel values are stored separately, so this is cheap to load
+            checkpoint_: Checkpoint = self.serde.loads_typed(checkpoint)
+            yield CheckpointMetadataTuple(
+                config={
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": checkpoint_id,
+                    }
+                },
+                metadata=metadata,
+                parent_config=(
+                    {
+                        "configurable": {
+                            "thread_id": thread_id,
+                            "checkpoint_ns": checkpoint_ns,
+                            "checkpoint_id": parent_checkpoint_id,
+                        }
+                    }
+                    if parent_checkpoint_id
+                    else None
+                ),
+                ts=checkpoint_["ts"],
+            )
+
+    def _search(
+        self,
+        config: Optional[RunnableConfig],
+        filter: Optional[dict[str, Any]],
+        before: Optional[RunnableConfig],
+        limit: Optional[int],
+    ) -> Iterator[
+        tuple[str, str, str, tuple[str, bytes], CheckpointMetadata, Optional[str]]
+    ]:
+        """Find stored checkpoints matching the criteria of `list()`, newest first.
+
+        Yields (thread ID, checkpoint NS, checkpoint ID, serialized checkpoint,
+        metadata, parent checkpoint ID) tuples.
+        """
         thread_ids = (config["configurable"]["thread_id"],) if config else self.storage
         config_checkpoint_ns = (
             config["configurable"].get("checkpoint_ns") if config else None
@@ -312,60 +468,13 @@ class InMemorySaver(
                     elif limit is not None:
                         limit -= 1
 
-                    writes = self.writes[
-                        (thread_id, checkpoint_ns, checkpoint_id)
-                    ].values()
-
-                    if parent_checkpoint_id:
-                        sends = sorted(
-                            (
-                                (*w, k[1])
-                                for k, w in self.writes[
-                                    (thread_id, checkpoint_ns, parent_checkpoint_id)
-                                ].items()
-                                if w[1] == TASKS
-                            ),
-                            key=lambda w: (w[3], w[0], w[4]),
-                        )
-                    else:
-                        sends = []
-
-                    checkpoint_: Checkpoint = self.serde.loads_typed(checkpoint)
-
-                    yield CheckpointTuple(
-                        config={
-                            "configurable": {
-                                "thread_id": thread_id,
-                                "checkpoint_ns": checkpoint_ns,
-                                "checkpoint_id": checkpoint_id,
-                            }
-                        },
-                        checkpoint={
-                            **checkpoint_,
-                            "channel_values": self._load_blobs(
-                                thread_id,
-                                checkpoint_ns,
-                                checkpoint_["channel_versions"],
-                            ),
-                            "pending_sends": [
-                                self.serde.loads_typed(s[2]) for s in sends
-                            ],
-                        },
-                        metadata=metadata,
-                        parent_config=(
-                            {
-                                "configurable": {
-                                    "thread_id": thread_id,
-                                    "checkpoint_ns": checkpoint_ns,
-                                    "checkpoint_id": parent_checkpoint_id,
-                                }
-                            }
-                            if parent_checkpoint_id
-                            else None
-                        ),
-                        pending_writes=[
-                            (id, c, self.serde.loads_typed(v)) for id, c, v, _ in writes
-                        ],
+                    yield (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint_id,
+                        checkpoint,
+                        metadata,
+                        parent_checkpoint_id,
                     )
 
     def put(
@@ -394,10 +503,34 @@ class InMemorySaver(
         thread_id = config["configurable"]["thread_id"]
         checkpoint_ns = config["configurable"]["checkpoint_ns"]
         values: dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
-        for k, v in new_versions.items():
-            self.blobs[(thread_id, checkpoint_ns, k, v)] = (
-                self.serde.dumps_typed(values[k]) if k in values else ("empty", b"")
+        if self.append_log is None:
+            for k, v in new_versions.items():
+                self.blobs[(thread_id, checkpoint_ns, k, v)] = (
+                    self.serde.dumps_typed(values[k]) if k in values else ("empty", b"")
+                )
+        else:
+            # the append log can be shared with savers that deleted the snapshots
+            self.append_log.discard(
+                thread_id,
+                checkpoint_ns,
+                [
+                    k
+                    for k, base in self.append_log.cached_bases(
+                        thread_id, checkpoint_ns, new_versions
+                    )
+                    if (thread_id, checkpoint_ns, k, base) not in self.blobs
+                ],
             )
+            snapshots: dict = {}
+            for k, v in new_versions.items():
+                self.blobs[(thread_id, checkpoint_ns, k, v)] = (
+                    self.append_log.dumps_typed(
+                        self.serde, thread_id, checkpoint_ns, k, v, values[k], snapshots
+                    )
+                    if k in values
+                    else ("empty", b"")
+                )
+            self.append_log.commit(snapshots)
         self.storage[thread_id][checkpoint_ns].update(
             {
                 checkpoint["id"]: (
@@ -470,6 +603,8 @@ class InMemorySaver(
         for k in list(self.blobs.keys()):
             if k[0] == thread_id:
                 del self.blobs[k]
+        if self.append_log is not None:
+            self.append_log.forget(thread_id)
 
     async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
         """Asynchronous version of get_tuple.
@@ -507,6 +642,27 @@ class InMemorySaver(
         for item in self.list(config, filter=filter, before=before, limit=limit):
             yield item
 
+    async def alist_metadata(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointMetadataTuple]:
+        """Asynchronous version of list_metadata.
+
+        Args:
+            config: The config to use for listing the checkpoints.
+
+        Yields:
+            AsyncIterator[CheckpointMetadataTuple]: An asynchronous iterator of checkpoint metadata tuples.
+        """
+        for item in self.list_metadata(
+            config, filter=filter, before=before, limit=limit
+        ):
+            yield item
+
     async def aput(
         self,
         config: RunnableConfig,
@@ -576,6 +732,424 @@ class InMemorySaver(
 MemorySaver = InMemorySaver  # Kept for backwards compatibility
 
 
+class _Shard:
+    """Checkpoints, writes and blobs of a single thread."""
+
+    __slots__ = ("ids", "checkpoints", "writes", "sends", "blobs", "refs")
+
+    def __init__(self) -> None:
+        # checkpoint NS -> checkpoint IDs, oldest first
+        self.ids: dict[str, list[str]] = {}
+        # (checkpoint NS, checkpoint ID) -> (checkpoint, metadata, parent ID, versions)
+        self.checkpoints: dict[
+            tuple[str, str],
+            tuple[tuple[str, bytes], tuple[str, bytes], Optional[str], ChannelVersions],
+        ] = {}
+        # (checkpoint NS, checkpoint ID) -> (task ID, write idx) -> write
+        self.writes: dict[
+            tuple[str, str],
+            dict[tuple[str, int], tuple[str, str, tuple[str, bytes], str]],
+        ] = {}
+        # (checkpoint NS, checkpoint ID) -> (task ID, write idx) -> TASKS write
+        self.sends: dict[
+            tuple[str, str],
+            dict[tuple[str, int], tuple[str, str, tuple[str, bytes], str]],
+        ] = {}
+        # (checkpoint NS, channel, version) -> blob
+        self.blobs: dict[
+            tuple[str, str, Union[str, int, float]], tuple[str, bytes]
+        ] = {}
+        # (checkpoint NS, channel, version) -> number of checkpoints (and deltas) using it
+        self.refs: dict[tuple[str, str, Union[str, int, float]], int] = {}
+
+
+class ShardedInMemorySaver(InMemorySaver):
+    """An in-memory checkpoint saver indexed for long-lived, multi-threaded processes.
+
+    Unlike `InMemorySaver`, which keeps all threads in shared dictionaries, each
+    thread ID gets its own shard, which holds:
+
+    - the checkpoint IDs of each namespace in order, so that looking up the latest
+      checkpoint is O(1) instead of a `max()` over all checkpoints of the thread,
+    - a separate index of `TASKS` writes, so that loading the pending sends of a
+      checkpoint doesn't scan all writes of its parent.
+
+    Concurrent runs on different threads never write to the same shard, so no lock
+    is needed beyond the atomicity of dict operations. Reads of a thread that is
+    running, eg. listing its history, can see checkpoints evicted meanwhile by
+    `keep_last`, which are skipped.
+
+    With `keep_last`, only the latest checkpoints of each thread and namespace are
+    kept. Older checkpoints are evicted with their writes, and channel blobs are
+    dropped once no retained checkpoint references them. The oldest retained
+    checkpoint keeps its pending sends, but its parent config then points to an
+    evicted checkpoint.
+
+    Args:
+        serde: The serializer to use for serializing and deserializing checkpoints. Defaults to None.
+        keep_last: Number of checkpoints to keep per thread and namespace. Defaults to None (keep all).
+        append_log: Store the listed channels as append-logs. Defaults to None.
+    """
+
+    shards: dict[str, _Shard]
+
+    def __init__(
+        self,
+        *,
+        serde: Optional[SerializerProtocol] = None,
+        keep_last: Optional[int] = None,
+        append_log: Optional[AppendLog] = None,
+    ) -> None:
+        if keep_last is not None and keep_last < 1:
+            raise ValueError("keep_last must be a positive integer")
+        BaseCheckpointSaver.__init__(self, serde=serde)
+        self.append_log = append_log
+        self.keep_last = keep_last
+        self.shards = {}
+        self.stack = ExitStack()
+
+    def _load_tuple(
+        self, shard: _Shard, thread_id: str, checkpoint_ns: str, checkpoint_id: str
+    ) -> Optional[CheckpointTuple]:
+        # the checkpoint may have been evicted since its ID was looked up
+        if (saved := shard.checkpoints.get((checkpoint_ns, checkpoint_id))) is None:
+            return None
+        checkpoint, metadata, parent_checkpoint_id, _ = saved
+        writes = shard.writes.get((checkpoint_ns, checkpoint_id), {}).values()
+        if parent_checkpoint_id and (
+            sends_ := shard.sends.get((checkpoint_ns, parent_checkpoint_id))
+        ):
+            sends = [
+                w
+                for _, w in sorted(
+                    sends_.items(), key=lambda kv: (kv[1][3], kv[0][0], kv[0][1])
+                )
+            ]
+        else:
+            sends = []
+        checkpoint_: Checkpoint = self.serde.loads_typed(checkpoint)
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint_,
+                "channel_values": self._load_shard_blobs(
+                    shard, checkpoint_ns, checkpoint_["channel_versions"]
+                ),
+                "pending_sends": [self.serde.loads_typed(s[2]) for s in sends],
+            },
+            metadata=self.serde.loads_typed(metadata),
+            pending_writes=[
+                (id, c, self.serde.loads_typed(v)) for id, c, v, _ in writes
+            ],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+        )
+
+    def _load_shard_blobs(
+        self, shard: _Shard, checkpoint_ns: str, versions: ChannelVersions
+    ) -> dict[str, Any]:
+        channel_values = LazyDict()
+        for k, v in versions.items():
+            vv = shard.blobs.get((checkpoint_ns, k, v))
+            if vv is not None and vv[0] != "empty":
+                channel_values[k] = Deferred(
+                    partial(self._load_shard_blob, shard, checkpoint_ns, k, vv)
+                )
+        return channel_values
+
+    def _load_shard_blob(
+        self, shard: _Shard, checkpoint_ns: str, channel: str, value: tuple[str, bytes]
+    ) -> Any:
+        if AppendLog.is_delta(value[0]):
+            delta = AppendLog.loads_delta(self.serde, value)
+            base = shard.blobs.get((checkpoint_ns, channel, delta.base_version))
+            if base is None:
+                raise MissingSnapshotError(channel, delta.base_version)
+            return delta.apply(self.serde.loads_typed(base))
+        return self.serde.loads_typed(value)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Get a checkpoint tuple from the in-memory storage.
+
+        If the config contains a "checkpoint_id" key, the checkpoint with the matching
+        thread ID and checkpoint ID is retrieved. Otherwise, the latest checkpoint for
+        the given thread ID is retrieved.
+
+        Args:
+            config: The config to use for retrieving the checkpoint.
+
+        Returns:
+            Optional[CheckpointTuple]: The retrieved checkpoint tuple, or None if no matching checkpoint was found.
+        """
+        thread_id: str = config["configurable"]["thread_id"]
+        checkpoint_ns: str = config["configurable"].get("checkpoint_ns", "")
+        if (shard := self.shards.get(thread_id)) is None:
+            return None
+        if checkpoint_id := get_checkpoint_id(config):
+            return self._load_tuple(shard, thread_id, checkpoint_ns, checkpoint_id)
+        # the latest checkpoint can be evicted by a concurrent put before it is
+        # loaded, in which case load the new latest one
+        while ids := shard.ids.get(checkpoint_ns):
+            if checkpoint_tuple := self._load_tuple(
+                shard, thread_id, checkpoint_ns, ids[-1]
+            ):
+                return checkpoint_tuple
+        return None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints from the in-memory storage.
+
+        Args:
+            config: Base configuration for filtering checkpoints.
+            filter: Additional filtering criteria for metadata.
+            before: List checkpoints created before this configuration.
+            limit: Maximum number of checkpoints to return.
+
+        Yields:
+            Iterator[CheckpointTuple]: An iterator of matching checkpoint tuples.
+        """
+        for thread_id, checkpoint_ns, checkpoint_id, *_ in self._search(
+            config, filter, before, limit
+        ):
+            # the thread may have been deleted since it was searched
+            if (shard := self.shards.get(thread_id)) is None:
+                continue
+            if checkpoint_tuple := self._load_tuple(
+                shard, thread_id, checkpoint_ns, checkpoint_id
+            ):
+                yield checkpoint_tuple
+
+    def _search(
+        self,
+        config: Optional[RunnableConfig],
+        filter: Optional[dict[str, Any]],
+        before: Optional[RunnableConfig],
+        limit: Optional[int],
+    ) -> Iterator[
+        tuple[str, str, str, tuple[str, bytes], CheckpointMetadata, Optional[str]]
+    ]:
+        thread_ids = (config["configurable"]["thread_id"],) if config else self.shards
+        config_checkpoint_ns = (
+            config["configurable"].get("checkpoint_ns") if config else None
+        )
+        config_checkpoint_id = get_checkpoint_id(config) if config else None
+        before_checkpoint_id = get_checkpoint_id(before) if before else None
+        for thread_id in list(thread_ids):
+            if (shard := self.shards.get(thread_id)) is None:
+                continue
+            for checkpoint_ns, ids in list(shard.ids.items()):
+                if (
+                    config_checkpoint_ns is not None
+                    and checkpoint_ns != config_checkpoint_ns
+                ):
+                    continue
+                end = (
+                    bisect.bisect_left(ids, before_checkpoint_id)
+                    if before_checkpoint_id
+                    else len(ids)
+                )
+                for checkpoint_id in reversed(ids[:end]):
+                    # filter by checkpoint ID from config
+                    if config_checkpoint_id and checkpoint_id != config_checkpoint_id:
+                        continue
+                    # skip checkpoints evicted since the IDs were copied
+                    if (
+                        saved := shard.checkpoints.get((checkpoint_ns, checkpoint_id))
+                    ) is None:
+                        continue
+                    checkpoint, metadata_b, parent_checkpoint_id, _ = saved
+                    # filter by metadata
+                    metadata = self.serde.loads_typed(metadata_b)
+                    if filter and not all(
+                        query_value == metadata.get(query_key)
+                        for query_key, query_value in filter.items()
+                    ):
+                        continue
+                    # limit search results
+                    if limit is not None and limit <= 0:
+                        return
+                    elif limit is not None:
+                        limit -= 1
+                    yield (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint_id,
+                        checkpoint,
+                        metadata,
+                        parent_checkpoint_id,
+                    )
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint to the in-memory storage.
+
+        Args:
+            config: The config to associate with the checkpoint.
+            checkpoint: The checkpoint to save.
+            metadata: Additional metadata to save with the checkpoint.
+            new_versions: New versions as of this write
+
+        Returns:
+            RunnableConfig: The updated config containing the saved checkpoint's timestamp.
+        """
+        c = checkpoint.copy()
+        c.pop("pending_sends")  # type: ignore[misc]
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        shard = self.shards.setdefault(thread_id, _Shard())
+        values: dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+        snapshots: dict = {}
+        for k, v in new_versions.items():
+            if self.keep_last is not None and (checkpoint_ns, k, v) in shard.blobs:
+                # already stored, eg. by an earlier put of the same checkpoint, and
+                # rewriting it would leak the refs of the delta it replaces
+                continue
+            elif k not in values:
+                blob = ("empty", b"")
+            elif self.append_log is None:
+                blob = self.serde.dumps_typed(values[k])
+            else:
+                blob = self.append_log.dumps_typed(
+                    self.serde, thread_id, checkpoint_ns, k, v, values[k], snapshots
+                )
+                if self.keep_last is not None and AppendLog.is_delta(blob[0]):
+                    base = AppendLog.loads_delta(self.serde, blob).base_version
+                    base_key = (checkpoint_ns, k, base)
+                    if base_key in shard.blobs:
+                        shard.refs[base_key] = shard.refs.get(base_key, 0) + 1
+                    else:
+                        # the snapshot was evicted, write a new one
+                        blob = self.serde.dumps_typed(values[k])
+                        snapshots[(thread_id, checkpoint_ns, k)] = (v, values[k])
+            shard.blobs[(checkpoint_ns, k, v)] = blob
+        if self.append_log is not None:
+            self.append_log.commit(snapshots)
+        if self.keep_last is not None:
+            for k, v in c["channel_versions"].items():
+                key = (checkpoint_ns, k, v)
+                shard.refs[key] = shard.refs.get(key, 0) + 1
+        previous = shard.checkpoints.get((checkpoint_ns, checkpoint["id"]))
+        shard.checkpoints[(checkpoint_ns, checkpoint["id"])] = (
+            self.serde.dumps_typed(c),
+            self.serde.dumps_typed(get_checkpoint_metadata(config, metadata)),
+            config["configurable"].get("checkpoint_id"),  # parent
+            c["channel_versions"],
+        )
+        if self.keep_last is not None and previous is not None:
+            # the checkpoint is overwritten, release the blobs of the previous one,
+            # once those of the new one are referenced so that shared ones are kept
+            for k, v in previous[3].items():
+                self._release_blob(shard, (checkpoint_ns, k, v))
+        ids = shard.ids.setdefault(checkpoint_ns, [])
+        if not ids or ids[-1] < checkpoint["id"]:
+            ids.append(checkpoint["id"])
+        else:
+            idx = bisect.bisect_left(ids, checkpoint["id"])
+            if idx == len(ids) or ids[idx] != checkpoint["id"]:
+                ids.insert(idx, checkpoint["id"])
+        if self.keep_last is not None:
+            while len(ids) > self.keep_last:
+                self._evict(shard, checkpoint_ns, ids.pop(0))
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def _evict(self, shard: _Shard, checkpoint_ns: str, checkpoint_id: str) -> None:
+        _, _, parent_checkpoint_id, versions = shard.checkpoints.pop(
+            (checkpoint_ns, checkpoint_id)
+        )
+        shard.writes.pop((checkpoint_ns, checkpoint_id), None)
+        # sends of this checkpoint are still needed by its child
+        if parent_checkpoint_id:
+            shard.sends.pop((checkpoint_ns, parent_checkpoint_id), None)
+        for k, v in versions.items():
+            self._release_blob(shard, (checkpoint_ns, k, v))
+
+    def _release_blob(
+        self, shard: _Shard, key: tuple[str, str, Union[str, int, float]]
+    ) -> None:
+        refs = shard.refs.get(key, 0) - 1
+        if refs > 0:
+            shard.refs[key] = refs
+            return
+        shard.refs.pop(key, None)
+        blob = shard.blobs.pop(key, None)
+        if blob is not None and AppendLog.is_delta(blob[0]):
+            base = AppendLog.loads_delta(self.serde, blob).base_version
+            self._release_blob(shard, (key[0], key[1], base))
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Save a list of writes to the in-memory storage.
+
+        Args:
+            config: The config to associate with the writes.
+            writes: The writes to save.
+            task_id: Identifier for the task creating the writes.
+            task_path: Path of the task creating the writes.
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        shard = self.shards.setdefault(thread_id, _Shard())
+        key = (checkpoint_ns, checkpoint_id)
+        outer_writes = shard.writes.setdefault(key, {})
+        for idx, (c, v) in enumerate(writes):
+            inner_key = (task_id, WRITES_IDX_MAP.get(c, idx))
+            if inner_key[1] >= 0 and inner_key in outer_writes:
+                continue
+            write = (task_id, c, self.serde.dumps_typed(v), task_path)
+            outer_writes[inner_key] = write
+            if c == TASKS:
+                shard.sends.setdefault(key, {})[inner_key] = write
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints and writes associated with a thread ID.
+
+        Args:
+            thread_id: The thread ID to delete.
+        """
+        self.shards.pop(thread_id, None)
+        if self.append_log is not None:
+            self.append_log.forget(thread_id)
+
+
 class PersistentDict(defaultdict):
     """Persistent dictionary with an API compatible with shelve and anydbm.
 
@@ -0,0 +1,169 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Collection, Iterable, Mapping
+from typing import Any, NamedTuple, Union
+
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+DELTA_PREFIX = "delta:"
+
+Version = Union[str, int, float]
+
+
+class MissingSnapshotError(LookupError):
+    """Raised when loading a delta blob whose base snapshot no longer exists."""
+
+    def __init__(self, channel: str, base_version: Version) -> None:
+        super().__init__(
+            f"A version of channel '{channel}' is stored as a delta against snapshot "
+            f"version {base_version}, which doesn't exist. The snapshot may have been "
+            "deleted by another process or saver, eg. with delete_thread()."
+        )
+        self.channel = channel
+        self.base_version = base_version
+
+
+class Delta(NamedTuple):
+    """A decoded delta blob, not yet applied to its base snapshot."""
+
+    base_version: Version
+    """Version of the snapshot this delta was computed against."""
+    keep: int
+    """Number of leading items of the snapshot that are kept."""
+    tail: list
+    """Items that follow the kept prefix."""
+
+    def apply(self, base: list) -> list:
+        return base[: self.keep] + self.tail
+
+
+class AppendLog:
+    """Append-log storage for list-valued channels, such as `add_messages` channels.
+
+    By default every new version of a channel is serialized in full, so a thread
+    with N messages writes O(N^2) bytes over its lifetime. For the configured
+    channels, the saver instead writes a full snapshot only every `snapshot_every`
+    versions, and in between stores each version as a delta against the last
+    snapshot: the length of the prefix shared with the snapshot, plus the items
+    that follow it. Loading a delta reads at most one other blob (the snapshot).
+
+    The last snapshot of each channel is cached in-process, keyed by
+    (thread ID, checkpoint NS, channel), so computing a delta never reads from
+    storage. When the cache has no entry (eg. after a restart, or once
+    `max_threads` entries are exceeded), a full snapshot is written instead.
+    Savers whose storage can be modified by other processes check that the cached
+    snapshots still exist with `cached_bases()`, and `discard()` those that don't.
+    Items are compared to the snapshot by identity, then equality, so items of
+    the channel value must not be mutated in place once checkpointed.
+
+    Args:
+        channels: Names of the channels to store as append-logs.
+        snapshot_every: Maximum number of deltas written between two full snapshots.
+        max_threads: Maximum number of cached snapshots.
+    """
+
+    def __init__(
+        self,
+        channels: Collection[str],
+        *,
+        snapshot_every: int = 20,
+        max_threads: int = 1024,
+    ) -> None:
+        self.channels = frozenset(channels)
+        self.snapshot_every = snapshot_every
+        self.max_threads = max_threads
+        self.lock = threading.Lock()
+        # (thread ID, checkpoint NS, channel) -> [version, value, deltas written]
+        self._snapshots: OrderedDict[tuple[str, str, str], list[Any]] = OrderedDict()
+
+    def dumps_typed(
+        self,
+        serde: SerializerProtocol,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel: str,
+        version: Version,
+        value: Any,
+        snapshots: dict[tuple[str, str, str], tuple[Version, list]],
+    ) -> tuple[str, bytes]:
+        """Serialize a channel value, as a delta against the last snapshot if possible.
+
+        Full snapshots written by this call are recorded in `snapshots`, and should
+        be passed to `commit()` once the blobs have been persisted.
+        """
+        if channel not in self.channels or not isinstance(value, list):
+            return serde.dumps_typed(value)
+        key = (thread_id, checkpoint_ns, channel)
+        with self.lock:
+            if last := self._snapshots.get(key):
+                self._snapshots.move_to_end(key)
+                if last[2] < self.snapshot_every:
+                    last[2] += 1
+                else:
+                    last = None
+        if last and (keep := _common_prefix_len(last[1], value)):
+            typ, data = serde.dumps_typed([last[0], keep, value[keep:]])
+            return DELTA_PREFIX + typ, data
+        snapshots[key] = (version, value)
+        return serde.dumps_typed(value)
+
+    def commit(
+        self, snapshots: Mapping[tuple[str, str, str], tuple[Version, list]]
+    ) -> None:
+        """Record snapshots returned by `dumps_typed()` as the new delta bases."""
+        with self.lock:
+            for key, (version, value) in snapshots.items():
+                # copy, in case the channel value is later extended in place
+                self._snapshots[key] = [version, list(value), 0]
+                self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_threads:
+                self._snapshots.popitem(last=False)
+
+    def cached_bases(
+        self, thread_id: str, checkpoint_ns: str, channels: Iterable[str]
+    ) -> list[tuple[str, Version]]:
+        """Channels and versions of the cached snapshots that new versions of the
+        given channels would be stored as deltas against."""
+        with self.lock:
+            return [
+                (channel, last[0])
+                for channel in channels
+                if channel in self.channels
+                and (last := self._snapshots.get((thread_id, checkpoint_ns, channel)))
+                and last[2] < self.snapshot_every
+            ]
+
+    def discard(
+        self, thread_id: str, checkpoint_ns: str, channels: Iterable[str]
+    ) -> None:
+        """Drop cached snapshots of channels, so that the next versions of these
+        channels are written as full snapshots."""
+        with self.lock:
+            for channel in channels:
+                self._snapshots.pop((thread_id, checkpoint_ns, channel), None)
+
+    def forget(self, thread_id: str) -> None:
+        """Drop cached snapshots for a thread, eg. when it is deleted."""
+        with self.lock:
+            for key in [k for k in self._snapshots if k[0] == thread_id]:
+                del self._snapshots[key]
+
+    @staticmethod
+    def is_delta(type_: str) -> bool:
+        return type_.startswith(DELTA_PREFIX)
+
+    @staticmethod
+    def loads_delta(serde: SerializerProtocol, value: tuple[str, bytes]) -> Delta:
+        """Decode a delta blob, without applying it."""
+        base_version, keep, tail = serde.loads_typed(
+            (value[0][len(DELTA_PREFIX) :], value[1])
+        )
+        return Delta(base_version, keep, tail)
+
+
+def _common_prefix_len(a: list, b: list) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and (a[i] is b[i] or a[i] == b[i]):
+        i += 1
+    return i
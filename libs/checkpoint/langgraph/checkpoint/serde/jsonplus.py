@@ -1,12 +1,13 @@
 import dataclasses
 import decimal
+import functools
 import importlib
 import json
 import pathlib
 import pickle
 import re
 from collections import deque
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 from datetime import date, datetime, time, timedelta, timezone
 from enum import Enum
 from inspect import isclass
@@ -27,6 +28,7 @@ from langchain_core.load.load import Reviver
 from langchain_core.load.serializable import Serializable
 
 from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.lazy import Deferred
 from langgraph.checkpoint.serde.types import SendProtocol
 from langgraph.store.base import Item
 
@@ -41,14 +43,29 @@ class JsonPlusSerializer(SerializerProtocol):
         self,
         *,
         pickle_fallback: bool = False,
+        trusted_types: Union[bool, Iterable[Union[type, tuple[str, str]]]] = False,
         __unpack_ext_hook__: Optional[Callable[[int, bytes], Any]] = None,
     ) -> None:
+        """Initialize the serializer.
+
+        Args:
+            pickle_fallback: Whether to pickle objects msgpack can't serialize.
+            trusted_types: Pydantic models to load without validating them, ie.
+                with `model_construct`, which is much faster, eg. for messages.
+                Either classes, (module, name) pairs, or True to trust all
+                models. Only use for data written by a trusted source.
+        """
         self.pickle_fallback = pickle_fallback
-        self._unpack_ext_hook = (
-            __unpack_ext_hook__
-            if __unpack_ext_hook__ is not None
-            else _msgpack_ext_hook
-        )
+        if __unpack_ext_hook__ is not None:
+            self._unpack_ext_hook = __unpack_ext_hook__
+        elif trusted_types is True:
+            self._unpack_ext_hook = _make_msgpack_ext_hook(True)
+        elif trusted_types:
+            self._unpack_ext_hook = _make_msgpack_ext_hook(
+                frozenset(_trusted_type_key(t) for t in trusted_types)
+            )
+        else:
+            self._unpack_ext_hook = _msgpack_ext_hook
 
     def _encode_constructor_args(
         self,
@@ -252,7 +269,10 @@ EXT_PYDANTIC_V2 = 5
 
 
 def _msgpack_default(obj: Any) -> Union[str, ormsgpack.Ext]:
-    if hasattr(obj, "model_dump") and callable(obj.model_dump):  # pydantic v2
+    if isinstance(obj, Deferred):
+        # value of a LazyDict, not resolved yet
+        return obj.get()
+    elif hasattr(obj, "model_dump") and callable(obj.model_dump):  # pydantic v2
         return ormsgpack.Ext(
             EXT_PYDANTIC_V2,
             _msgpack_enc(
@@ -469,81 +489,121 @@ def _msgpack_default(obj: Any) -> Union[str, ormsgpack.Ext]:
         raise TypeError(f"Object of type {obj.__class__.__name__} is not serializable")
 
 
-def _msgpack_ext_hook(code: int, data: bytes) -> Any:
-    if code == EXT_CONSTRUCTOR_SINGLE_ARG:
-        try:
-            tup = ormsgpack.unpackb(
-                data, ext_hook=_msgpack_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
-            )
-            # module, name, arg
-            return getattr(importlib.import_module(tup[0]), tup[1])(tup[2])
-        except Exception:
-            return
-    elif code == EXT_CONSTRUCTOR_POS_ARGS:
-        try:
-            tup = ormsgpack.unpackb(
-                data, ext_hook=_msgpack_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
-            )
-            # module, name, args
-            return getattr(importlib.import_module(tup[0]), tup[1])(*tup[2])
-        except Exception:
-            return
-    elif code == EXT_CONSTRUCTOR_KW_ARGS:
-        try:
-            tup = ormsgpack.unpackb(
-                data, ext_hook=_msgpack_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
-            )
-            # module, name, args
-            return getattr(importlib.import_module(tup[0]), tup[1])(**tup[2])
-        except Exception:
-            return
-    elif code == EXT_METHOD_SINGLE_ARG:
-        try:
-            tup = ormsgpack.unpackb(
-                data, ext_hook=_msgpack_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
-            )
-            # module, name, arg, method
-            return getattr(getattr(importlib.import_module(tup[0]), tup[1]), tup[3])(
-                tup[2]
-            )
-        except Exception:
-            return
-    elif code == EXT_PYDANTIC_V1:
-        try:
-            tup = ormsgpack.unpackb(
-                data, ext_hook=_msgpack_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
-            )
-            # module, name, kwargs
-            cls = getattr(importlib.import_module(tup[0]), tup[1])
+@functools.lru_cache(maxsize=1024)
+def _resolve(module: str, name: str) -> Any:
+    """Import a class or function, caching it, as the same types are decoded many
+    times, eg. the messages of a checkpoint. Failed imports aren't cached."""
+    return getattr(importlib.import_module(module), name)
+
+
+def _trusted_type_key(t: Union[type, tuple[str, str]]) -> tuple[str, str]:
+    if isinstance(t, type):
+        return (t.__module__, t.__name__)
+    if not isinstance(t, (tuple, list)) or len(t) != 2:
+        raise ValueError(
+            f"Trusted types must be classes or (module, name) pairs, got {t!r}"
+        )
+    return (t[0], t[1])
+
+
+def _make_msgpack_ext_hook(
+    trusted_types: Union[bool, frozenset[tuple[str, str]]] = False,
+) -> Callable[[int, bytes], Any]:
+    """Make a msgpack ext hook.
+
+    Pydantic objects are validated by their constructor, falling back to
+    `model_construct` (or `construct` for v1) if validation fails. Objects of
+    trusted types, ie. all types if `trusted_types` is True, or the
+    (module, name) pairs it contains, skip validation.
+    """
+
+    def _trusted(module: str, name: str) -> bool:
+        return trusted_types is True or (
+            trusted_types is not False and (module, name) in trusted_types
+        )
+
+    def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+        if code == EXT_CONSTRUCTOR_SINGLE_ARG:
             try:
-                return cls(**tup[2])
+                tup = ormsgpack.unpackb(
+                    data, ext_hook=_msgpack_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
+                )
+                # module, name, arg
+                return _resolve(tup[0], tup[1])(tup[2])
             except Exception:
-                return cls.construct(**tup[2])
-        except Exception:
-            # for pydantic objects we can't find/reconstruct
-            # let's return the kwargs dict instead
+                return
+        elif code == EXT_CONSTRUCTOR_POS_ARGS:
             try:
-                return tup[2]
-            except NameError:
+                tup = ormsgpack.unpackb(
+                    data, ext_hook=_msgpack_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
+                )
+                # module, name, args
+                return _resolve(tup[0], tup[1])(*tup[2])
+            except Exception:
                 return
-    elif code == EXT_PYDANTIC_V2:
-        try:
-            tup = ormsgpack.unpackb(
-                data, ext_hook=_msgpack_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
-            )
-            # module, name, kwargs, method
-            cls = getattr(importlib.import_module(tup[0]), tup[1])
+        elif code == EXT_CONSTRUCTOR_KW_ARGS:
             try:
-                return cls(**tup[2])
+                tup = ormsgpack.unpackb(
+                    data, ext_hook=_msgpack_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
+                )
+                # module, name, args
+                return _resolve(tup[0], tup[1])(**tup[2])
             except Exception:
-                return cls.model_construct(**tup[2])
-        except Exception:
-            # for pydantic objects we can't find/reconstruct
-            # let's return the kwargs dict instead
+                return
+        elif code == EXT_METHOD_SINGLE_ARG:
             try:
-                return tup[2]
-            except NameError:
+                tup = ormsgpack.unpackb(
+                    data, ext_hook=_msgpack_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
+                )
+                # module, name, arg, method
+                return getattr(_resolve(tup[0], tup[1]), tup[3])(tup[2])
+            except Exception:
                 return
+        elif code == EXT_PYDANTIC_V1:
+            try:
+                tup = ormsgpack.unpackb(
+                    data, ext_hook=_msgpack_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
+                )
+                # module, name, kwargs
+                cls = _resolve(tup[0], tup[1])
+                if _trusted(tup[0], tup[1]):
+                    return cls.construct(**tup[2])
+                try:
+                    return cls(**tup[2])
+                except Exception:
+                    return cls.construct(**tup[2])
+            except Exception:
+                # for pydantic objects we can't find/reconstruct
+                # let's return the kwargs dict instead
+                try:
+                    return tup[2]
+                except NameError:
+                    return
+        elif code == EXT_PYDANTIC_V2:
+            try:
+                tup = ormsgpack.unpackb(
+                    data, ext_hook=_msgpack_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS
+                )
+                # module, name, kwargs, method
+                cls = _resolve(tup[0], tup[1])
+                if _trusted(tup[0], tup[1]):
+                    return cls.model_construct(**tup[2])
+                try:
+                    return cls(**tup[2])
+                except Exception:
+                    return cls.model_construct(**tup[2])
+            except Exception:
+                # for pydantic objects we can't find/reconstruct
+                # let's return the kwargs dict instead
+                try:
+                    return tup[2]
+                except NameError:
+                    return
+
+    return _msgpack_ext_hook
+
+
+_msgpack_ext_hook = _make_msgpack_ext_hook()
 
 
 def _msgpack_ext_hook_to_json(code: int, data: bytes) -> Any:
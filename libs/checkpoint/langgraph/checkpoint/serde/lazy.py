@@ -0,0 +1,118 @@
+import threading
+from collections.abc import ItemsView, Iterator, Mapping, ValuesView
+from typing import Any, Callable
+
+_UNSET = object()
+
+
+class Deferred:
+    """A value computed on first use, eg. a channel value not yet deserialized."""
+
+    __slots__ = ("load", "value")
+
+    def __init__(self, load: Callable[[], Any]) -> None:
+        self.load = load
+        self.value = _UNSET
+
+    def get(self) -> Any:
+        if self.value is _UNSET:
+            self.value = self.load()
+        return self.value
+
+
+class LazyDict(dict):
+    """A dict whose values may be `Deferred`, and are resolved on first access.
+
+    Savers return channel values as a `LazyDict`, so that only the channels
+    actually read are deserialized. Item access, `get()`, `items()`, `values()`,
+    unpacking and comparison all see resolved values, while `copy()` keeps the
+    unresolved values deferred. Pickling or deep-copying produces a plain dict.
+    """
+
+    __slots__ = ("_lock",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: Any) -> Any:
+        value = dict.__getitem__(self, key)
+        if type(value) is Deferred:
+            with self._lock:
+                value = dict.__getitem__(self, key)
+                if type(value) is Deferred:
+                    value = value.get()
+                    dict.__setitem__(self, key, value)
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        # overriding __iter__ makes dict(), dict.update() and ** unpacking
+        # go through __getitem__ instead of copying the deferred values
+        return iter(dict.keys(self))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyDict):
+            other = dict(other.items())
+        return dict(self.items()) == other
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (dict, (dict(self.items()),))
+
+    def __or__(self, other: Any) -> dict:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        new = dict(self.items())
+        new.update(other)
+        return new
+
+    def __ror__(self, other: Any) -> dict:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        new = dict(other)
+        new.update(self.items())
+        return new
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if dict.__contains__(self, key):
+            return self[key]
+        return default
+
+    def items(self) -> ItemsView:  # type: ignore[override]
+        return ItemsView(self)
+
+    def values(self) -> ValuesView:  # type: ignore[override]
+        return ValuesView(self)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        if dict.__contains__(self, key):
+            value = self[key]
+            dict.__delitem__(self, key)
+            return value
+        elif default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self) -> tuple[Any, Any]:
+        key, value = dict.popitem(self)
+        if type(value) is Deferred:
+            value = value.get()
+        return key, value
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if dict.__contains__(self, key):
+            return self[key]
+        self[key] = default
+        return default
+
+    def copy(self) -> "LazyDict":
+        new = LazyDict()
+        dict.update(new, dict.items(self))
+        return new
@@ -1,10 +1,13 @@
 """Utilities for batching operations in a background task."""
 
 import asyncio
+import concurrent.futures
 import functools
+import threading
+import time
 import weakref
-from collections.abc import Iterable
-from typing import Any, Callable, Literal, Optional, TypeVar, Union
+from collections.abc import Hashable, Iterable
+from typing import Any, Callable, Literal, NamedTuple, Optional, TypeVar, Union
 
 from langgraph.store.base import (
     NOT_PROVIDED,
@@ -20,6 +23,7 @@ from langgraph.store.base import (
     Result,
     SearchItem,
     SearchOp,
+    TTLConfig,
     _ensure_refresh,
     _ensure_ttl,
     _validate_namespace,
@@ -53,17 +57,60 @@ def _check_loop(func: F) -> F:
     return wrapper
 
 
+class BatchStats(NamedTuple):
+    """Counters of an `AsyncBatchedBaseStore`, since it was created."""
+
+    batches: int
+    ops: int
+    """Operations submitted, before deduplication."""
+    deduped_ops: int
+    """Operations answered by an identical operation in the same batch."""
+    largest_batch: int
+    """Most operations submitted in one batch, before deduplication."""
+    total_wait: float
+    """Total time operations waited in the queue before their batch ran, in seconds."""
+    max_wait: float
+    """Longest time an operation waited in the queue, in seconds."""
+
+
 class AsyncBatchedBaseStore(BaseStore):
-    """Efficiently batch operations in a background task."""
+    """Efficiently batch operations in a background task.
 
-    __slots__ = ("_loop", "_aqueue", "_task")
+    Operations submitted in the same event loop tick run in one batch, with
+    duplicate reads, and puts to the same key, collapsed.
 
-    def __init__(self) -> None:
+    Attributes:
+        max_batch_size: Maximum number of operations in one batch. Operations
+            beyond it wait for the next batch. Defaults to no limit.
+        batch_linger: Time to wait for more operations once the first one
+            arrives, in seconds, trading latency for larger batches. Defaults
+            to 0, ie. only operations already queued are batched.
+    """
+
+    __slots__ = (
+        "_loop",
+        "_aqueue",
+        "_task",
+        "_stats",
+        "max_batch_size",
+        "batch_linger",
+    )
+
+    def __init__(
+        self, *, max_batch_size: Optional[int] = None, batch_linger: float = 0.0
+    ) -> None:
         super().__init__()
+        self.max_batch_size = max_batch_size
+        self.batch_linger = batch_linger
+        self._stats = BatchStats(0, 0, 0, 0, 0.0, 0.0)
         self._loop = asyncio.get_running_loop()
-        self._aqueue: asyncio.Queue[tuple[asyncio.Future, Op]] = asyncio.Queue()
+        self._aqueue: asyncio.Queue[tuple[asyncio.Future, Op, float]] = asyncio.Queue()
         self._task = self._loop.create_task(_run(self._aqueue, weakref.ref(self)))
 
+    def stats(self) -> BatchStats:
+        """Return the batch and queue wait counters."""
+        return self._stats
+
     def __del__(self) -> None:
         try:
             self._task.cancel()
@@ -87,6 +134,7 @@ class AsyncBatchedBaseStore(BaseStore):
                     key,
                     refresh_ttl=_ensure_refresh(self.ttl_config, refresh_ttl),
                 ),
+                self._loop.time(),
             )
         )
         return await fut
@@ -115,6 +163,7 @@ class AsyncBatchedBaseStore(BaseStore):
                     query,
                     refresh_ttl=_ensure_refresh(self.ttl_config, refresh_ttl),
                 ),
+                self._loop.time(),
             )
         )
         return await fut
@@ -137,6 +186,7 @@ class AsyncBatchedBaseStore(BaseStore):
                 PutOp(
                     namespace, key, value, index, ttl=_ensure_ttl(self.ttl_config, ttl)
                 ),
+                self._loop.time(),
             )
         )
         return await fut
@@ -148,7 +198,7 @@ class AsyncBatchedBaseStore(BaseStore):
     ) -> None:
         assert not self._task.done()
         fut = self._loop.create_future()
-        self._aqueue.put_nowait((fut, PutOp(namespace, key, None)))
+        self._aqueue.put_nowait((fut, PutOp(namespace, key, None), self._loop.time()))
         return await fut
 
     async def alist_namespaces(
@@ -174,7 +224,7 @@ class AsyncBatchedBaseStore(BaseStore):
             limit=limit,
             offset=offset,
         )
-        self._aqueue.put_nowait((fut, op))
+        self._aqueue.put_nowait((fut, op, self._loop.time()))
         return await fut
 
     @_check_loop
@@ -271,6 +321,202 @@ class AsyncBatchedBaseStore(BaseStore):
         ).result()
 
 
+class SyncBatchedStore(BaseStore):
+    """Coalesce operations from concurrent threads into batches of another store.
+
+    Each `get`, `put`, `search`, etc. on a store like `PostgresStore` or
+    `SqliteStore` runs its own `batch()`. When several threads use the store at
+    once, eg. the nodes of a sync graph running in parallel, wrapping it with
+    this class runs their operations together instead: the first caller waits
+    `batch_linger` seconds for others to submit operations, then runs them all
+    in one deduplicated `batch()` on the wrapped store, while the others wait
+    for their results. There is no background thread.
+
+    Async operations are passed through to the wrapped store.
+
+    Args:
+        store: The store to batch operations for.
+        max_batch_size: Maximum number of operations in one batch. Operations
+            beyond it wait for the next batch. Defaults to no limit.
+        batch_linger: Time the first caller waits for more operations, in
+            seconds.
+
+    ???+ example "Example"
+        ```python
+        from langgraph.store.base.batch import SyncBatchedStore
+        from langgraph.store.postgres import PostgresStore
+
+        with PostgresStore.from_conn_string(conn_string) as store:
+            batched = SyncBatchedStore(store, batch_linger=0.002)
+            graph = builder.compile(store=batched)
+        ```
+    """
+
+    __slots__ = (
+        "store",
+        "max_batch_size",
+        "batch_linger",
+        "_lock",
+        "_full",
+        "_pending",
+        "_pending_ops",
+        "_leading",
+        "_stats",
+    )
+
+    def __init__(
+        self,
+        store: BaseStore,
+        *,
+        max_batch_size: Optional[int] = None,
+        batch_linger: float = 0.001,
+    ) -> None:
+        super().__init__()
+        self.store = store
+        self.max_batch_size = max_batch_size
+        self.batch_linger = batch_linger
+        self._lock = threading.Lock()
+        # notified when enough operations are pending to fill a batch
+        self._full = threading.Condition(self._lock)
+        self._pending: list[_SyncRequest] = []
+        self._pending_ops = 0
+        # whether a caller is collecting the next batch
+        self._leading = False
+        self._stats = BatchStats(0, 0, 0, 0, 0.0, 0.0)
+
+    @property
+    def supports_ttl(self) -> bool:  # type: ignore[override]
+        return self.store.supports_ttl
+
+    @property
+    def ttl_config(self) -> Optional[TTLConfig]:  # type: ignore[override]
+        return self.store.ttl_config
+
+    def stats(self) -> BatchStats:
+        """Return the batch and queue wait counters."""
+        return self._stats
+
+    def batch(self, ops: Iterable[Op]) -> list[Result]:
+        request = _SyncRequest(list(ops))
+        with self._lock:
+            self._pending.append(request)
+            self._pending_ops += len(request.ops)
+            if self._leading:
+                if self._is_full():
+                    self._full.notify()
+            else:
+                self._leading = request.leading = True
+        if not request.leading:
+            request.event.wait()
+        if request.leading:
+            # this caller's operations are the first pending, so one batch runs them
+            self._run_batch()
+        return request.result()
+
+    async def abatch(self, ops: Iterable[Op]) -> list[Result]:
+        return await self.store.abatch(ops)
+
+    def _is_full(self) -> bool:
+        return (
+            self.max_batch_size is not None and self._pending_ops >= self.max_batch_size
+        )
+
+    def _run_batch(self) -> None:
+        """Take the pending operations, run them, and pass on the leader role."""
+        requests: list[_SyncRequest] = []
+        try:
+            with self._lock:
+                try:
+                    if self.batch_linger > 0 and not self._is_full():
+                        self._full.wait_for(self._is_full, self.batch_linger)
+                finally:
+                    # even if waiting failed, take the batch so that its callers
+                    # get the error, and let the next caller lead
+                    requests = self._take_batch()
+                    if self._pending:
+                        next_leader = self._pending[0]
+                        next_leader.leading = True
+                        next_leader.event.set()
+                    else:
+                        self._leading = False
+            values = [op for request in requests for op in request.ops]
+            listen, dedupped = _dedupe_ops(values)
+            self._record_batch(requests, len(values), len(dedupped))
+            results = self.store.batch(dedupped)
+            if listen is not None:
+                results = [results[ix] for ix in listen]
+        except BaseException as e:
+            for request in requests:
+                request.set_exception(e)
+            return
+        start = 0
+        for request in requests:
+            request.set_result(results[start : start + len(request.ops)])
+            start += len(request.ops)
+
+    def _take_batch(self) -> list["_SyncRequest"]:
+        requests: list[_SyncRequest] = []
+        size = 0
+        for request in self._pending:
+            if (
+                requests
+                and self.max_batch_size is not None
+                and size + len(request.ops) > self.max_batch_size
+            ):
+                break
+            requests.append(request)
+            size += len(request.ops)
+        del self._pending[: len(requests)]
+        self._pending_ops -= size
+        return requests
+
+    def _record_batch(
+        self, requests: list["_SyncRequest"], n_ops: int, n_deduped: int
+    ) -> None:
+        now = time.monotonic()
+        waits = [now - request.submitted_at for request in requests]
+        with self._lock:
+            stats = self._stats
+            self._stats = BatchStats(
+                batches=stats.batches + 1,
+                ops=stats.ops + n_ops,
+                deduped_ops=stats.deduped_ops + n_ops - n_deduped,
+                largest_batch=max(stats.largest_batch, n_ops),
+                total_wait=stats.total_wait
+                + sum(w * len(r.ops) for w, r in zip(waits, requests)),
+                max_wait=max(stats.max_wait, *waits),
+            )
+
+
+class _SyncRequest:
+    """The operations of one `SyncBatchedStore.batch()` call."""
+
+    __slots__ = ("ops", "submitted_at", "event", "leading", "_future")
+
+    def __init__(self, ops: list[Op]) -> None:
+        self.ops = ops
+        self.submitted_at = time.monotonic()
+        # set when the results are ready, or this request becomes the leader
+        self.event = threading.Event()
+        self.leading = False
+        self._future: concurrent.futures.Future[list[Result]] = (
+            concurrent.futures.Future()
+        )
+
+    def set_result(self, results: list[Result]) -> None:
+        self._future.set_result(results)
+        self.leading = False
+        self.event.set()
+
+    def set_exception(self, exc: BaseException) -> None:
+        self._future.set_exception(exc)
+        self.leading = False
+        self.event.set()
+
+    def result(self) -> list[Result]:
+        return self._future.result()
+
+
 def _dedupe_ops(values: list[Op]) -> tuple[Optional[list[int]], list[Op]]:
     """Dedupe operations while preserving order for results.
 
@@ -286,13 +532,16 @@ def _dedupe_ops(values: list[Op]) -> tuple[Optional[list[int]], list[Op]]:
 
     dedupped: list[Op] = []
     listen: list[int] = []
+    reads: dict[Hashable, int] = {}
     puts: dict[tuple[tuple[str, ...], str], int] = {}
 
     for op in values:
         if isinstance(op, (GetOp, SearchOp, ListNamespacesOp)):
-            try:
-                listen.append(dedupped.index(op))
-            except ValueError:
+            readkey = _read_key(op)
+            if readkey in reads:
+                listen.append(reads[readkey])
+            else:
+                reads[readkey] = len(dedupped)
                 listen.append(len(dedupped))
                 dedupped.append(op)
         elif isinstance(op, PutOp):
@@ -314,27 +563,70 @@ def _dedupe_ops(values: list[Op]) -> tuple[Optional[list[int]], list[Op]]:
     return listen, dedupped
 
 
+def _read_key(op: Union[GetOp, SearchOp, ListNamespacesOp]) -> Hashable:
+    """A key identifying equal read operations."""
+    try:
+        hash(op)
+    except TypeError:
+        # search filters are dicts
+        return (type(op), repr(op))
+    return (type(op), op)
+
+
+def _take_nowait(
+    aqueue: asyncio.Queue[tuple[asyncio.Future, Op, float]],
+    items: list[tuple[asyncio.Future, Op, float]],
+    max_size: Optional[int],
+) -> None:
+    """Move queued operations to items, up to max_size."""
+    try:
+        while max_size is None or len(items) < max_size:
+            items.append(aqueue.get_nowait())
+    except asyncio.QueueEmpty:
+        pass
+
+
 async def _run(
-    aqueue: asyncio.Queue[tuple[asyncio.Future, Op]],
-    store: weakref.ReferenceType[BaseStore],
+    aqueue: asyncio.Queue[tuple[asyncio.Future, Op, float]],
+    store: weakref.ReferenceType[AsyncBatchedBaseStore],
 ) -> None:
+    loop = asyncio.get_running_loop()
     while item := await aqueue.get():
         # check if store is still alive
         if s := store():
             try:
                 # accumulate operations scheduled in same tick
                 items = [item]
-                try:
-                    while item := aqueue.get_nowait():
-                        items.append(item)
-                except asyncio.QueueEmpty:
-                    pass
+                max_size = s.max_batch_size
+                _take_nowait(aqueue, items, max_size)
+                if s.batch_linger > 0:
+                    # and those arriving within the linger window
+                    deadline = loop.time() + s.batch_linger
+                    while (max_size is None or len(items) < max_size) and (
+                        timeout := deadline - loop.time()
+                    ) > 0:
+                        try:
+                            items.append(await asyncio.wait_for(aqueue.get(), timeout))
+                        except asyncio.TimeoutError:
+                            break
+                        _take_nowait(aqueue, items, max_size)
                 # get the operations to run
                 futs = [item[0] for item in items]
                 values = [item[1] for item in items]
                 # action each operation
                 try:
                     listen, dedupped = _dedupe_ops(values)
+                    now = loop.time()
+                    waits = [now - item[2] for item in items]
+                    stats = s._stats
+                    s._stats = BatchStats(
+                        batches=stats.batches + 1,
+                        ops=stats.ops + len(values),
+                        deduped_ops=stats.deduped_ops + len(values) - len(dedupped),
+                        largest_batch=max(stats.largest_batch, len(values)),
+                        total_wait=stats.total_wait + sum(waits),
+                        max_wait=max(stats.max_wait, *waits),
+                    )
                     results = await s.abatch(dedupped)
                     if listen is not None:
                         results = [results[ix] for ix in listen]
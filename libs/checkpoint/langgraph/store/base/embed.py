@@ -4,16 +4,27 @@ This module provides tools to wrap arbitrary embedding functions (both sync and
 into LangChain's Embeddings interface. This enables using custom embedding functions
 with LangChain-compatible tools while maintaining support for both synchronous and
 asynchronous operations.
+
+It also provides wrappers to cache embeddings (`CachedEmbeddings`), and to merge
+concurrent embedding calls into batches (`BatchedEmbeddings`).
 """
 
 import asyncio
+import concurrent.futures
 import functools
+import hashlib
 import json
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Awaitable, Sequence
-from typing import Any, Callable, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Literal, NamedTuple, Optional, Union
 
 from langchain_core.embeddings import Embeddings
 
+if TYPE_CHECKING:
+    from langgraph.cache.base import BaseCache
+
 EmbeddingsFunc = Callable[[Sequence[str]], list[list[float]]]
 """Type for synchronous embedding functions.
 
@@ -221,6 +232,349 @@ class EmbeddingsLambda(Embeddings):
         return (await afunc([text]))[0]
 
 
+class CachedEmbeddings(Embeddings):
+    """Cache embeddings by the hash of the embedded text.
+
+    Texts embedded before, eg. when a document is put again unchanged, are not
+    sent to the wrapped embeddings again. The cache is kept in memory, bounded to
+    `max_entries` (least recently used first out), and optionally persisted in a
+    `BaseCache`, eg. a `SqliteCache` shared across processes. Document and query
+    embeddings are cached separately, as some models embed them differently.
+
+    Args:
+        embeddings: The embeddings to cache.
+        max_entries: Maximum number of embeddings kept in memory, or None for no limit.
+        cache: A cache to persist embeddings in, in addition to memory.
+        namespace: The namespace of the embeddings in `cache`. Use a different
+            namespace for each model.
+        ttl: Time to live of the embeddings in `cache`, in seconds.
+
+    ??? example "Example"
+        ```python
+        from langgraph.cache.sqlite import SqliteCache
+        from langgraph.store.base.embed import CachedEmbeddings
+        from langgraph.store.memory import InMemoryStore
+
+        embeddings = CachedEmbeddings(
+            init_embeddings("openai:text-embedding-3-small"),
+            cache=SqliteCache(path="embeddings.db"),
+            namespace=("embeddings", "text-embedding-3-small"),
+        )
+        store = InMemoryStore(index={"dims": 1536, "embed": embeddings})
+        ```
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        *,
+        max_entries: Optional[int] = 10_000,
+        cache: Optional["BaseCache[list[float]]"] = None,
+        namespace: tuple[str, ...] = ("embeddings",),
+        ttl: Optional[int] = None,
+    ) -> None:
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self.cache = cache
+        self.namespace = namespace
+        self.ttl = ttl
+        self._memory: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, found, missing = self._lookup("document", texts)
+        if missing and self.cache is not None:
+            self._found_in_cache(
+                "document",
+                found,
+                missing,
+                self.cache.get(self._cache_keys("document", missing)),
+            )
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            self._embedded("document", found, missing, vectors)
+            if self.cache is not None:
+                self.cache.set(self._cache_values("document", missing, vectors))
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> list[float]:
+        keys, found, missing = self._lookup("query", [text])
+        if missing and self.cache is not None:
+            self._found_in_cache(
+                "query",
+                found,
+                missing,
+                self.cache.get(self._cache_keys("query", missing)),
+            )
+        if missing:
+            vectors = [self.embeddings.embed_query(text)]
+            self._embedded("query", found, missing, vectors)
+            if self.cache is not None:
+                self.cache.set(self._cache_values("query", missing, vectors))
+        return found[keys[0]]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, found, missing = self._lookup("document", texts)
+        if missing and self.cache is not None:
+            self._found_in_cache(
+                "document",
+                found,
+                missing,
+                await self.cache.aget(self._cache_keys("document", missing)),
+            )
+        if missing:
+            vectors = await self.embeddings.aembed_documents(list(missing.values()))
+            self._embedded("document", found, missing, vectors)
+            if self.cache is not None:
+                await self.cache.aset(self._cache_values("document", missing, vectors))
+        return [found[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        keys, found, missing = self._lookup("query", [text])
+        if missing and self.cache is not None:
+            self._found_in_cache(
+                "query",
+                found,
+                missing,
+                await self.cache.aget(self._cache_keys("query", missing)),
+            )
+        if missing:
+            vectors = [await self.embeddings.aembed_query(text)]
+            self._embedded("query", found, missing, vectors)
+            if self.cache is not None:
+                await self.cache.aset(self._cache_values("query", missing, vectors))
+        return found[keys[0]]
+
+    def clear(self) -> None:
+        """Clear the embeddings cached in memory and in `cache`."""
+        with self._lock:
+            self._memory.clear()
+        if self.cache is not None:
+            self.cache.clear(
+                [self.namespace + ("document",), self.namespace + ("query",)]
+            )
+
+    def _lookup(
+        self, kind: Literal["document", "query"], texts: list[str]
+    ) -> tuple[list[str], dict[str, list[float]], dict[str, str]]:
+        """Hash the texts, and find their embeddings in memory.
+
+        Returns:
+            The hash of each text, the embeddings found by hash, and the texts
+            not found by hash.
+        """
+        keys = [hashlib.sha256(text.encode()).hexdigest() for text in texts]
+        found: dict[str, list[float]] = {}
+        missing: dict[str, str] = {}
+        with self._lock:
+            for key, text in zip(keys, texts):
+                if key in found or key in missing:
+                    continue
+                if (vector := self._memory.get((kind, key))) is not None:
+                    self._memory.move_to_end((kind, key))
+                    found[key] = vector
+                else:
+                    missing[key] = text
+        return keys, found, missing
+
+    def _found_in_cache(
+        self,
+        kind: Literal["document", "query"],
+        found: dict[str, list[float]],
+        missing: dict[str, str],
+        cached: dict[tuple[tuple[str, ...], str], list[float]],
+    ) -> None:
+        for (_, key), vector in cached.items():
+            found[key] = vector
+            del missing[key]
+        self._remember(kind, {key: vector for (_, key), vector in cached.items()})
+
+    def _embedded(
+        self,
+        kind: Literal["document", "query"],
+        found: dict[str, list[float]],
+        missing: dict[str, str],
+        vectors: list[list[float]],
+    ) -> None:
+        if len(vectors) != len(missing):
+            raise ValueError(
+                f"Expected {len(missing)} embeddings, got {len(vectors)} instead"
+            )
+        embedded = dict(zip(missing, vectors))
+        found.update(embedded)
+        self._remember(kind, embedded)
+
+    def _remember(
+        self, kind: Literal["document", "query"], vectors: dict[str, list[float]]
+    ) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            for key, vector in vectors.items():
+                self._memory[(kind, key)] = vector
+                self._memory.move_to_end((kind, key))
+            if self.max_entries is not None:
+                while len(self._memory) > self.max_entries:
+                    self._memory.popitem(last=False)
+
+    def _cache_keys(
+        self, kind: Literal["document", "query"], missing: dict[str, str]
+    ) -> list[tuple[tuple[str, ...], str]]:
+        ns = self.namespace + (kind,)
+        return [(ns, key) for key in missing]
+
+    def _cache_values(
+        self,
+        kind: Literal["document", "query"],
+        missing: dict[str, str],
+        vectors: list[list[float]],
+    ) -> dict[tuple[tuple[str, ...], str], tuple[list[float], Optional[int]]]:
+        ns = self.namespace + (kind,)
+        return {(ns, key): (vector, self.ttl) for key, vector in zip(missing, vectors)}
+
+
+class BatchedEmbeddings(Embeddings):
+    """Merge concurrent calls to embed documents into batches of the wrapped embeddings.
+
+    Calls made at the same time, from several threads or tasks, eg. by stores
+    indexing the puts of nodes running in parallel, are sent to the wrapped
+    embeddings together, split into batches of at most `batch_size` texts.
+    Identical texts are embedded once. Queries are passed through, as most
+    models have no batch API for them.
+
+    Args:
+        embeddings: The embeddings to batch calls to.
+        batch_size: Maximum number of texts sent to the wrapped embeddings in one
+            call, eg. the provider's limit.
+        linger: Time to wait for more calls once the first one arrives, in
+            seconds. Async calls made in the same event loop tick are always merged.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        *,
+        batch_size: int = 512,
+        linger: float = 0.0,
+    ) -> None:
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.linger = linger
+        self._lock = threading.Lock()
+        # calls from threads, waiting for the thread embedding them
+        self._pending: list[_EmbedRequest] = []
+        self._leading = False
+        # calls from tasks, per event loop, waiting for the task embedding them
+        self._apending: dict[asyncio.AbstractEventLoop, list[_EmbedRequest]] = {}
+        self._atasks: set[asyncio.Task[None]] = set()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        future: concurrent.futures.Future[list[list[float]]] = (
+            concurrent.futures.Future()
+        )
+        with self._lock:
+            self._pending.append(_EmbedRequest(texts, future))
+            leading, self._leading = not self._leading, True
+        if not leading:
+            return future.result()
+        # the first caller embeds the texts of all calls pending by then, calls
+        # arriving while it does are embedded by the next one
+        if self.linger > 0:
+            time.sleep(self.linger)
+        with self._lock:
+            requests, self._pending = self._pending, []
+            self._leading = False
+        unique = _unique_texts(requests)
+        try:
+            vectors = [
+                vector
+                for start in range(0, len(unique), self.batch_size)
+                for vector in self.embeddings.embed_documents(
+                    unique[start : start + self.batch_size]
+                )
+            ]
+        except BaseException as exc:
+            _set_exception(requests, exc)
+        else:
+            _set_vectors(requests, unique, vectors)
+        return future.result()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[list[float]]] = loop.create_future()
+        request = _EmbedRequest(texts, future)
+        with self._lock:
+            if (pending := self._apending.get(loop)) is None:
+                pending = self._apending[loop] = []
+                task = loop.create_task(self._aembed_pending(loop))
+                self._atasks.add(task)
+                task.add_done_callback(self._atasks.discard)
+            pending.append(request)
+        return await future
+
+    async def _aembed_pending(self, loop: asyncio.AbstractEventLoop) -> None:
+        # give other tasks until the next tick, or the linger time, to join
+        await asyncio.sleep(self.linger)
+        with self._lock:
+            requests = self._apending.pop(loop)
+        unique = _unique_texts(requests)
+        try:
+            batches = await asyncio.gather(
+                *(
+                    self.embeddings.aembed_documents(
+                        unique[start : start + self.batch_size]
+                    )
+                    for start in range(0, len(unique), self.batch_size)
+                )
+            )
+        except BaseException as exc:
+            _set_exception(requests, exc)
+            return
+        _set_vectors(requests, unique, [v for batch in batches for v in batch])
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return await self.embeddings.aembed_query(text)
+
+
+class _EmbedRequest(NamedTuple):
+    """The texts of one `BatchedEmbeddings` call to embed documents."""
+
+    texts: list[str]
+    future: Union[
+        concurrent.futures.Future[list[list[float]]],
+        asyncio.Future[list[list[float]]],
+    ]
+
+
+def _unique_texts(requests: list[_EmbedRequest]) -> list[str]:
+    return list(dict.fromkeys(text for r in requests for text in r.texts))
+
+
+def _set_exception(requests: list[_EmbedRequest], exc: BaseException) -> None:
+    for r in requests:
+        # async callers may have been cancelled
+        if not r.future.done():
+            r.future.set_exception(exc)
+
+
+def _set_vectors(
+    requests: list[_EmbedRequest], texts: list[str], vectors: list[list[float]]
+) -> None:
+    if len(vectors) != len(texts):
+        _set_exception(
+            requests,
+            ValueError(f"Expected {len(texts)} embeddings, got {len(vectors)} instead"),
+        )
+        return
+    by_text = dict(zip(texts, vectors))
+    for r in requests:
+        if not r.future.done():
+            r.future.set_result([by_text[text] for text in r.texts])
+
+
 def get_text_at_path(obj: Any, path: Union[str, list[str]]) -> list[str]:
     """Extract text from an object using a path expression or pre-tokenized path.
 
@@ -415,6 +769,8 @@ def _get_init_embeddings() -> Optional[Callable[[str], Embeddings]]:
 
 __all__ = [
     "ensure_embeddings",
+    "BatchedEmbeddings",
+    "CachedEmbeddings",
     "EmbeddingsFunc",
     "AEmbeddingsFunc",
 ]
@@ -102,12 +102,16 @@ Tip:
 import asyncio
 import concurrent.futures as cf
 import functools
+import heapq
+import itertools
 import logging
+import threading
+import time
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timezone
 from importlib import util
-from typing import Any, Optional
+from typing import Any, Optional, cast
 
 from langchain_core.embeddings import Embeddings
 
@@ -123,6 +127,7 @@ from langgraph.store.base import (
     Result,
     SearchItem,
     SearchOp,
+    TTLConfig,
     ensure_embeddings,
     get_text_at_path,
     tokenize_path,
@@ -155,11 +160,19 @@ class InMemoryStore(BaseStore):
             # Search by similarity
             results = store.search(("docs",), query="python programming")
 
+        Expiring items:
+            store = InMemoryStore(ttl={"default_ttl": 60, "sweep_interval_minutes": 5})
+            store.put(("users", "123"), "session", {"id": "abc"})  # expires in 60 minutes
+            store.start_ttl_sweeper()  # delete expired items every 5 minutes
+
     Note:
         Semantic search is disabled by default. You can enable it by providing an `index` configuration
         when creating the store. Without this configuration, all `index` arguments passed to
         `put` or `aput`will have no effect.
 
+        As with the SQL stores, expired items are only deleted by `sweep_ttl()`,
+        or by the background thread started with `start_ttl_sweeper()`.
+
     Warning:
         This store keeps all data in memory. Data is lost when the process exits.
         For persistence, use a database-backed store like PostgresStore.
@@ -174,11 +187,26 @@ class InMemoryStore(BaseStore):
     __slots__ = (
         "_data",
         "_vectors",
+        "_vector_index",
+        "_namespace_index",
         "index_config",
         "embeddings",
+        "ttl_config",
+        "_ttls",
+        "_expiry_heap",
+        "_lock",
+        "_ttl_sweeper_thread",
+        "_ttl_stop_event",
     )
 
-    def __init__(self, *, index: Optional[IndexConfig] = None) -> None:
+    supports_ttl: bool = True
+
+    def __init__(
+        self,
+        *,
+        index: Optional[IndexConfig] = None,
+        ttl: Optional[TTLConfig] = None,
+    ) -> None:
         # Both _data and _vectors are wrapped in the In-memory API
         # Do not change their names
         self._data: dict[tuple[str, ...], dict[str, Item]] = defaultdict(dict)
@@ -186,6 +214,10 @@ class InMemoryStore(BaseStore):
         self._vectors: dict[tuple[str, ...], dict[str, dict[str, list[float]]]] = (
             defaultdict(lambda: defaultdict(dict))
         )
+        # NumPy copy of _vectors, for fast search, built when first searched
+        self._vector_index: Optional[_VectorIndex] = None
+        # Tries of the namespaces in _data, built when first needed
+        self._namespace_index: Optional[_NamespaceIndex] = None
         self.index_config = index
         if self.index_config:
             self.index_config = self.index_config.copy()
@@ -200,37 +232,168 @@ class InMemoryStore(BaseStore):
         else:
             self.index_config = None
             self.embeddings = None
+        self.ttl_config = ttl
+        # (namespace, key) -> (ttl in minutes, expiry time)
+        self._ttls: dict[tuple[tuple[str, ...], str], tuple[float, float]] = {}
+        # (expiry time, namespace, key), with stale entries for refreshed TTLs
+        self._expiry_heap: list[tuple[float, tuple[str, ...], str]] = []
+        # guards the data against the TTL sweeper thread
+        self._lock = threading.RLock()
+        self._ttl_sweeper_thread: Optional[threading.Thread] = None
+        self._ttl_stop_event = threading.Event()
 
     def batch(self, ops: Iterable[Op]) -> list[Result]:
         # The batch/abatch methods are treated as internal.
         # Users should access via put/search/get/list_namespaces/etc.
-        results, put_ops, search_ops = self._prepare_ops(ops)
+        with self._lock:
+            results, put_ops, search_ops = self._prepare_ops(ops)
         if search_ops:
             queryinmem_store = self._embed_search_queries(search_ops)
-            self._batch_search(search_ops, queryinmem_store, results)
+            with self._lock:
+                self._batch_search(search_ops, queryinmem_store, results)
 
         to_embed = self._extract_texts(put_ops)
+        embeddings = None
         if to_embed and self.index_config and self.embeddings:
             embeddings = self.embeddings.embed_documents(list(to_embed))
-            self._insertinmem_store(to_embed, embeddings)
-        self._apply_put_ops(put_ops)
+        with self._lock:
+            if embeddings is not None:
+                self._insertinmem_store(to_embed, embeddings)
+            self._apply_put_ops(put_ops)
         return results
 
     async def abatch(self, ops: Iterable[Op]) -> list[Result]:
         # The batch/abatch methods are treated as internal.
         # Users should access via put/search/get/list_namespaces/etc.
-        results, put_ops, search_ops = self._prepare_ops(ops)
+        with self._lock:
+            results, put_ops, search_ops = self._prepare_ops(ops)
         if search_ops:
             queryinmem_store = await self._aembed_search_queries(search_ops)
-            self._batch_search(search_ops, queryinmem_store, results)
+            with self._lock:
+                self._batch_search(search_ops, queryinmem_store, results)
 
         to_embed = self._extract_texts(put_ops)
+        embeddings = None
         if to_embed and self.index_config and self.embeddings:
             embeddings = await self.embeddings.aembed_documents(list(to_embed))
-            self._insertinmem_store(to_embed, embeddings)
-        self._apply_put_ops(put_ops)
+        with self._lock:
+            if embeddings is not None:
+                self._insertinmem_store(to_embed, embeddings)
+            self._apply_put_ops(put_ops)
         return results
 
+    def sweep_ttl(self) -> int:
+        """Delete expired store items based on TTL.
+
+        Returns:
+            int: The number of deleted items.
+        """
+        with self._lock:
+            now = time.monotonic()
+            heap = self._expiry_heap
+            deleted_count = 0
+            while heap and heap[0][0] <= now:
+                expires_at, namespace, key = heapq.heappop(heap)
+                ttl = self._ttls.get((namespace, key))
+                if ttl is None or ttl[1] != expires_at:
+                    # the TTL was refreshed or removed since this entry was pushed
+                    continue
+                del self._ttls[(namespace, key)]
+                self._delete_item(namespace, key)
+                deleted_count += 1
+            return deleted_count
+
+    def start_ttl_sweeper(
+        self, sweep_interval_minutes: Optional[int] = None
+    ) -> cf.Future[None]:
+        """Periodically delete expired store items based on TTL.
+
+        Returns:
+            Future that can be waited on or cancelled.
+        """
+        if not self.ttl_config:
+            future: cf.Future[None] = cf.Future()
+            future.set_result(None)
+            return future
+
+        if self._ttl_sweeper_thread and self._ttl_sweeper_thread.is_alive():
+            logger.info("TTL sweeper thread is already running")
+            # Return a future that can be used to cancel the existing thread
+            future = cf.Future()
+            future.add_done_callback(
+                lambda f: self._ttl_stop_event.set() if f.cancelled() else None
+            )
+            return future
+
+        self._ttl_stop_event.clear()
+
+        interval = float(
+            sweep_interval_minutes or self.ttl_config.get("sweep_interval_minutes") or 5
+        )
+        logger.info(f"Starting store TTL sweeper with interval {interval} minutes")
+
+        future = cf.Future()
+
+        def _sweep_loop() -> None:
+            try:
+                while not self._ttl_stop_event.is_set():
+                    if self._ttl_stop_event.wait(interval * 60):
+                        break
+
+                    try:
+                        expired_items = self.sweep_ttl()
+                        if expired_items > 0:
+                            logger.info(f"Store swept {expired_items} expired items")
+                    except Exception as exc:
+                        logger.exception(
+                            "Store TTL sweep iteration failed", exc_info=exc
+                        )
+                future.set_result(None)
+            except Exception as exc:
+                future.set_exception(exc)
+
+        thread = threading.Thread(target=_sweep_loop, daemon=True, name="ttl-sweeper")
+        self._ttl_sweeper_thread = thread
+        thread.start()
+
+        future.add_done_callback(
+            lambda f: self._ttl_stop_event.set() if f.cancelled() else None
+        )
+        return future
+
+    def stop_ttl_sweeper(self, timeout: Optional[float] = None) -> bool:
+        """Stop the TTL sweeper thread if it's running.
+
+        Args:
+            timeout: Maximum time to wait for the thread to stop, in seconds.
+                If None, wait indefinitely.
+
+        Returns:
+            bool: True if the thread was successfully stopped or wasn't running,
+                False if the timeout was reached before the thread stopped.
+        """
+        if not self._ttl_sweeper_thread or not self._ttl_sweeper_thread.is_alive():
+            return True
+
+        logger.info("Stopping TTL sweeper thread")
+        self._ttl_stop_event.set()
+
+        self._ttl_sweeper_thread.join(timeout)
+        success = not self._ttl_sweeper_thread.is_alive()
+
+        if success:
+            self._ttl_sweeper_thread = None
+            logger.info("TTL sweeper thread stopped")
+        else:
+            logger.warning("Timed out waiting for TTL sweeper thread to stop")
+
+        return success
+
+    def __del__(self) -> None:
+        """Ensure the TTL sweeper thread is stopped when the object is garbage collected."""
+        if hasattr(self, "_ttl_stop_event") and hasattr(self, "_ttl_sweeper_thread"):
+            self.stop_ttl_sweeper(timeout=0.1)
+
     # Helpers
 
     def _filter_items(self, op: SearchOp) -> list[tuple[Item, list[list[float]]]]:
@@ -247,14 +410,7 @@ class InMemoryStore(BaseStore):
             )
 
         filtered = []
-        for namespace in self._data:
-            if not (
-                namespace[: len(namespace_prefix)] == namespace_prefix
-                if len(namespace) >= len(namespace_prefix)
-                else False
-            ):
-                continue
-
+        for namespace in self._get_namespace_index().with_prefix(namespace_prefix):
             for key, item in self._data[namespace].items():
                 if filter_func(item):
                     if op.query and (embeddings := self._vectors[namespace].get(key)):
@@ -271,7 +427,11 @@ class InMemoryStore(BaseStore):
         if self.index_config and self.embeddings and search_ops:
             queries = {op.query for (op, _) in search_ops.values() if op.query}
 
-            if queries:
+            if len(queries) == 1:
+                # most batches search once, no need for threads
+                query = queries.pop()
+                queryinmem_store[query] = self.embeddings.embed_query(query)
+            elif queries:
                 with cf.ThreadPoolExecutor() as executor:
                     futures = {
                         q: executor.submit(self.embeddings.embed_query, q)
@@ -304,7 +464,23 @@ class InMemoryStore(BaseStore):
         results: list[Result],
     ) -> None:
         """Perform batch similarity search for multiple queries."""
+        index = self._get_vector_index() if queryinmem_store else None
+        if index is not None:
+            # score all queries against all vectors in one matrix product
+            queries = list(queryinmem_store)
+            query_scores = index.score(
+                [queryinmem_store[q] for q in queries],
+            )
+            query_columns = {q: ix for ix, q in enumerate(queries)}
         for i, (op, candidates) in ops.items():
+            if index is not None and op.query:
+                results[i] = self._search_index(
+                    index,
+                    op,
+                    candidates,
+                    query_scores[:, query_columns[op.query]],
+                )
+                continue
             if not candidates:
                 results[i] = []
                 continue
@@ -367,6 +543,98 @@ class InMemoryStore(BaseStore):
                     )
                     for (item, _) in candidates[op.offset : op.offset + op.limit]
                 ]
+        if self._ttls:
+            for i, (op, _) in ops.items():
+                if op.refresh_ttl:
+                    for item in cast(list[SearchItem], results[i]):
+                        self._refresh_ttl(item.namespace, item.key)
+
+    def _refresh_ttl(self, namespace: tuple[str, ...], key: str) -> None:
+        if (ttl := self._ttls.get((namespace, key))) is not None:
+            self._set_ttl(namespace, key, ttl[0])
+
+    def _set_ttl(self, namespace: tuple[str, ...], key: str, ttl: float) -> None:
+        expires_at = time.monotonic() + ttl * 60
+        self._ttls[(namespace, key)] = (ttl, expires_at)
+        heapq.heappush(self._expiry_heap, (expires_at, namespace, key))
+        if len(self._expiry_heap) > 2 * len(self._ttls) + 1024:
+            # drop the stale entries left by refreshes
+            self._expiry_heap = [
+                (expires_at, ns, k) for (ns, k), (_, expires_at) in self._ttls.items()
+            ]
+            heapq.heapify(self._expiry_heap)
+
+    def _search_index(
+        self,
+        index: "_VectorIndex",
+        op: SearchOp,
+        candidates: list[tuple[Item, list[list[float]]]],
+        scores: Any,
+    ) -> list[SearchItem]:
+        """Search the vector index, for one query with precomputed scores."""
+        if op.filter:
+            mask = index.items_mask(
+                (item.namespace, item.key) for item, vectors in candidates if vectors
+            )
+        else:
+            mask = index.prefix_mask(op.namespace_prefix)
+        kept: list[tuple[Optional[float], Item]] = []
+        for score, (ns, key) in index.top_k(scores, mask, op.offset + op.limit)[
+            op.offset :
+        ]:
+            if (items := self._data.get(ns)) and (item := items.get(key)):
+                kept.append((score, item))
+        if len(kept) < op.limit:
+            # Corner case: if we request more items than what we have embedded,
+            # fill the rest with non-scored items
+            if not op.filter:
+                candidates = self._filter_items(op)
+            kept.extend(
+                (None, item)
+                for item in [item for item, vectors in candidates if not vectors][
+                    : op.limit - len(kept)
+                ]
+            )
+        return [
+            SearchItem(
+                namespace=item.namespace,
+                key=item.key,
+                value=item.value,
+                created_at=item.created_at,
+                updated_at=item.updated_at,
+                score=score,
+            )
+            for score, item in kept
+        ]
+
+    def _get_vector_index(self) -> Optional["_VectorIndex"]:
+        """Get the vector index, building it if _vectors was replaced.
+        Returns None if vector search isn't configured, or NumPy isn't installed."""
+        if not self.index_config or not self.embeddings or not _check_numpy():
+            return None
+        if self._vector_index is None or self._vector_index.source is not self._vectors:
+            self._vector_index = _VectorIndex(self._vectors)
+        return self._vector_index
+
+    def _get_namespace_index(self) -> "_NamespaceIndex":
+        """Get the namespace index, building it if _data was replaced or
+        namespaces were added to it directly."""
+        index = self._namespace_index
+        if (
+            index is None
+            or index.source is not self._data
+            or index.size != len(index.source)
+        ):
+            index = self._namespace_index = _NamespaceIndex(self._data)
+        return index
+
+    def _namespace_items(self, namespace: tuple[str, ...]) -> dict[str, Item]:
+        """Get the items of a namespace, adding it to _data if missing."""
+        if (items := self._data.get(namespace)) is None:
+            index = self._get_namespace_index()
+            items = self._data[namespace] = {}
+            index.add(namespace)
+        return items
 
     def _prepare_ops(
         self, ops: Iterable[Op]
@@ -382,10 +650,16 @@ class InMemoryStore(BaseStore):
         ] = {}
         for i, op in enumerate(ops):
             if isinstance(op, GetOp):
-                item = self._data[op.namespace].get(op.key)
+                item = self._namespace_items(op.namespace).get(op.key)
+                if item is not None and op.refresh_ttl:
+                    self._refresh_ttl(op.namespace, op.key)
                 results.append(item)
             elif isinstance(op, SearchOp):
-                search_ops[i] = (op, self._filter_items(op))
+                if op.query and not op.filter and self._get_vector_index() is not None:
+                    # candidates are found by the vector index, see _batch_search
+                    search_ops[i] = (op, [])
+                else:
+                    search_ops[i] = (op, self._filter_items(op))
                 results.append(None)
             elif isinstance(op, ListNamespacesOp):
                 results.append(self._handle_list_namespaces(op))
@@ -400,16 +674,28 @@ class InMemoryStore(BaseStore):
     def _apply_put_ops(self, put_ops: dict[tuple[tuple[str, ...], str], PutOp]) -> None:
         for (namespace, key), op in put_ops.items():
             if op.value is None:
-                self._data[namespace].pop(key, None)
-                self._vectors[namespace].pop(key, None)
+                self._delete_item(namespace, key)
             else:
-                self._data[namespace][key] = Item(
+                self._namespace_items(namespace)[key] = Item(
                     value=op.value,
                     key=key,
                     namespace=namespace,
                     created_at=datetime.now(timezone.utc),
                     updated_at=datetime.now(timezone.utc),
                 )
+            if op.value is not None and op.ttl is not None:
+                self._set_ttl(namespace, key, op.ttl)
+            else:
+                self._ttls.pop((namespace, key), None)
+
+    def _delete_item(self, namespace: tuple[str, ...], key: str) -> None:
+        self._namespace_items(namespace).pop(key, None)
+        self._vectors[namespace].pop(key, None)
+        if (
+            self._vector_index is not None
+            and self._vector_index.source is self._vectors
+        ):
+            self._vector_index.remove(namespace, key)
 
     def _extract_texts(
         self, put_ops: dict[tuple[tuple[str, ...], str], PutOp]
@@ -450,26 +736,355 @@ class InMemoryStore(BaseStore):
                 f"Number of embeddings ({len(embeddings)}) does not"
                 f" match number of indices ({len(indices)})"
             )
+        index = self._vector_index
+        if index is not None and index.source is not self._vectors:
+            index = None
         for embedding, (ns, key, path) in zip(embeddings, indices):
             self._vectors[ns][key][path] = embedding
+            if index is not None:
+                index.set(ns, key, path, embedding)
 
     def _handle_list_namespaces(self, op: ListNamespacesOp) -> list[tuple[str, ...]]:
-        all_namespaces = list(
-            self._data.keys()
-        )  # Avoid collection size changing while iterating
-        namespaces = all_namespaces
-        if op.match_conditions:
-            namespaces = [
-                ns
-                for ns in namespaces
-                if all(_does_match(condition, ns) for condition in op.match_conditions)
-            ]
+        index = self._get_namespace_index()
+        conditions = list(op.match_conditions or ())
+        max_depth = op.max_depth
+        prefix = next((c for c in conditions if c.match_type == "prefix"), None)
+        suffix = next((c for c in conditions if c.match_type == "suffix"), None)
+        # narrow down the namespaces with the first prefix or suffix condition,
+        # then check the others
+        namespaces: Iterator[tuple[str, ...]]
+        if prefix is not None:
+            conditions.remove(prefix)
+            if (
+                not conditions
+                and max_depth is not None
+                and len(prefix.path) <= max_depth
+            ):
+                # stop at max_depth, instead of truncating every namespace below it
+                namespaces = index.match_prefix(prefix.path, max_depth)
+                max_depth = None
+            else:
+                namespaces = index.match_prefix(prefix.path)
+        elif suffix is not None:
+            conditions.remove(suffix)
+            namespaces = iter(index.match_suffix(suffix.path))
+        else:
+            namespaces = index.match_prefix((), max_depth)
+            max_depth = None
+        if conditions:
+            namespaces = (
+                ns for ns in namespaces if all(_does_match(c, ns) for c in conditions)
+            )
+        if max_depth is not None:
+            # namespaces are sorted, so truncated duplicates are consecutive
+            namespaces = (
+                ns for ns, _ in itertools.groupby(ns[:max_depth] for ns in namespaces)
+            )
+        return list(itertools.islice(namespaces, op.offset, op.offset + op.limit))
+
+
+class _VectorIndex:
+    """A NumPy copy of the vectors of an InMemoryStore.
 
-        if op.max_depth is not None:
-            namespaces = sorted({ns[: op.max_depth] for ns in namespaces})
+    Vectors are normalized, and kept in the rows of one preallocated matrix, so
+    that scoring a batch of queries against all of them is one matrix product.
+    Each row records the namespace of its item, to filter rows by namespace
+    prefix with a boolean mask.
+    """
+
+    __slots__ = (
+        "source",
+        "dims",
+        "matrix",
+        "live",
+        "row_ns",
+        "row_items",
+        "item_rows",
+        "free_rows",
+        "size",
+        "namespaces",
+        "prefix_masks",
+    )
+
+    def __init__(
+        self,
+        vectors: dict[tuple[str, ...], dict[str, dict[str, list[float]]]],
+        capacity: int = 1024,
+    ) -> None:
+        import numpy as np  # type: ignore[import-not-found]
+
+        self.source = vectors
+        self.dims: Optional[int] = None
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.live = np.zeros(capacity, dtype=bool)
+        self.row_ns = np.zeros(capacity, dtype=np.int32)
+        self.row_items: list[Optional[tuple[tuple[str, ...], str]]] = [None] * capacity
+        self.item_rows: dict[tuple[tuple[str, ...], str], dict[str, int]] = {}
+        self.free_rows: list[int] = []
+        self.size = 0
+        # namespace -> id, used in row_ns
+        self.namespaces: dict[tuple[str, ...], int] = {}
+        # namespace prefix -> mask of namespace ids, reset when a namespace is added
+        self.prefix_masks: dict[tuple[str, ...], Any] = {}
+        for ns, items in vectors.items():
+            for key, paths in items.items():
+                for path, vector in paths.items():
+                    self.set(ns, key, path, vector)
+
+    def set(self, ns: tuple[str, ...], key: str, path: str, vector: Any) -> None:
+        import numpy as np
+
+        arr = np.asarray(vector, dtype=np.float32)
+        if self.dims is None:
+            self.dims = len(arr)
+            self.matrix = np.zeros((len(self.live), self.dims), dtype=np.float32)
+        elif len(arr) != self.dims:
+            raise ValueError(
+                f"Embedding has {len(arr)} dimensions, expected {self.dims}"
+            )
+        paths = self.item_rows.setdefault((ns, key), {})
+        if path in paths:
+            row = paths[path]
         else:
-            namespaces = sorted(namespaces)
-        return namespaces[op.offset : op.offset + op.limit]
+            row = self._allocate_row()
+            paths[path] = row
+            if ns not in self.namespaces:
+                self.namespaces[ns] = len(self.namespaces)
+                self.prefix_masks.clear()
+            self.row_ns[row] = self.namespaces[ns]
+            self.row_items[row] = (ns, key)
+            self.live[row] = True
+        norm = np.linalg.norm(arr)
+        # zero vectors keep a zero row, ie. a score of 0
+        self.matrix[row] = arr / norm if norm else arr
+
+    def remove(self, ns: tuple[str, ...], key: str) -> None:
+        for row in self.item_rows.pop((ns, key), {}).values():
+            self.live[row] = False
+            self.row_items[row] = None
+            self.free_rows.append(row)
+
+    def score(self, queries: list[list[float]]) -> Any:
+        """Cosine similarity of each query (columns) with each row (rows)."""
+        import numpy as np
+
+        q = np.asarray(queries, dtype=np.float32)
+        norms = np.linalg.norm(q, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        if self.dims is None:
+            return np.zeros((0, len(queries)), dtype=np.float32)
+        return self.matrix[: self.size] @ (q / norms).T
+
+    def prefix_mask(self, prefix: tuple[str, ...]) -> Any:
+        """Mask of the live rows in a namespace starting with prefix."""
+        import numpy as np
+
+        if (ns_mask := self.prefix_masks.get(prefix)) is None:
+            ns_mask = np.zeros(max(len(self.namespaces), 1), dtype=bool)
+            for ns, ns_id in self.namespaces.items():
+                if ns[: len(prefix)] == prefix:
+                    ns_mask[ns_id] = True
+            self.prefix_masks[prefix] = ns_mask
+        return ns_mask[self.row_ns[: self.size]] & self.live[: self.size]
+
+    def items_mask(self, items: Iterable[tuple[tuple[str, ...], str]]) -> Any:
+        """Mask of the rows of the given items."""
+        import numpy as np
+
+        mask = np.zeros(self.size, dtype=bool)
+        rows = [row for item in items for row in self.item_rows.get(item, {}).values()]
+        mask[rows] = True
+        return mask
+
+    def top_k(
+        self, scores: Any, mask: Any, k: int
+    ) -> list[tuple[float, tuple[tuple[str, ...], str]]]:
+        """The k items with the highest score, scoring each item by its best row."""
+        import numpy as np
+
+        candidates = np.flatnonzero(mask)
+        if k <= 0 or not len(candidates):
+            return []
+        candidate_scores = scores[candidates]
+        # items can have several rows, so more than k rows may be needed
+        n = k
+        while True:
+            n = min(n, len(candidates))
+            if n < len(candidates):
+                top = np.argpartition(-candidate_scores, n - 1)[:n]
+            else:
+                top = np.arange(n)
+            # highest score first, ties in row order
+            top = top[np.lexsort((candidates[top], -candidate_scores[top]))]
+            seen: set[tuple[tuple[str, ...], str]] = set()
+            results: list[tuple[float, tuple[tuple[str, ...], str]]] = []
+            for ix in top:
+                item = self.row_items[candidates[ix]]
+                if item is None or item in seen:
+                    continue
+                seen.add(item)
+                results.append((float(candidate_scores[ix]), item))
+                if len(results) == k:
+                    return results
+            if n == len(candidates):
+                return results
+            n *= 2
+
+    def _allocate_row(self) -> int:
+        import numpy as np
+
+        if self.free_rows:
+            return self.free_rows.pop()
+        if self.size == len(self.live):
+            capacity = len(self.live) * 2
+            matrix = np.zeros((capacity, self.dims or 0), dtype=np.float32)
+            matrix[: self.size] = self.matrix[: self.size]
+            self.matrix = matrix
+            self.live = np.concatenate([self.live, np.zeros_like(self.live)])
+            self.row_ns = np.concatenate([self.row_ns, np.zeros_like(self.row_ns)])
+            self.row_items.extend([None] * (capacity - len(self.row_items)))
+        self.size += 1
+        return self.size - 1
+
+
+class _NamespaceNode:
+    __slots__ = ("children", "seq", "_labels")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _NamespaceNode] = {}
+        # order in which the namespace ending here was added, if any
+        self.seq: Optional[int] = None
+        self._labels: Optional[list[str]] = None
+
+    def labels(self) -> list[str]:
+        """The labels of the children, sorted, cached until a child is added."""
+        if self._labels is None:
+            self._labels = sorted(self.children)
+        return self._labels
+
+
+class _NamespaceIndex:
+    """Tries of the namespaces of an InMemoryStore.
+
+    Namespaces are looked up by prefix in a trie of their labels, and by suffix
+    in a trie of their reversed labels, so that searching and listing namespaces
+    only visits the matching ones. Namespaces are never removed from _data, so
+    nodes are never removed from the tries.
+    """
+
+    __slots__ = ("source", "prefixes", "suffixes", "size")
+
+    def __init__(self, data: dict[tuple[str, ...], dict[str, Item]]) -> None:
+        self.source = data
+        self.prefixes = _NamespaceNode()
+        self.suffixes = _NamespaceNode()
+        self.size = 0
+        for ns in data:
+            self.add(ns)
+
+    def add(self, ns: tuple[str, ...]) -> None:
+        node = _insert(self.prefixes, ns)
+        if node.seq is None:
+            node.seq = self.size
+            _insert(self.suffixes, ns[::-1]).seq = self.size
+            self.size += 1
+
+    def with_prefix(self, prefix: tuple[str, ...]) -> list[tuple[str, ...]]:
+        """Namespaces starting with prefix, in the order they were added."""
+        node = self.prefixes
+        for label in prefix:
+            if (child := node.children.get(label)) is None:
+                return []
+            node = child
+        found: list[tuple[int, tuple[str, ...]]] = []
+        stack = [(prefix, node)]
+        while stack:
+            path, node = stack.pop()
+            if node.seq is not None:
+                found.append((node.seq, path))
+            stack.extend(
+                (path + (label,), child) for label, child in node.children.items()
+            )
+        found.sort()
+        return [ns for _, ns in found]
+
+    def match_prefix(
+        self, path: tuple[str, ...], max_depth: Optional[int] = None
+    ) -> Iterator[tuple[str, ...]]:
+        """Namespaces matching a prefix path with wildcards, in sorted order.
+
+        With max_depth, namespaces are truncated to max_depth labels, and
+        duplicates skipped. max_depth must not be shorter than path.
+        """
+        # iterators over the children of each node on the current path, so that
+        # only the namespaces that are consumed are visited
+        stack: list[Iterator[tuple[tuple[str, ...], _NamespaceNode]]] = [
+            iter(_descend(self.prefixes, path))
+        ]
+        while stack:
+            if (next_ := next(stack[-1], None)) is None:
+                stack.pop()
+                continue
+            ns, node = next_
+            if max_depth is not None and len(ns) >= max_depth:
+                if node.seq is not None or node.children:
+                    yield ns
+                continue
+            if node.seq is not None:
+                yield ns
+            if node.children:
+                stack.append(_iter_children(ns, node))
+
+    def match_suffix(self, path: tuple[str, ...]) -> list[tuple[str, ...]]:
+        """Namespaces matching a suffix path with wildcards, in sorted order."""
+        found: list[tuple[str, ...]] = []
+        stack = _descend(self.suffixes, path[::-1])
+        while stack:
+            rev, node = stack.pop()
+            if node.seq is not None:
+                found.append(rev[::-1])
+            stack.extend(
+                (rev + (label,), child) for label, child in node.children.items()
+            )
+        found.sort()
+        return found
+
+
+def _insert(node: _NamespaceNode, labels: tuple[str, ...]) -> _NamespaceNode:
+    for label in labels:
+        if (child := node.children.get(label)) is None:
+            child = node.children[label] = _NamespaceNode()
+            node._labels = None
+        node = child
+    return node
+
+
+def _iter_children(
+    ns: tuple[str, ...], node: _NamespaceNode
+) -> Iterator[tuple[tuple[str, ...], _NamespaceNode]]:
+    for label in node.labels():
+        yield ns + (label,), node.children[label]
+
+
+def _descend(
+    root: _NamespaceNode, path: tuple[str, ...]
+) -> list[tuple[tuple[str, ...], _NamespaceNode]]:
+    """The nodes at the end of a path with wildcards, in sorted order."""
+    level: list[tuple[tuple[str, ...], _NamespaceNode]] = [((), root)]
+    for label in path:
+        if label == "*":
+            level = [
+                (ns + (child_label,), node.children[child_label])
+                for ns, node in level
+                for child_label in node.labels()
+            ]
+        else:
+            level = [
+                (ns + (label,), child)
+                for ns, node in level
+                if (child := node.children.get(label)) is not None
+            ]
+    return level
 
 
 @functools.lru_cache(maxsize=1)
@@ -0,0 +1,67 @@
+import time
+
+from langgraph.cache.memory import InMemoryCache
+
+
+def test_in_memory_cache_max_entries_lru() -> None:
+    cache: InMemoryCache[str] = InMemoryCache(max_entries=2)
+    cache.set({(("ns",), "a"): ("a", None), (("ns",), "b"): ("b", None)})
+    # reading "a" makes "b" the least recently used
+    assert cache.get([(("ns",), "a")]) == {(("ns",), "a"): "a"}
+    cache.set({(("ns",), "c"): ("c", None)})
+    assert cache.get([(("ns",), "a"), (("ns",), "b"), (("ns",), "c")]) == {
+        (("ns",), "a"): "a",
+        (("ns",), "c"): "c",
+    }
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (3, 1, 1, 2)
+
+
+def test_in_memory_cache_max_entries_lfu() -> None:
+    cache: InMemoryCache[str] = InMemoryCache(max_entries=2, eviction="lfu")
+    cache.set({(("ns",), "a"): ("a", None), (("ns",), "b"): ("b", None)})
+    for _ in range(3):
+        cache.get([(("ns",), "a")])
+    cache.get([(("ns",), "b")])
+    # inserting "c" evicts "b", used less often than "a", then "d" evicts "c"
+    cache.set({(("ns",), "c"): ("c", None)})
+    cache.set({(("ns",), "d"): ("d", None)})
+    assert set(cache.get([(("ns",), k) for k in "abcd"])) == {
+        (("ns",), "a"),
+        (("ns",), "d"),
+    }
+    assert cache.stats().evictions == 2
+
+
+def test_in_memory_cache_max_bytes() -> None:
+    cache: InMemoryCache[str] = InMemoryCache(max_bytes=100)
+    cache.set({(("ns",), str(i)): ("x" * 40, None) for i in range(3)})
+    stats = cache.stats()
+    assert stats.entries == 2
+    assert stats.bytes <= 100
+    assert cache.get([(("ns",), "0")]) == {}
+    # values larger than the limit are not cached
+    cache.set({(("ns",), "big"): ("x" * 200, None)})
+    assert cache.get([(("ns",), "big")]) == {}
+    assert cache.stats().entries == 2
+    cache.clear([("ns",)])
+    assert cache.stats().bytes == 0
+
+
+def test_in_memory_cache_sweep() -> None:
+    cache: InMemoryCache[str] = InMemoryCache()
+    cache.set({(("ns",), "a"): ("a", 0), (("ns",), "b"): ("b", None)})
+    assert cache.sweep() == 1
+    assert cache.stats().entries == 1
+
+    cache.set({(("ns",), "c"): ("c", 0)})
+    future = cache.start_sweeper(0.01)
+    try:
+        deadline = time.monotonic() + 5
+        while cache.stats().entries > 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cache.stats().expirations == 2
+    finally:
+        assert cache.stop_sweeper(timeout=5)
+    assert future.done()
+    assert cache.get([(("ns",), "b")]) == {(("ns",), "b"): "b"}
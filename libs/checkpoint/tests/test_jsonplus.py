@@ -1,4 +1,5 @@
 import dataclasses
+import importlib
 import pathlib
 import re
 import sys
@@ -8,17 +9,22 @@ from datetime import date, datetime, time, timezone
 from decimal import Decimal
 from enum import Enum
 from ipaddress import IPv4Address
+from typing import Any
 from zoneinfo import ZoneInfo
 
 import dataclasses_json
+import pytest
 from pydantic import BaseModel, SecretStr
 from pydantic.v1 import BaseModel as BaseModelV1
 from pydantic.v1 import SecretStr as SecretStrV1
+from pytest_mock import MockerFixture
 
 from langgraph.checkpoint.serde.jsonplus import (
     JsonPlusSerializer,
     _msgpack_ext_hook_to_json,
+    _resolve,
 )
+from langgraph.checkpoint.serde.lazy import Deferred, LazyDict
 from langgraph.store.base import Item
 
 
@@ -311,3 +317,75 @@ def test_loads_cannot_find() -> None:
     )
 
     assert serde.loads_typed(dumped) is None, "Should return None if cannot find module"
+
+
+def test_serde_jsonplus_lazy_dict() -> None:
+    serde = JsonPlusSerializer()
+    loads: list[str] = []
+
+    def load(value: str) -> Any:
+        loads.append(value)
+        return value
+
+    values = LazyDict(a=Deferred(lambda: load("a")), b=Deferred(lambda: load("b")))
+    copied = values.copy()
+    assert loads == []
+    assert values["a"] == "a"
+    assert values.get("b") == "b"
+    # copies share the deferred values, which are only resolved once
+    assert copied == {"a": "a", "b": "b"}
+    assert loads == ["a", "b"]
+
+    unresolved = LazyDict(a=Deferred(lambda: [1, 2]))
+    assert serde.loads_typed(serde.dumps_typed({"values": unresolved})) == {
+        "values": {"a": [1, 2]}
+    }
+    assert {**LazyDict(a=Deferred(lambda: 1))} == {"a": 1}
+
+
+class ValidatedPydantic(BaseModel):
+    name: str
+    validations: int = 0
+
+    def __init__(self, **data: Any) -> None:
+        super().__init__(**{**data, "validations": data.get("validations", 0) + 1})
+
+
+class ValidatedPydanticV1(BaseModelV1):
+    name: str
+    validations: int = 0
+
+    def __init__(self, **data: Any) -> None:
+        super().__init__(**{**data, "validations": data.get("validations", 0) + 1})
+
+
+def test_serde_jsonplus_trusted_types(mocker: MockerFixture) -> None:
+    obj = {
+        "v2": ValidatedPydantic.model_construct(name="a"),
+        "v1": ValidatedPydanticV1.construct(name="b"),
+        "inner": InnerPydantic(hello="world"),
+    }
+    dumped = JsonPlusSerializer().dumps_typed(obj)
+
+    # models are validated, unless trusted
+    loaded = JsonPlusSerializer().loads_typed(dumped)
+    assert (loaded["v2"].validations, loaded["v1"].validations) == (1, 1)
+    for trusted_types in (True, [ValidatedPydantic, ValidatedPydanticV1]):
+        loaded = JsonPlusSerializer(trusted_types=trusted_types).loads_typed(dumped)
+        assert loaded == obj
+        assert (loaded["v2"].validations, loaded["v1"].validations) == (0, 0)
+    loaded = JsonPlusSerializer(
+        trusted_types=[("tests.test_jsonplus", "ValidatedPydantic")]
+    ).loads_typed(dumped)
+    assert (loaded["v2"].validations, loaded["v1"].validations) == (0, 1)
+    for invalid in ("ab", ("tests.test_jsonplus", "ValidatedPydantic", "x")):
+        with pytest.raises(ValueError, match="Trusted types"):
+            JsonPlusSerializer(trusted_types=[invalid])  # type: ignore[list-item]
+
+    # classes are imported once
+    _resolve.cache_clear()
+    import_module = mocker.spy(importlib, "import_module")
+    serde = JsonPlusSerializer(trusted_types=True)
+    for _ in range(3):
+        assert serde.loads_typed(dumped) == obj
+    assert import_module.call_count == 3
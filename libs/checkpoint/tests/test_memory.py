@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from typing import Any
 
 import pytest
@@ -9,13 +10,15 @@ from langgraph.checkpoint.base import (
     create_checkpoint,
     empty_checkpoint,
 )
-from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.memory import InMemorySaver, ShardedInMemorySaver
+from langgraph.checkpoint.serde.delta import AppendLog
+from langgraph.checkpoint.serde.types import TASKS
 
 
 class TestMemorySaver:
-    @pytest.fixture(autouse=True)
-    def setup(self) -> None:
-        self.memory_saver = InMemorySaver()
+    @pytest.fixture(autouse=True, params=[InMemorySaver, ShardedInMemorySaver])
+    def setup(self, request: pytest.FixtureRequest) -> None:
+        self.memory_saver = request.param()
 
         # objects for test setup
         self.config_1: RunnableConfig = {
@@ -143,6 +146,35 @@ class TestMemorySaver:
 
         # TODO: test before and limit params
 
+    async def test_list_metadata(self) -> None:
+        for config, checkpoint, metadata in (
+            (self.config_1, self.chkpnt_1, self.metadata_1),
+            (self.config_2, self.chkpnt_2, self.metadata_2),
+            (self.config_3, self.chkpnt_3, self.metadata_3),
+        ):
+            self.memory_saver.put(
+                config, checkpoint, metadata, checkpoint["channel_versions"]
+            )
+
+        for config, filter in (
+            (None, {}),
+            (None, {"source": "input"}),
+            ({"configurable": {"thread_id": "thread-2"}}, None),
+            ({"configurable": {"thread_id": "thread-2", "checkpoint_ns": ""}}, None),
+        ):
+            expected = [
+                (t.config, t.metadata, t.parent_config, t.checkpoint["ts"])
+                for t in self.memory_saver.list(config, filter=filter)
+            ]
+            assert [
+                tuple(t) for t in self.memory_saver.list_metadata(config, filter=filter)
+            ] == expected
+            assert [
+                tuple(t)
+                async for t in self.memory_saver.alist_metadata(config, filter=filter)
+            ] == expected
+        assert len(list(self.memory_saver.list_metadata(None, limit=2))) == 2
+
     async def test_asearch(self) -> None:
         # set up test
         # save checkpoints
@@ -208,3 +240,182 @@ def test_memory_saver() -> None:
     from langgraph.checkpoint.memory import MemorySaver
 
     assert isinstance(MemorySaver(), InMemorySaver)
+
+
+def test_memory_saver_append_log() -> None:
+    saver = InMemorySaver(append_log=AppendLog(["messages"], snapshot_every=2))
+    config: RunnableConfig = {"configurable": {"thread_id": "1", "checkpoint_ns": ""}}
+    checkpoint = empty_checkpoint()
+    messages: list[str] = []
+    expected = []
+    for step in range(6):
+        if step == 4:
+            # replace an item in the middle
+            messages = messages[:1] + ["replaced"] + messages[2:]
+        messages = messages + [f"msg-{step}"]
+        checkpoint = create_checkpoint(checkpoint, None, step)
+        checkpoint["channel_values"] = {"messages": messages, "other": [step]}
+        checkpoint["channel_versions"] = {"messages": step + 1, "other": step + 1}
+        config = saver.put(
+            config, checkpoint, {}, {"messages": step + 1, "other": step + 1}
+        )
+        expected.append((config, list(messages)))
+
+    types = [saver.blobs[("1", "", "messages", v)][0] for v in range(1, 7)]
+    assert types == [
+        "msgpack",
+        "delta:msgpack",
+        "delta:msgpack",
+        "msgpack",
+        "delta:msgpack",
+        "delta:msgpack",
+    ]
+    # other channels are always stored in full
+    assert saver.blobs[("1", "", "other", 2)][0] == "msgpack"
+
+    for config, messages in expected:
+        saved = saver.get_tuple(config)
+        assert saved is not None
+        assert saved.checkpoint["channel_values"]["messages"] == messages
+
+    # deleting the thread drops the cached snapshot
+    saver.delete_thread("1")
+    checkpoint["channel_values"] = {"messages": messages + ["new"]}
+    config = saver.put(
+        {"configurable": {"thread_id": "1", "checkpoint_ns": ""}},
+        checkpoint,
+        {},
+        {"messages": 7},
+    )
+    assert saver.blobs[("1", "", "messages", 7)][0] == "msgpack"
+
+
+def test_sharded_memory_saver_keep_last() -> None:
+    saver = ShardedInMemorySaver(
+        keep_last=3, append_log=AppendLog(["messages"], snapshot_every=2)
+    )
+    config: RunnableConfig = {"configurable": {"thread_id": "1", "checkpoint_ns": ""}}
+    checkpoint = empty_checkpoint()
+    messages: list[str] = []
+    configs = []
+    for step in range(8):
+        messages = messages + [f"msg-{step}"]
+        checkpoint = create_checkpoint(checkpoint, None, step)
+        checkpoint["channel_values"] = {"messages": messages, "step": step}
+        checkpoint["channel_versions"] = {"messages": step + 1, "step": step + 1}
+        config = saver.put(
+            config, checkpoint, {}, {"messages": step + 1, "step": step + 1}
+        )
+        saver.put_writes(config, [(TASKS, f"send-{step}"), ("step", step)], "task")
+        configs.append(config)
+
+    # latest checkpoint
+    latest = saver.get_tuple({"configurable": {"thread_id": "1"}})
+    assert latest is not None
+    assert latest.config == configs[-1]
+    assert latest.checkpoint["channel_values"] == {"messages": messages, "step": 7}
+    assert latest.checkpoint["pending_sends"] == ["send-6"]
+
+    # only the last 3 checkpoints are kept
+    assert [c.config for c in saver.list(None)] == configs[:-4:-1]
+    assert saver.get_tuple(configs[-4]) is None
+    oldest = saver.get_tuple(configs[-3])
+    assert oldest is not None
+    assert oldest.checkpoint["channel_values"]["messages"] == messages[:-2]
+    assert oldest.checkpoint["pending_sends"] == ["send-4"]
+    assert oldest.pending_writes == [
+        ("task", TASKS, "send-5"),
+        ("task", "step", 5),
+    ]
+
+    # blobs no longer referenced are dropped, except snapshots of retained deltas
+    shard = saver.shards["1"]
+    assert sorted(k[2] for k in shard.blobs if k[1] == "step") == [6, 7, 8]
+    assert sorted(k[2] for k in shard.blobs if k[1] == "messages") == [4, 6, 7, 8]
+
+    saver.delete_thread("1")
+    assert saver.get_tuple({"configurable": {"thread_id": "1"}}) is None
+    assert list(saver.list(None)) == []
+
+
+def test_sharded_memory_saver_keep_last_list_during_put() -> None:
+    saver = ShardedInMemorySaver(keep_last=3)
+    config: RunnableConfig = {"configurable": {"thread_id": "1", "checkpoint_ns": ""}}
+    checkpoint = empty_checkpoint()
+
+    def put(step: int) -> RunnableConfig:
+        nonlocal checkpoint
+        checkpoint = create_checkpoint(checkpoint, None, step)
+        checkpoint["channel_values"] = {"step": step}
+        checkpoint["channel_versions"] = {"step": step + 1}
+        return saver.put(config, checkpoint, {"step": step}, {"step": step + 1})
+
+    configs = [put(step) for step in range(3)]
+    # the thread keeps running while its history is read, evicting listed checkpoints
+    listed = []
+    for step, checkpoint_tuple in enumerate(saver.list(config), start=3):
+        listed.append(checkpoint_tuple.config)
+        configs.append(put(step))
+    # the oldest checkpoint was evicted by the first put, before it was listed
+    assert listed == [configs[2], configs[1]]
+    assert [c.config for c in saver.list(config)] == configs[:-4:-1]
+    assert saver.get_tuple(configs[0]) is None
+    latest = saver.get_tuple({"configurable": {"thread_id": "1"}})
+    assert latest is not None
+    assert latest.config == configs[-1]
+
+
+def test_sharded_memory_saver_keep_last_overwrite() -> None:
+    saver = ShardedInMemorySaver(
+        keep_last=2, append_log=AppendLog(["messages"], snapshot_every=3)
+    )
+    config: RunnableConfig = {"configurable": {"thread_id": "1", "checkpoint_ns": ""}}
+    checkpoint = empty_checkpoint()
+    messages: list[str] = []
+    for step in range(6):
+        parent_config = config
+        messages = messages + [f"msg-{step}"]
+        checkpoint = create_checkpoint(checkpoint, None, step)
+        checkpoint["channel_values"] = {"messages": messages, "step": step}
+        checkpoint["channel_versions"] = {"messages": step + 1, "step": step + 1}
+        config = saver.put(
+            parent_config, checkpoint, {}, {"messages": step + 1, "step": step + 1}
+        )
+        # the same checkpoint is saved again, eg. by a retried put
+        checkpoint = checkpoint.copy()
+        checkpoint["channel_values"] = {"messages": messages, "step": -step}
+        checkpoint["channel_versions"] = {"messages": step + 1, "step": step + 1.5}
+        config = saver.put(parent_config, checkpoint, {}, {"step": step + 1.5})
+
+    latest = saver.get_tuple({"configurable": {"thread_id": "1"}})
+    assert latest is not None
+    assert latest.checkpoint["channel_values"] == {"messages": messages, "step": -5}
+    # blobs of the overwritten checkpoints are released with them
+    shard = saver.shards["1"]
+    assert sorted(k[2] for k in shard.blobs if k[1] == "step") == [5.5, 6.5]
+    assert sorted(k[2] for k in shard.blobs if k[1] == "messages") == [5, 6]
+    assert shard.refs == {
+        ("", "step", 5.5): 1,
+        ("", "step", 6.5): 1,
+        ("", "messages", 5): 2,
+        ("", "messages", 6): 1,
+    }
+
+
+def test_sharded_memory_saver_list_during_delete() -> None:
+    saver = ShardedInMemorySaver()
+    for thread_id in ("1", "2"):
+        config: RunnableConfig = {
+            "configurable": {"thread_id": thread_id, "checkpoint_ns": ""}
+        }
+        saver.put(config, empty_checkpoint(), {}, {})
+    search = saver._search
+
+    def search_then_delete(*args: Any) -> Iterator[Any]:
+        # another thread deletes the thread of each checkpoint once it is found
+        for found in search(*args):
+            saver.delete_thread(found[0])
+            yield found
+
+    saver._search = search_then_delete  # type: ignore[method-assign]
+    assert list(saver.list(None)) == []
@@ -1,23 +1,30 @@
 # mypy: disable-error-code="operator"
 import asyncio
 import json
+import threading
+import time
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
 import pytest
 from pytest_mock import MockerFixture
 
+from langgraph.cache.memory import InMemoryCache
 from langgraph.store.base import (
     GetOp,
     InvalidNamespaceError,
     Item,
+    MatchCondition,
     Op,
     PutOp,
     Result,
     get_text_at_path,
 )
-from langgraph.store.base.batch import AsyncBatchedBaseStore
+from langgraph.store.base import batch as batch_module
+from langgraph.store.base.batch import AsyncBatchedBaseStore, SyncBatchedStore
+from langgraph.store.base.embed import BatchedEmbeddings, CachedEmbeddings
 from langgraph.store.memory import InMemoryStore
 from tests.embed_test_utils import CharacterEmbeddings
 
@@ -155,6 +162,133 @@ async def test_async_batch_store(mocker: MockerFixture) -> None:
     ]
 
 
+async def test_async_batch_store_dedupe_and_limits() -> None:
+    batches: list[list[Op]] = []
+
+    class MockStore(AsyncBatchedBaseStore):
+        def batch(self, ops: Iterable[Op]) -> list[Result]:
+            raise NotImplementedError
+
+        async def abatch(self, ops: Iterable[Op]) -> list[Result]:
+            batches.append(list(ops))
+            return [getattr(op, "key", None) for op in ops]  # type: ignore[misc]
+
+    store = MockStore()
+
+    # identical reads, including searches with filters, run once
+    results = await asyncio.gather(
+        *(store.aget(("a",), str(i % 3)) for i in range(300)),
+        store.asearch(("a",), filter={"x": [1, {"y": 2}]}),
+        store.asearch(("a",), filter={"x": [1, {"y": 2}]}),
+        store.asearch(("a",), filter={"x": [1, {"y": 3}]}),
+    )
+    assert results == [str(i % 3) for i in range(300)] + [None] * 3
+    assert [len(ops) for ops in batches] == [5]
+    stats = store.stats()
+    assert (stats.batches, stats.ops, stats.deduped_ops, stats.largest_batch) == (
+        1,
+        303,
+        298,
+        303,
+    )
+    assert 0 <= stats.max_wait and stats.max_wait * 303 >= stats.total_wait
+
+    # batches are capped at max_batch_size
+    batches.clear()
+    store.max_batch_size = 3
+    await asyncio.gather(*(store.aget(("a",), str(i)) for i in range(7)))
+    assert [len(ops) for ops in batches] == [3, 3, 1]
+
+    # operations arriving within the linger window join the batch
+    batches.clear()
+    store.max_batch_size = None
+    store.batch_linger = 0.1
+
+    async def delayed_get(key: str) -> Optional[Item]:
+        await asyncio.sleep(0.01)
+        return await store.aget(("a",), key)
+
+    await asyncio.gather(store.aget(("a",), "x"), delayed_get("y"))
+    assert [[op.key for op in ops] for ops in batches] == [["x", "y"]]  # type: ignore[union-attr]
+    assert store.stats().max_wait >= 0.01
+
+
+def test_sync_batched_store(monkeypatch: pytest.MonkeyPatch) -> None:
+    batches: list[list[Op]] = []
+
+    class RecordingStore(InMemoryStore):
+        __slots__ = ()
+
+        def batch(self, ops: Iterable[Op]) -> list[Result]:
+            ops = list(ops)
+            batches.append(ops)
+            if any(getattr(op, "key", None) == "boom" for op in ops):
+                raise ValueError("boom")
+            return super().batch(ops)
+
+    inner = RecordingStore()
+    store = SyncBatchedStore(inner, batch_linger=0.05)
+    for i in range(8):
+        inner.put(("a",), str(i), {"i": i})
+    batches.clear()
+
+    # operations from concurrent threads run in a few batches
+    barrier = threading.Barrier(16)
+
+    def read(i: int) -> Optional[Item]:
+        barrier.wait()
+        return store.get(("a",), str(i % 8))
+
+    with ThreadPoolExecutor(16) as pool:
+        items = list(pool.map(read, range(16)))
+    assert [item.value["i"] if item else None for item in items] == [
+        i % 8 for i in range(16)
+    ]
+    assert len(batches) < 16
+    assert sum(len(ops) for ops in batches) <= 16
+    stats = store.stats()
+    assert stats.ops == 16
+    assert stats.ops - stats.deduped_ops == sum(len(ops) for ops in batches)
+
+    # batches are capped at max_batch_size, and errors reach every caller
+    batches.clear()
+    store.max_batch_size = 2
+    barrier = threading.Barrier(6)
+
+    def write(i: int) -> Optional[Exception]:
+        barrier.wait()
+        try:
+            store.put(("b",), "boom" if i == 0 else str(i), {"i": i})
+        except ValueError as e:
+            return e
+        return None
+
+    with ThreadPoolExecutor(6) as pool:
+        errors = list(pool.map(write, range(6)))
+    assert all(len(ops) <= 2 for ops in batches)
+    assert errors[0] is not None
+    assert sum(e is not None for e in errors) <= 2
+    assert sorted(item.key for item in store.search(("b",), limit=10)) == sorted(
+        str(i) for i, e in enumerate(errors) if e is None
+    )
+
+    # errors preparing a batch reach its callers, and the next caller leads
+    def fail(values: list[Op]) -> Any:
+        raise RuntimeError("dedupe")
+
+    monkeypatch.setattr(batch_module, "_dedupe_ops", fail)
+    with pytest.raises(RuntimeError, match="dedupe"):
+        store.get(("a",), "0")
+    monkeypatch.undo()
+    items = []
+    thread = threading.Thread(
+        target=lambda: items.append(store.get(("a",), "0")), daemon=True
+    )
+    thread.start()
+    thread.join(timeout=5)
+    assert len(items) == 1 and items[0] is not None and items[0].value == {"i": 0}
+
+
 def test_list_namespaces_basic() -> None:
     store = InMemoryStore()
 
@@ -948,3 +1082,274 @@ async def test_embed_with_path(fake_embeddings: CharacterEmbeddings) -> None:
     assert len(results) == 3
     doc5_result = next(r for r in results if r.key == "doc5")
     assert doc5_result.score is None
+
+
+def test_vector_index_matches_scan(fake_embeddings: CharacterEmbeddings) -> None:
+    class ScanStore(InMemoryStore):
+        __slots__ = ()
+
+        def _get_vector_index(self) -> None:
+            return None
+
+    index = {"dims": fake_embeddings.dims, "embed": fake_embeddings}
+    indexed, scanned = InMemoryStore(index=index), ScanStore(index=index)
+    words = ["apple", "banana", "cherry", "date", "elder", "fig", "grape"]
+    for store in (indexed, scanned):
+        for i in range(40):
+            store.put(
+                ("docs", words[i % 3]),
+                f"doc{i}",
+                {"text": f"{words[i % 7]} {words[i % 5]}", "n": i % 4},
+            )
+        # updates, deletes and unindexed items are reflected in results
+        store.put(("docs", "apple"), "doc0", {"text": "grape grape", "n": 0})
+        store.delete(("docs", "banana"), "doc1")
+        store.put(("docs", "cherry"), "plain", {"text": "fig"}, index=False)
+
+    for query, prefix, filter, offset in [
+        ("grape", ("docs",), None, 0),
+        ("banana split", ("docs", "banana"), None, 3),
+        ("fig", ("docs",), {"n": 2}, 1),
+        ("fig", ("docs", "cherry"), None, 10),
+        ("fig", ("other",), None, 0),
+    ]:
+        expected = scanned.search(
+            prefix, query=query, filter=filter, offset=offset, limit=5
+        )
+        results = indexed.search(
+            prefix, query=query, filter=filter, offset=offset, limit=5
+        )
+        assert [r.key for r in results] == [r.key for r in expected]
+        assert [r.score for r in results] == pytest.approx(
+            [r.score for r in expected], abs=1e-5
+        )
+    assert indexed._vector_index is not None
+
+    # replacing the vectors rebuilds the index
+    indexed._vectors = scanned._vectors
+    assert [r.key for r in indexed.search(("docs",), query="date")] == [
+        r.key for r in scanned.search(("docs",), query="date")
+    ]
+    assert indexed._vector_index.source is scanned._vectors
+
+
+def test_namespace_index_matches_scan() -> None:
+    from langgraph.store.memory import _does_match
+
+    store = InMemoryStore()
+    labels = ["a", "b", "c"]
+    for i in range(200):
+        ns = tuple(labels[(i * 7 + d * i) % 3] for d in range(1 + i % 4))
+        store.put(ns, f"k{i}", {"i": i})
+    # reading or deleting in a namespace adds it, even if it stays empty
+    store.get(("z", "empty"), "missing")
+    store.delete(("a", "z"), "missing")
+
+    def list_scan(
+        prefix: Any = None, suffix: Any = None, max_depth: Any = None
+    ) -> list[tuple[str, ...]]:
+        conditions = []
+        if prefix:
+            conditions.append(MatchCondition(match_type="prefix", path=prefix))
+        if suffix:
+            conditions.append(MatchCondition(match_type="suffix", path=suffix))
+        namespaces = [
+            ns
+            for ns in store._data
+            if all(_does_match(cond, ns) for cond in conditions)
+        ]
+        if max_depth is not None:
+            return sorted({ns[:max_depth] for ns in namespaces})
+        return sorted(namespaces)
+
+    for prefix, suffix, max_depth in [
+        (None, None, None),
+        (None, None, 1),
+        (None, None, 2),
+        (("a",), None, None),
+        (("a",), None, 2),
+        (("a", "b", "c"), None, 2),
+        (("*", "b"), None, 3),
+        (None, ("c",), None),
+        (None, ("*", "a"), 2),
+        (("b",), ("c",), None),
+        (("b", "*"), ("a", "c"), 3),
+        (("nope",), None, None),
+    ]:
+        expected = list_scan(prefix, suffix, max_depth)
+        for offset, limit in [(0, 1000), (0, 3), (5, 4), (len(expected) // 2, 10)]:
+            assert (
+                store.list_namespaces(
+                    prefix=prefix,
+                    suffix=suffix,
+                    max_depth=max_depth,
+                    offset=offset,
+                    limit=limit,
+                )
+                == expected[offset : offset + limit]
+            ), (prefix, suffix, max_depth, offset, limit)
+
+    # search returns items in the order their namespaces were added
+    for prefix in [(), ("a",), ("b", "c"), ("z",)]:
+        expected_keys = [
+            key
+            for ns, items in store._data.items()
+            if ns[: len(prefix)] == prefix
+            for key in items
+        ]
+        results = store.search(prefix, limit=1000)
+        assert [r.key for r in results] == expected_keys
+
+    # replacing the data rebuilds the index
+    store._data = {("x", "y"): {}}
+    assert store.list_namespaces() == [("x", "y")]
+    assert store._namespace_index is not None
+    assert store._namespace_index.source is store._data
+
+
+def test_ttl(mocker: MockerFixture) -> None:
+    clock = mocker.patch("langgraph.store.memory.time")
+    clock.monotonic.return_value = 0.0
+    store = InMemoryStore(ttl={"default_ttl": 2, "sweep_interval_minutes": 1})
+    store.put(("a",), "default", {"v": 1})
+    store.put(("a",), "short", {"v": 2}, ttl=1)
+    store.put(("a",), "forever", {"v": 3}, ttl=None)
+    store.put(("a",), "read", {"v": 4}, ttl=1)
+    store.put(("a",), "searched", {"v": 5}, ttl=1)
+    store.put(("b",), "not-refreshed", {"v": 6}, ttl=1)
+    assert store.sweep_ttl() == 0
+
+    # reads refresh the TTL of the items they return, unless told not to
+    clock.monotonic.return_value = 50.0
+    assert store.get(("a",), "read") is not None
+    assert [r.key for r in store.search(("a",), filter={"v": 5})] == ["searched"]
+    assert store.get(("b",), "not-refreshed", refresh_ttl=False) is not None
+    # updating an item without a TTL removes its TTL
+    store.put(("a",), "short", {"v": 2}, ttl=None)
+
+    clock.monotonic.return_value = 61.0
+    assert store.sweep_ttl() == 1
+    assert store.get(("b",), "not-refreshed") is None
+    clock.monotonic.return_value = 121.0
+    assert store.sweep_ttl() == 3
+    assert sorted(item.key for item in store.search(("a",))) == ["forever", "short"]
+
+    # stale heap entries for refreshed TTLs are compacted
+    for _ in range(3000):
+        store.get(("a",), "default")
+    store.put(("a",), "default", {"v": 1})
+    for _ in range(3000):
+        store.get(("a",), "default")
+    assert len(store._expiry_heap) <= 1024 + 2 * len(store._ttls) + 1
+
+    clock.monotonic.return_value = 1000.0
+    future = store.start_ttl_sweeper(sweep_interval_minutes=0.0001)  # type: ignore[arg-type]
+    try:
+        deadline = time.monotonic() + 5
+        while (
+            store.get(("a",), "default", refresh_ttl=False)
+            and time.monotonic() < deadline
+        ):
+            time.sleep(0.01)
+        assert store.get(("a",), "default") is None
+    finally:
+        assert store.stop_ttl_sweeper(timeout=5)
+    assert future.done()
+
+
+class RecordingEmbeddings(CharacterEmbeddings):
+    def __init__(self) -> None:
+        super().__init__(dims=8)
+        self.calls: list[list[str]] = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        self.calls.append([text])
+        return super().embed_query(text)
+
+
+async def test_cached_embeddings() -> None:
+    inner = RecordingEmbeddings()
+    persisted: InMemoryCache[list[float]] = InMemoryCache()
+    embeddings = CachedEmbeddings(inner, max_entries=3, cache=persisted)
+    expected = inner.embed_documents(["a", "b", "c", "d"])
+    inner.calls.clear()
+
+    # each new text is embedded once, and identical texts in a call once
+    assert embeddings.embed_documents(["a", "b", "a"]) == [
+        expected[0],
+        expected[1],
+        expected[0],
+    ]
+    assert embeddings.embed_documents(["b", "c"]) == expected[1:3]
+    assert await embeddings.aembed_documents(["c", "a"]) == [expected[2], expected[0]]
+    assert inner.calls == [["a", "b"], ["c"]]
+    # queries are cached separately
+    assert embeddings.embed_query("a") == expected[0]
+    assert await embeddings.aembed_query("a") == expected[0]
+    assert inner.calls == [["a", "b"], ["c"], ["a"]]
+
+    # embeddings evicted from memory are found in the persisted cache
+    assert len(embeddings._memory) == 3
+    fresh = CachedEmbeddings(inner, cache=persisted)
+    assert fresh.embed_documents(["a", "b", "c", "d"]) == expected
+    assert inner.calls[3:] == [["d"]]
+
+    embeddings.clear()
+    assert persisted.stats().entries == 0
+    assert embeddings.embed_documents(["a"]) == expected[:1]
+    assert inner.calls[4:] == [["a"]]
+
+    # indexing puts again with unchanged text doesn't embed it again
+    store = InMemoryStore(index={"dims": 8, "embed": embeddings})
+    inner.calls.clear()
+    store.put(("docs",), "1", {"text": "hello"})
+    store.put(("docs",), "1", {"text": "hello"})
+    assert inner.calls == [['{"text": "hello"}']]
+
+
+async def test_batched_embeddings() -> None:
+    inner = RecordingEmbeddings()
+    embeddings = BatchedEmbeddings(inner, batch_size=4, linger=0.05)
+    expected = dict(zip("abcdefg", inner.embed_documents(list("abcdefg"))))
+    inner.calls.clear()
+
+    # concurrent calls from threads are merged, deduped and split in batches
+    barrier = threading.Barrier(4)
+
+    def embed(texts: str) -> list[list[float]]:
+        barrier.wait()
+        return embeddings.embed_documents(list(texts))
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(embed, ["abc", "cde", "efg", "a"]))
+    assert results == [
+        [expected[t] for t in texts] for texts in ["abc", "cde", "efg", "a"]
+    ]
+    assert all(len(call) <= 4 for call in inner.calls)
+    assert sorted(t for call in inner.calls for t in call) == list("abcdefg")
+
+    # and so are calls from tasks
+    inner.calls.clear()
+    results = await asyncio.gather(
+        *(embeddings.aembed_documents(list(texts)) for texts in ["abc", "cde", "efg"])
+    )
+    assert results == [[expected[t] for t in texts] for texts in ["abc", "cde", "efg"]]
+    assert sorted(map(len, inner.calls)) == [3, 4]
+    assert sorted(t for call in inner.calls for t in call) == list("abcdefg")
+
+    # errors reach every caller
+    class FailingEmbeddings(RecordingEmbeddings):
+        async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+            raise ValueError("boom")
+
+    failing = BatchedEmbeddings(FailingEmbeddings())
+    errors = await asyncio.gather(
+        failing.aembed_documents(["a"]),
+        failing.aembed_documents(["b"]),
+        return_exceptions=True,
+    )
+    assert [type(e) for e in errors] == [ValueError, ValueError]
@@ -5,15 +5,20 @@ from langchain_core.messages import HumanMessage
 from pyperf._runner import Runner
 from uvloop import new_event_loop
 
+from bench.fanout import fanout
 from bench.fanout_to_subgraph import fanout_to_subgraph, fanout_to_subgraph_sync
 from bench.pydantic_state import pydantic_state
 from bench.react_agent import react_agent
 from bench.sequential import create_sequential
+from bench.serde import checkpoint_messages, decode
+from bench.sqlite_readers import concurrent_ainvoke, sqlite_threads
 from bench.wide_dict import wide_dict
 from bench.wide_state import wide_state
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 from langgraph.graph import StateGraph
 from langgraph.pregel import Pregel
+from langgraph.pregel.executor import SharedExecutor
 
 
 async def arun(graph: Pregel, input: dict):
@@ -136,6 +141,30 @@ benchmarks = (
             ]
         },
     ),
+    (
+        "fanout_1000x",
+        fanout(1000).compile(checkpointer=None),
+        fanout(1000).compile(checkpointer=None),
+        {"results": []},
+    ),
+    (
+        "fanout_1000x_checkpoint",
+        fanout(1000).compile(checkpointer=MemorySaver()),
+        fanout(1000).compile(checkpointer=MemorySaver()),
+        {"results": []},
+    ),
+    (
+        "fanout_10000x",
+        fanout(10000).compile(checkpointer=None),
+        fanout(10000).compile(checkpointer=None),
+        {"results": []},
+    ),
+    (
+        "fanout_10000x_checkpoint",
+        fanout(10000).compile(checkpointer=MemorySaver()),
+        fanout(10000).compile(checkpointer=MemorySaver()),
+        {"results": []},
+    ),
     (
         "react_agent_10x",
         react_agent(10, checkpointer=None),
@@ -471,6 +500,24 @@ for name, agraph, graph, input in benchmarks:
     if graph is not None:
         r.bench_func(name + "_sync", run, graph, input)
 
+# Sync run time with a thread pool shared across runs, vs one pool per run above
+GRAPHS_FOR_SHARED_EXECUTOR = (
+    "sequential_10",
+    "react_agent_10x",
+    "fanout_to_subgraph_10x",
+)
+shared_executor = SharedExecutor(warm=True)
+
+for name, _, graph, input in benchmarks:
+    if name not in GRAPHS_FOR_SHARED_EXECUTOR:
+        continue
+    r.bench_func(
+        name + "_sync_shared_executor",
+        run,
+        graph.copy({"executor": shared_executor}),
+        input,
+    )
+
 
 # Pick a handful of graphs to measure the first event latency.
 # At the moment, limiting just due to the size of the annotation on github.
@@ -513,3 +560,25 @@ compilation_benchmarks = (
 
 for name, graph in compilation_benchmarks:
     r.bench_func(name + "_compilation", compile_graph, graph)
+
+# Checkpoint deserialization times
+messages_2000 = checkpoint_messages(2_000)
+r.bench_func("decode_messages_2000", decode, JsonPlusSerializer(), messages_2000)
+r.bench_func(
+    "decode_messages_2000_trusted",
+    decode,
+    JsonPlusSerializer(trusted_types=True),
+    messages_2000,
+)
+
+# Concurrent runs checkpointed to SQLite, with and without reader connections
+sqlite_100_threads = sqlite_threads(100, 100)
+for readers in (0, 4):
+    r.bench_async_func(
+        f"sqlite_100x_concurrent_ainvoke_{readers}_readers",
+        concurrent_ainvoke,
+        sqlite_100_threads,
+        100,
+        readers,
+        loop_factory=new_event_loop,
+    )
@@ -0,0 +1,62 @@
+"""Create a graph that fans out to thousands of tasks in a single step."""
+
+import operator
+from typing import Annotated
+
+from typing_extensions import TypedDict
+
+from langgraph.constants import END, START, Send
+from langgraph.graph.state import StateGraph
+from langgraph.utils.runnable import RunnableCallable
+
+
+def fanout(number_tasks: int) -> StateGraph:
+    """Create a graph that fans out to `number_tasks` tasks, then joins them."""
+
+    class State(TypedDict):
+        results: Annotated[list[int], operator.add]
+
+    def continue_to_work(state: State) -> list[Send]:
+        return [Send("work", i) for i in range(number_tasks)]
+
+    def work(item: int) -> dict:
+        return {"results": [item]}
+
+    async def awork(item: int) -> dict:
+        return {"results": [item]}
+
+    def join(state: State) -> dict:
+        return {"results": [len(state["results"])]}
+
+    async def ajoin(state: State) -> dict:
+        return {"results": [len(state["results"])]}
+
+    builder = StateGraph(State)
+    builder.add_node("work", RunnableCallable(work, awork))
+    builder.add_node("join", RunnableCallable(join, ajoin))
+    builder.add_conditional_edges(START, continue_to_work, ["work"])
+    builder.add_edge("work", "join")
+    builder.add_edge("join", END)
+    return builder
+
+
+if __name__ == "__main__":
+    import asyncio
+    import time
+
+    import uvloop
+
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    for number_tasks in (1000, 5000, 10000):
+        graph = fanout(number_tasks).compile(checkpointer=InMemorySaver())
+        config = {"configurable": {"thread_id": "1"}}
+
+        async def run():
+            len([c async for c in graph.astream({"results": []}, config=config)])
+
+        uvloop.install()
+        start = time.time()
+        asyncio.run(run())
+        end = time.time()
+        print(f"{number_tasks} tasks: {end - start:.4f} seconds")
@@ -0,0 +1,47 @@
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+
+def messages(n: int) -> list[BaseMessage]:
+    """A conversation of n messages, from a tool calling agent."""
+    result: list[BaseMessage] = []
+    for i in range(n // 3 + 1):
+        result.append(HumanMessage(content=f"question {i}", id=f"human-{i}"))
+        result.append(
+            AIMessage(
+                content="",
+                id=f"ai-{i}",
+                tool_calls=[
+                    {"name": "search", "args": {"query": f"q{i}"}, "id": f"call-{i}"}
+                ],
+            )
+        )
+        result.append(
+            ToolMessage(content=f"result {i}", tool_call_id=f"call-{i}", id=f"tool-{i}")
+        )
+    return result[:n]
+
+
+def checkpoint_messages(n: int) -> tuple[str, bytes]:
+    """A messages channel value with n messages, as stored in a checkpoint."""
+    return JsonPlusSerializer().dumps_typed(messages(n))
+
+
+def decode(serde: JsonPlusSerializer, data: tuple[str, bytes]) -> None:
+    serde.loads_typed(data)
+
+
+if __name__ == "__main__":
+    import time
+
+    data = checkpoint_messages(2000)
+    for name, serde in [
+        ("default", JsonPlusSerializer()),
+        ("trusted", JsonPlusSerializer(trusted_types=True)),
+    ]:
+        start = time.time()
+        for _ in range(20):
+            decode(serde, data)
+        end = time.time()
+        print(f"Time taken ({name}): {(end - start) / 20:.4f} seconds")
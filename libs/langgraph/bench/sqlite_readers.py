@@ -0,0 +1,67 @@
+import asyncio
+import os
+import tempfile
+from typing import Annotated
+
+from typing_extensions import TypedDict
+
+from bench.serde import messages
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.constants import START
+from langgraph.graph import StateGraph
+from langgraph.graph.message import add_messages
+
+
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
+    turns: int
+
+
+def chat() -> StateGraph:
+    """A graph that reads the conversation history of its thread."""
+    builder = StateGraph(State)
+    builder.add_node("respond", lambda state: {"turns": len(state["messages"])})
+    builder.add_edge(START, "respond")
+    return builder
+
+
+def sqlite_threads(threads: int, history: int) -> str:
+    """A SQLite database file with `threads` threads of `history` messages each."""
+    path = os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")
+
+    async def seed() -> None:
+        async with AsyncSqliteSaver.from_conn_string(path) as saver:
+            graph = chat().compile(checkpointer=saver)
+            for i in range(threads):
+                await graph.ainvoke(
+                    {"messages": messages(history)},
+                    {"configurable": {"thread_id": str(i)}},
+                )
+
+    asyncio.run(seed())
+    return path
+
+
+async def concurrent_ainvoke(path: str, threads: int, readers: int) -> None:
+    """Continue every thread of the database concurrently, reading its state first."""
+    async with AsyncSqliteSaver.from_conn_string(path, readers=readers) as saver:
+        graph = chat().compile(checkpointer=saver)
+
+        async def run(thread_id: str) -> None:
+            config = {"configurable": {"thread_id": thread_id}}
+            await graph.aget_state(config)
+            await graph.ainvoke({"turns": 0}, config)
+
+        await asyncio.gather(*(run(str(i)) for i in range(threads)))
+
+
+if __name__ == "__main__":
+    import time
+
+    path = sqlite_threads(100, 100)
+    for readers in (0, 4):
+        start = time.time()
+        for _ in range(5):
+            asyncio.run(concurrent_ainvoke(path, 100, readers))
+        end = time.time()
+        print(f"Time taken ({readers} readers): {(end - start) / 5:.4f} seconds")
@@ -30,7 +30,7 @@ from langgraph.pregel import Channel, Pregel
 from langgraph.pregel.read import PregelNode
 from langgraph.pregel.write import ChannelWrite, ChannelWriteEntry
 from langgraph.store.base import BaseStore
-from langgraph.types import All, Checkpointer
+from langgraph.types import All, Checkpointer, StreamBuffer, TokenCoalescing
 from langgraph.utils.runnable import RunnableLike, coerce_to_runnable
 
 logger = logging.getLogger(__name__)
@@ -321,6 +321,8 @@ class Graph:
         *,
         cache: Optional[BaseCache] = None,
         store: Optional[BaseStore] = None,
+        stream_coalescing: Optional[TokenCoalescing] = None,
+        stream_buffer: Optional[StreamBuffer] = None,
     ) -> "CompiledGraph":
         """Compiles the graph into a `CompiledGraph` object.
 
@@ -337,6 +339,8 @@ class Graph:
             interrupt_after: An optional list of node names to interrupt after.
             debug: A flag indicating whether to enable debug mode.
             name: The name to use for the compiled graph.
+            stream_coalescing: Merge consecutive LLM tokens streamed with stream_mode "messages" into fewer message chunks.
+            stream_buffer: Bound on the number of chunks buffered by stream() and astream() until they are consumed.
 
         Returns:
             CompiledGraph: The compiled graph.
@@ -371,6 +375,8 @@ class Graph:
             name=name or "LangGraph",
             cache=cache,
             store=store,
+            stream_coalescing=stream_coalescing,
+            stream_buffer=stream_buffer,
         )
 
         # attach nodes, edges, and branches
@@ -80,7 +80,15 @@ from langgraph.pregel.write import (
     ChannelWriteTupleEntry,
 )
 from langgraph.store.base import BaseStore
-from langgraph.types import All, CachePolicy, Checkpointer, Command, RetryPolicy
+from langgraph.types import (
+    All,
+    CachePolicy,
+    Checkpointer,
+    Command,
+    RetryPolicy,
+    StreamBuffer,
+    TokenCoalescing,
+)
 from langgraph.utils.fields import get_field_default, get_update_as_tuples
 from langgraph.utils.pydantic import create_model
 from langgraph.utils.runnable import RunnableLike, coerce_to_runnable
@@ -585,6 +593,8 @@ class StateGraph(Graph):
         interrupt_after: Optional[Union[All, list[str]]] = None,
         debug: bool = False,
         name: Optional[str] = None,
+        stream_coalescing: Optional[TokenCoalescing] = None,
+        stream_buffer: Optional[StreamBuffer] = None,
     ) -> "CompiledStateGraph":
         """Compiles the state graph into a `CompiledStateGraph` object.
 
@@ -601,6 +611,8 @@ class StateGraph(Graph):
             interrupt_after: An optional list of node names to interrupt after.
             debug: A flag indicating whether to enable debug mode.
             name: The name to use for the compiled graph.
+            stream_coalescing: Merge consecutive LLM tokens streamed with stream_mode "messages" into fewer message chunks.
+            stream_buffer: Bound on the number of chunks buffered by stream() and astream() until they are consumed.
 
         Returns:
             CompiledStateGraph: The compiled state graph.
@@ -666,6 +678,8 @@ class StateGraph(Graph):
             store=store,
             cache=cache,
             name=name or "LangGraph",
+            stream_coalescing=stream_coalescing,
+            stream_buffer=stream_buffer,
         )
 
         compiled.attach_node(START, None)
@@ -40,9 +40,15 @@ from langgraph.cache.base import BaseCache
 from langgraph.channels.base import (
     BaseChannel,
 )
+from langgraph.channels.binop import BinaryOperatorAggregate
+from langgraph.channels.dynamic_barrier_value import DynamicBarrierValue
+from langgraph.channels.last_value import LastValue
+from langgraph.channels.named_barrier_value import NamedBarrierValue
+from langgraph.channels.untracked_value import UntrackedValue
 from langgraph.checkpoint.base import (
     BaseCheckpointSaver,
     Checkpoint,
+    CheckpointMetadataTuple,
     CheckpointTuple,
     copy_checkpoint,
 )
@@ -91,6 +97,7 @@ from langgraph.pregel.call import identifier
 from langgraph.pregel.checkpoint import create_checkpoint, empty_checkpoint
 from langgraph.pregel.debug import tasks_w_writes
 from langgraph.pregel.draw import draw_graph
+from langgraph.pregel.executor import SharedExecutor
 from langgraph.pregel.io import map_input, read_channels
 from langgraph.pregel.loop import AsyncPregelLoop, StreamProtocol, SyncPregelLoop
 from langgraph.pregel.manager import AsyncChannelsManager, ChannelsManager
@@ -111,8 +118,10 @@ from langgraph.types import (
     LoopProtocol,
     StateSnapshot,
     StateUpdate,
+    StreamBuffer,
     StreamChunk,
     StreamMode,
+    TokenCoalescing,
 )
 from langgraph.utils.config import (
     ensure_config,
@@ -481,6 +490,14 @@ class Pregel(PregelProtocol):
     stream_channels: str | Sequence[str] | None = None
     """Channels to stream, defaults to all channels not in reserved channels"""
 
+    stream_coalescing: TokenCoalescing | None = None
+    """Merge consecutive LLM tokens streamed with stream_mode "messages" into fewer
+    message chunks. Defaults to None, ie. every token is streamed."""
+
+    stream_buffer: StreamBuffer | None = None
+    """Bound on the number of chunks buffered by stream() and astream() until they
+    are consumed. Defaults to None, ie. unbounded."""
+
     interrupt_after_nodes: All | Sequence[str]
 
     interrupt_before_nodes: All | Sequence[str]
@@ -509,6 +526,10 @@ class Pregel(PregelProtocol):
     """Cache policy to use for all nodes. Can be overridden by individual nodes.
     Defaults to None."""
 
+    executor: SharedExecutor | None = None
+    """Thread pool to reuse across sync runs of this graph, instead of creating
+    one per run. Can be shared by multiple graphs. Defaults to None."""
+
     config_type: type[Any] | None = None
 
     input_model: type[BaseModel] | None = None
@@ -519,6 +540,8 @@ class Pregel(PregelProtocol):
 
     trigger_to_nodes: Mapping[str, Sequence[str]]
 
+    notify_channels: Sequence[str] | None
+
     def __init__(
         self,
         *,
@@ -529,6 +552,8 @@ class Pregel(PregelProtocol):
         stream_eager: bool = False,
         output_channels: str | Sequence[str],
         stream_channels: str | Sequence[str] | None = None,
+        stream_coalescing: TokenCoalescing | None = None,
+        stream_buffer: StreamBuffer | None = None,
         interrupt_after_nodes: All | Sequence[str] = (),
         interrupt_before_nodes: All | Sequence[str] = (),
         input_channels: str | Sequence[str],
@@ -539,10 +564,12 @@ class Pregel(PregelProtocol):
         cache: BaseCache | None = None,
         retry_policy: RetryPolicy | Sequence[RetryPolicy] = (),
         cache_policy: CachePolicy | None = None,
+        executor: SharedExecutor | None = None,
         config_type: type[Any] | None = None,
         input_model: type[BaseModel] | None = None,
         config: RunnableConfig | None = None,
         trigger_to_nodes: Mapping[str, Sequence[str]] | None = None,
+        notify_channels: Sequence[str] | None = None,
         name: str = "LangGraph",
     ) -> None:
         self.nodes = nodes
@@ -551,6 +578,8 @@ class Pregel(PregelProtocol):
         self.stream_eager = stream_eager
         self.output_channels = output_channels
         self.stream_channels = stream_channels
+        self.stream_coalescing = stream_coalescing
+        self.stream_buffer = stream_buffer
         self.interrupt_after_nodes = interrupt_after_nodes
         self.interrupt_before_nodes = interrupt_before_nodes
         self.input_channels = input_channels
@@ -563,10 +592,12 @@ class Pregel(PregelProtocol):
             (retry_policy,) if isinstance(retry_policy, RetryPolicy) else retry_policy
         )
         self.cache_policy = cache_policy
+        self.executor = executor
         self.config_type = config_type
         self.input_model = input_model
         self.config = config
         self.trigger_to_nodes = trigger_to_nodes or {}
+        self.notify_channels = notify_channels
         self.name = name
         if auto_validate:
             self.validate()
@@ -669,6 +700,7 @@ class Pregel(PregelProtocol):
             self.interrupt_before_nodes,
         )
         self.trigger_to_nodes = _trigger_to_nodes(self.nodes)
+        self.notify_channels = _notify_channels(self.channels)
         return self
 
     @property
@@ -994,6 +1026,20 @@ class Pregel(PregelProtocol):
                 tuple([i for task in tasks_with_writes for i in task.interrupts]),
             )
 
+    def _prepare_metadata_snapshot(
+        self, saved: CheckpointMetadataTuple
+    ) -> StateSnapshot:
+        return StateSnapshot(
+            values={},
+            next=(),
+            config=patch_checkpoint_map(saved.config, saved.metadata),
+            metadata=saved.metadata,
+            created_at=saved.ts,
+            parent_config=patch_checkpoint_map(saved.parent_config, saved.metadata),
+            tasks=(),
+            interrupts=(),
+        )
+
     async def _aprepare_state_snapshot(
         self,
         config: RunnableConfig,
@@ -1211,8 +1257,16 @@ class Pregel(PregelProtocol):
         filter: dict[str, Any] | None = None,
         before: RunnableConfig | None = None,
         limit: int | None = None,
+        metadata_only: bool = False,
     ) -> Iterator[StateSnapshot]:
-        """Get the history of the state of the graph."""
+        """Get the history of the state of the graph.
+
+        With `metadata_only=True`, only the config, metadata, timestamp and parent
+        config of each snapshot are populated, using the checkpointer's
+        `list_metadata`, so that channel values and pending writes are never loaded.
+        `values` is then an empty dict, and `next`, `tasks` and `interrupts` are
+        empty tuples, whatever the state of the checkpoint.
+        """
         config = ensure_config(config)
         checkpointer: BaseCheckpointSaver | None = ensure_config(config)[CONF].get(
             CONFIG_KEY_CHECKPOINTER, self.checkpointer
@@ -1232,6 +1286,7 @@ class Pregel(PregelProtocol):
                     filter=filter,
                     before=before,
                     limit=limit,
+                    metadata_only=metadata_only,
                 )
                 return
             else:
@@ -1247,6 +1302,14 @@ class Pregel(PregelProtocol):
                 }
             },
         )
+        if metadata_only:
+            for metadata_tuple in list(
+                checkpointer.list_metadata(
+                    config, before=before, limit=limit, filter=filter
+                )
+            ):
+                yield self._prepare_metadata_snapshot(metadata_tuple)
+            return
         # eagerly consume list() to avoid holding up the db cursor
         for checkpoint_tuple in list(
             checkpointer.list(config, before=before, limit=limit, filter=filter)
@@ -1262,8 +1325,16 @@ class Pregel(PregelProtocol):
         filter: dict[str, Any] | None = None,
         before: RunnableConfig | None = None,
         limit: int | None = None,
+        metadata_only: bool = False,
     ) -> AsyncIterator[StateSnapshot]:
-        """Asynchronously get the history of the state of the graph."""
+        """Asynchronously get the history of the state of the graph.
+
+        With `metadata_only=True`, only the config, metadata, timestamp and parent
+        config of each snapshot are populated, using the checkpointer's
+        `alist_metadata`, so that channel values and pending writes are never loaded.
+        `values` is then an empty dict, and `next`, `tasks` and `interrupts` are
+        empty tuples, whatever the state of the checkpoint.
+        """
         config = ensure_config(config)
         checkpointer: BaseCheckpointSaver | None = ensure_config(config)[CONF].get(
             CONFIG_KEY_CHECKPOINTER, self.checkpointer
@@ -1283,6 +1354,7 @@ class Pregel(PregelProtocol):
                     filter=filter,
                     before=before,
                     limit=limit,
+                    metadata_only=metadata_only,
                 ):
                     yield state
                 return
@@ -1299,6 +1371,15 @@ class Pregel(PregelProtocol):
                 }
             },
         )
+        if metadata_only:
+            for metadata_tuple in [
+                c
+                async for c in checkpointer.alist_metadata(
+                    config, before=before, limit=limit, filter=filter
+                )
+            ]:
+                yield self._prepare_metadata_snapshot(metadata_tuple)
+            return
         # eagerly consume list() to avoid holding up the db cursor
         for checkpoint_tuple in [
             c
@@ -2302,7 +2383,12 @@ class Pregel(PregelProtocol):
             The output of each step in the graph. The output shape depends on the stream_mode.
         """
 
-        stream = SyncQueue()
+        if self.stream_buffer is not None:
+            stream = SyncQueue(
+                self.stream_buffer.maxsize, evict=self.stream_buffer.evict
+            )
+        else:
+            stream = SyncQueue()
 
         def output() -> Iterator:
             while True:
@@ -2353,7 +2439,7 @@ class Pregel(PregelProtocol):
             # set up messages stream mode
             if "messages" in stream_modes:
                 run_manager.inheritable_handlers.append(
-                    StreamMessagesHandler(stream.put)
+                    StreamMessagesHandler(stream.put, self.stream_coalescing)
                 )
             # set up custom stream mode
             if "custom" in stream_modes:
@@ -2366,7 +2452,7 @@ class Pregel(PregelProtocol):
             with SyncPregelLoop(
                 input,
                 input_model=self.input_model,
-                stream=StreamProtocol(stream.put, stream_modes),
+                stream=StreamProtocol(partial(stream.put, block=False), stream_modes),
                 config=config,
                 store=store,
                 cache=cache,
@@ -2383,9 +2469,11 @@ class Pregel(PregelProtocol):
                 if checkpoint_during is not None
                 else config[CONF].get(CONFIG_KEY_CHECKPOINT_DURING, True),
                 trigger_to_nodes=self.trigger_to_nodes,
+                notify_channels=self.notify_channels,
                 migrate_checkpoint=self._migrate_checkpoint,
                 retry_policy=self.retry_policy,
                 cache_policy=self.cache_policy,
+                executor=self.executor,
             ) as loop:
                 # create runner
                 runner = PregelRunner(
@@ -2395,6 +2483,11 @@ class Pregel(PregelProtocol):
                     put_writes=weakref.WeakMethod(loop.put_writes),
                     node_finished=config[CONF].get(CONFIG_KEY_NODE_FINISHED),
                 )
+                # release producers waiting for room in the stream on exit
+                loop.stack.callback(stream.close)
+                if self.stream_buffer and self.stream_buffer.on_stats:
+                    on_stats = self.stream_buffer.on_stats
+                    loop.stack.callback(lambda: on_stats(stream.stats()))
                 # enable subgraph streaming
                 if subgraphs:
                     loop.config[CONF][CONFIG_KEY_STREAM] = loop.stream
@@ -2405,18 +2498,16 @@ class Pregel(PregelProtocol):
                     or "messages" in stream_modes
                     or "custom" in stream_modes
                 ):
-                    # we are careful to have a single waiter live at any one time
-                    # because on exit we increment semaphore count by exactly 1
+                    # we are careful to have a single waiter live at any one time.
+                    # waiters don't occupy a thread, which could otherwise be
+                    # unavailable while nodes wait for room in the stream, and
+                    # pending ones are resolved when the stream is closed on exit
                     waiter: concurrent.futures.Future | None = None
-                    # because sync futures cannot be cancelled, we instead
-                    # release the stream semaphore on exit, which will cause
-                    # a pending waiter to return immediately
-                    loop.stack.callback(stream._count.release)
 
                     def get_waiter() -> concurrent.futures.Future[None]:
                         nonlocal waiter
                         if waiter is None or waiter.done():
-                            waiter = loop.submit(stream.wait)
+                            waiter = stream.waiter()
                             return waiter
                         else:
                             return waiter
@@ -2452,8 +2543,10 @@ class Pregel(PregelProtocol):
                     error_code=ErrorCode.GRAPH_RECURSION_LIMIT,
                 )
                 raise GraphRecursionError(msg)
-            # set final channel values as run output
-            run_manager.on_chain_end(loop.output)
+            # set final channel values as run output. Reading them deserializes
+            # every channel value loaded lazily from the checkpoint, so without
+            # a callback handler to consume them, the run ends with None instead
+            run_manager.on_chain_end(loop.output if run_manager.handlers else None)
         except BaseException as e:
             run_manager.on_chain_error(e)
             raise
@@ -2509,12 +2602,31 @@ class Pregel(PregelProtocol):
             The output of each step in the graph. The output shape depends on the stream_mode.
         """
 
-        stream = AsyncQueue()
         aioloop = asyncio.get_running_loop()
-        stream_put = cast(
-            Callable[[StreamChunk], None],
-            partial(aioloop.call_soon_threadsafe, stream.put_nowait),
-        )
+        stream_put: Callable[[StreamChunk], None]
+        if self.stream_buffer is not None:
+            stream = AsyncQueue(
+                self.stream_buffer.maxsize, evict=self.stream_buffer.evict
+            )
+
+            def put_or_wait(c: StreamChunk) -> None:
+                try:
+                    running = asyncio.get_running_loop()
+                except RuntimeError:
+                    running = None
+                if running is aioloop:
+                    aioloop.call_soon_threadsafe(stream.put_nowait, c)
+                else:
+                    # sync nodes running in a thread wait for room in the stream
+                    asyncio.run_coroutine_threadsafe(stream.put(c), aioloop).result()
+
+            stream_put = put_or_wait
+        else:
+            stream = AsyncQueue()
+            stream_put = cast(
+                Callable[[StreamChunk], None],
+                partial(aioloop.call_soon_threadsafe, stream.put_nowait),
+            )
 
         def output() -> Iterator:
             while True:
@@ -2579,14 +2691,12 @@ class Pregel(PregelProtocol):
             # set up messages stream mode
             if "messages" in stream_modes:
                 run_manager.inheritable_handlers.append(
-                    StreamMessagesHandler(stream_put)
+                    StreamMessagesHandler(stream_put, self.stream_coalescing)
                 )
             # set up custom stream mode
             if "custom" in stream_modes:
-                config[CONF][CONFIG_KEY_STREAM_WRITER] = (
-                    lambda c: aioloop.call_soon_threadsafe(
-                        stream.put_nowait, ((), "custom", c)
-                    )
+                config[CONF][CONFIG_KEY_STREAM_WRITER] = lambda c: stream_put(
+                    ((), "custom", c)
                 )
             # set checkpointing mode for subgraphs
             if checkpoint_during is not None:
@@ -2611,6 +2721,7 @@ class Pregel(PregelProtocol):
                 if checkpoint_during is not None
                 else config[CONF].get(CONFIG_KEY_CHECKPOINT_DURING, True),
                 trigger_to_nodes=self.trigger_to_nodes,
+                notify_channels=self.notify_channels,
                 migrate_checkpoint=self._migrate_checkpoint,
                 retry_policy=self.retry_policy,
                 cache_policy=self.cache_policy,
@@ -2624,6 +2735,11 @@ class Pregel(PregelProtocol):
                     use_astream=do_stream,
                     node_finished=config[CONF].get(CONFIG_KEY_NODE_FINISHED),
                 )
+                # release producers waiting for room in the stream on exit
+                loop.stack.callback(stream.close)
+                if self.stream_buffer and self.stream_buffer.on_stats:
+                    on_stats = self.stream_buffer.on_stats
+                    loop.stack.callback(lambda: on_stats(stream.stats()))
                 # enable subgraph streaming
                 if subgraphs:
                     loop.config[CONF][CONFIG_KEY_STREAM] = StreamProtocol(
@@ -2673,8 +2789,12 @@ class Pregel(PregelProtocol):
                     error_code=ErrorCode.GRAPH_RECURSION_LIMIT,
                 )
                 raise GraphRecursionError(msg)
-            # set final channel values as run output
-            await run_manager.on_chain_end(loop.output)
+            # set final channel values as run output. Reading them deserializes
+            # every channel value loaded lazily from the checkpoint, so without
+            # a callback handler to consume them, the run ends with None instead
+            await run_manager.on_chain_end(
+                loop.output if run_manager.handlers else None
+            )
         except BaseException as e:
             await asyncio.shield(run_manager.on_chain_error(e))
             raise
@@ -2862,3 +2982,32 @@ def _trigger_to_nodes(nodes: dict[str, PregelNode]) -> Mapping[str, Sequence[str
         for trigger in node.triggers:
             trigger_to_nodes[trigger].append(name)
     return dict(trigger_to_nodes)
+
+
+# channel types for which update(EMPTY_SEQ) is a no-op, exact types only
+# as subclasses may override update()
+_PASSIVE_ON_EMPTY_UPDATE: frozenset[type[BaseChannel]] = frozenset(
+    (
+        LastValue,
+        BinaryOperatorAggregate,
+        UntrackedValue,
+        NamedBarrierValue,
+        DynamicBarrierValue,
+    )
+)
+
+
+def _notify_channels(
+    channels: Mapping[str, BaseChannel | ManagedValueSpec],
+) -> Sequence[str]:
+    """Index of channels that need to be notified of a new step or of finish,
+    ie. those for which update(EMPTY_SEQ) or finish() may change their value."""
+    return tuple(
+        name
+        for name, spec in channels.items()
+        if isinstance(spec, BaseChannel)
+        and (
+            type(spec) not in _PASSIVE_ON_EMPTY_UPDATE
+            or type(spec).finish is not BaseChannel.finish
+        )
+    )
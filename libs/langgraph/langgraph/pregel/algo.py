@@ -66,6 +66,7 @@ from langgraph.constants import (
 )
 from langgraph.managed.base import ManagedValueMapping
 from langgraph.pregel.call import get_runnable_for_task, identifier
+from langgraph.pregel.checkpoint import PendingWrites
 from langgraph.pregel.io import read_channels
 from langgraph.pregel.log import logger
 from langgraph.pregel.read import INPUT_CACHE_KEY_TYPE, PregelNode
@@ -195,8 +196,10 @@ def local_read(
     if fresh and updated:
         # apply writes
         local_channels: dict[str, BaseChannel] = {}
-        for k in channels:
-            if k in updated:
+        for k in (select,) if isinstance(select, str) else select:
+            if k not in channels:
+                continue
+            elif k in updated:
                 cc = channels[k].copy()
                 cc.update(updated[k])
             else:
@@ -222,6 +225,7 @@ def apply_writes(
     tasks: Iterable[WritesProtocol],
     get_next_version: Optional[GetNextVersion],
     trigger_to_nodes: Mapping[str, Sequence[str]],
+    notify_channels: Optional[Sequence[str]] = None,
 ) -> tuple[dict[str, list[Any]], set[str]]:
     """Apply writes from a set of tasks (usually the tasks from a Pregel step)
     to the checkpoint and channels, and return managed values writes to be applied
@@ -232,6 +236,9 @@ def apply_writes(
         channels: The channels to update.
         tasks: The tasks to apply writes from.
         get_next_version: Optional function to determine the next version of a channel.
+        trigger_to_nodes: Index from a trigger to nodes that depend on it.
+        notify_channels: Optional index of the channels that need to be notified
+            of a new step or of finish. If omitted, all channels are notified.
 
     Returns:
         A tuple containing the managed values writes to be applied externally, and
@@ -245,15 +252,22 @@ def apply_writes(
     # so we don't do anything other than update the channels written to
     bump_step = any(t.triggers for t in tasks)
 
-    # update seen versions
+    # update seen versions, replacing rather than mutating the per-node dicts,
+    # as these are shared with previously saved checkpoints
     for task in tasks:
-        checkpoint["versions_seen"].setdefault(task.name, {}).update(
-            {
-                chan: checkpoint["channel_versions"][chan]
-                for chan in task.triggers
-                if chan in checkpoint["channel_versions"]
-            }
-        )
+        seen = {
+            chan: checkpoint["channel_versions"][chan]
+            for chan in task.triggers
+            if chan in checkpoint["channel_versions"]
+        }
+        if task.name in checkpoint["versions_seen"]:
+            if seen:
+                checkpoint["versions_seen"][task.name] = {
+                    **checkpoint["versions_seen"][task.name],
+                    **seen,
+                }
+        else:
+            checkpoint["versions_seen"][task.name] = seen
 
     # Find the highest version of all channels
     if checkpoint["channel_versions"]:
@@ -261,7 +275,8 @@ def apply_writes(
     else:
         max_version = None
 
-    # Consume all channels that were read
+    # Consume all channels that were read, keeping track of the highest version
+    next_max_version = max_version
     for chan in {
         chan
         for task in tasks
@@ -269,10 +284,11 @@ def apply_writes(
         if chan not in RESERVED and chan in channels
     }:
         if channels[chan].consume() and get_next_version is not None:
-            checkpoint["channel_versions"][chan] = get_next_version(
-                max_version,
-                channels[chan],
-            )
+            version = get_next_version(max_version, channels[chan])
+            checkpoint["channel_versions"][chan] = version
+            if next_max_version is None or version > next_max_version:
+                next_max_version = version
+    max_version = next_max_version
 
     # clear pending sends
     if checkpoint["pending_sends"] and bump_step:
@@ -292,12 +308,6 @@ def apply_writes(
             else:
                 pending_writes_by_managed[chan].append(val)
 
-    # Find the highest version of all channels
-    if checkpoint["channel_versions"]:
-        max_version = max(checkpoint["channel_versions"].values())
-    else:
-        max_version = None
-
     # Apply writes to channels
     updated_channels: set[str] = set()
     for chan, vals in pending_writes_by_channel.items():
@@ -312,9 +322,13 @@ def apply_writes(
                     updated_channels.add(chan)
 
     # Channels that weren't updated in this step are notified of a new step
+    if notify_channels is None:
+        notify_channels = tuple(channels)
     if bump_step:
-        for chan in channels:
-            if channels[chan].is_available() and chan not in updated_channels:
+        for chan in notify_channels:
+            if chan not in channels or chan in updated_channels:
+                continue
+            if channels[chan].is_available():
                 if channels[chan].update(EMPTY_SEQ) and get_next_version is not None:
                     checkpoint["channel_versions"][chan] = get_next_version(
                         max_version,
@@ -330,7 +344,9 @@ def apply_writes(
         and not checkpoint["pending_sends"]
         and updated_channels.isdisjoint(trigger_to_nodes)
     ):
-        for chan in channels:
+        for chan in notify_channels:
+            if chan not in channels:
+                continue
             if channels[chan].finish() and get_next_version is not None:
                 checkpoint["channel_versions"][chan] = get_next_version(
                     max_version,
@@ -442,6 +458,7 @@ def prepare_next_tasks(
         and PULL tasks (nodes triggered by edges).
     """
     input_cache: dict[INPUT_CACHE_KEY_TYPE, Any] = {}
+    config_cache: dict[tuple[str, bool], RunnableConfig] = {}
     checkpoint_id_bytes = binascii.unhexlify(checkpoint["id"].replace("-", ""))
     null_version = checkpoint_null_version(checkpoint)
     tasks: list[Union[PregelTask, PregelExecutableTask]] = []
@@ -464,6 +481,7 @@ def prepare_next_tasks(
             checkpointer=checkpointer,
             manager=manager,
             input_cache=input_cache,
+            config_cache=config_cache,
             cache_policy=cache_policy,
             retry_policy=retry_policy,
         ):
@@ -509,6 +527,7 @@ def prepare_next_tasks(
             checkpointer=checkpointer,
             manager=manager,
             input_cache=input_cache,
+            config_cache=config_cache,
             cache_policy=cache_policy,
             retry_policy=retry_policy,
         ):
@@ -537,11 +556,15 @@ def prepare_single_task(
     checkpointer: Optional[BaseCheckpointSaver] = None,
     manager: Union[None, ParentRunManager, AsyncParentRunManager] = None,
     input_cache: Optional[dict[INPUT_CACHE_KEY_TYPE, Any]] = None,
+    config_cache: Optional[dict[tuple[str, bool], RunnableConfig]] = None,
     cache_policy: Optional[CachePolicy] = None,
     retry_policy: Sequence[RetryPolicy] = (),
 ) -> Union[None, PregelTask, PregelExecutableTask]:
     """Prepares a single task for the next Pregel step, given a task path, which
-    uniquely identifies a PUSH or PULL task within the graph."""
+    uniquely identifies a PUSH or PULL task within the graph.
+
+    If config_cache is passed, the parts of the task config shared by all tasks
+    of the same node in this step are built once, and reused."""
     configurable = config.get(CONF, {})
     parent_ns = configurable.get(CONFIG_KEY_CHECKPOINT_NS, "")
     task_id_func = _xxhash_str if checkpoint["v"] > 1 else _uuid5_str
@@ -601,12 +624,22 @@ def prepare_single_task(
                 call.input,
                 proc_,
                 writes,
-                patch_config(
-                    merge_configs(config, {"metadata": metadata}),
-                    run_name=name,
-                    callbacks=call.callbacks
+                _task_config(
+                    _task_config_template(
+                        config_cache,
+                        config,
+                        name,
+                        None,
+                        checkpoint=checkpoint,
+                        parent_ns=parent_ns,
+                        store=store,
+                        checkpointer=checkpointer,
+                        with_previous=False,
+                    ),
+                    metadata,
+                    call.callbacks
                     or (manager.get_child(f"graph:step:{step}") if manager else None),
-                    configurable={
+                    {
                         CONFIG_KEY_TASK_ID: task_id,
                         # deque.extend is thread-safe
                         CONFIG_KEY_SEND: writes.extend,
@@ -616,21 +649,12 @@ def prepare_single_task(
                             managed,
                             PregelTaskWrites(task_path, name, writes, triggers),
                         ),
-                        CONFIG_KEY_STORE: (store or configurable.get(CONFIG_KEY_STORE)),
-                        CONFIG_KEY_CHECKPOINTER: (
-                            checkpointer or configurable.get(CONFIG_KEY_CHECKPOINTER)
-                        ),
-                        CONFIG_KEY_CHECKPOINT_MAP: {
-                            **configurable.get(CONFIG_KEY_CHECKPOINT_MAP, {}),
-                            parent_ns: checkpoint["id"],
-                        },
-                        CONFIG_KEY_CHECKPOINT_ID: None,
                         CONFIG_KEY_CHECKPOINT_NS: task_checkpoint_ns,
                         CONFIG_KEY_SCRATCHPAD: _scratchpad(
                             config[CONF].get(CONFIG_KEY_SCRATCHPAD),
                             pending_writes,
                             task_id,
-                            xxh3_128_hexdigest(task_checkpoint_ns.encode()),
+                            task_checkpoint_ns,
                             config[CONF].get(CONFIG_KEY_RESUME_MAP),
                         ),
                     },
@@ -720,13 +744,21 @@ def prepare_single_task(
                 packet.arg,
                 proc_node,
                 writes,
-                patch_config(
-                    merge_configs(config, {"metadata": metadata, "tags": proc.tags}),
-                    run_name=packet.node,
-                    callbacks=(
-                        manager.get_child(f"graph:step:{step}") if manager else None
+                _task_config(
+                    _task_config_template(
+                        config_cache,
+                        config,
+                        packet.node,
+                        proc.tags,
+                        checkpoint=checkpoint,
+                        parent_ns=parent_ns,
+                        store=store,
+                        checkpointer=checkpointer,
+                        with_previous=True,
                     ),
-                    configurable={
+                    metadata,
+                    manager.get_child(f"graph:step:{step}") if manager else None,
+                    {
                         CONFIG_KEY_TASK_ID: task_id,
                         # deque.extend is thread-safe
                         CONFIG_KEY_SEND: writes.extend,
@@ -736,26 +768,14 @@ def prepare_single_task(
                             managed,
                             PregelTaskWrites(task_path, packet.node, writes, triggers),
                         ),
-                        CONFIG_KEY_STORE: (store or configurable.get(CONFIG_KEY_STORE)),
-                        CONFIG_KEY_CHECKPOINTER: (
-                            checkpointer or configurable.get(CONFIG_KEY_CHECKPOINTER)
-                        ),
-                        CONFIG_KEY_CHECKPOINT_MAP: {
-                            **configurable.get(CONFIG_KEY_CHECKPOINT_MAP, {}),
-                            parent_ns: checkpoint["id"],
-                        },
-                        CONFIG_KEY_CHECKPOINT_ID: None,
                         CONFIG_KEY_CHECKPOINT_NS: task_checkpoint_ns,
                         CONFIG_KEY_SCRATCHPAD: _scratchpad(
                             config[CONF].get(CONFIG_KEY_SCRATCHPAD),
                             pending_writes,
                             task_id,
-                            xxh3_128_hexdigest(task_checkpoint_ns.encode()),
+                            task_checkpoint_ns,
                             config[CONF].get(CONFIG_KEY_RESUME_MAP),
                         ),
-                        CONFIG_KEY_PREVIOUS: checkpoint["channel_values"].get(
-                            PREVIOUS, None
-                        ),
                     },
                 ),
                 triggers,
@@ -850,17 +870,25 @@ def prepare_single_task(
                         val,
                         node,
                         writes,
-                        patch_config(
-                            merge_configs(
-                                config, {"metadata": metadata, "tags": proc.tags}
+                        _task_config(
+                            _task_config_template(
+                                config_cache,
+                                config,
+                                name,
+                                proc.tags,
+                                checkpoint=checkpoint,
+                                parent_ns=parent_ns,
+                                store=store,
+                                checkpointer=checkpointer,
+                                with_previous=True,
                             ),
-                            run_name=name,
-                            callbacks=(
+                            metadata,
+                            (
                                 manager.get_child(f"graph:step:{step}")
                                 if manager
                                 else None
                             ),
-                            configurable={
+                            {
                                 CONFIG_KEY_TASK_ID: task_id,
                                 # deque.extend is thread-safe
                                 CONFIG_KEY_SEND: writes.extend,
@@ -875,29 +903,14 @@ def prepare_single_task(
                                         triggers,
                                     ),
                                 ),
-                                CONFIG_KEY_STORE: (
-                                    store or configurable.get(CONFIG_KEY_STORE)
-                                ),
-                                CONFIG_KEY_CHECKPOINTER: (
-                                    checkpointer
-                                    or configurable.get(CONFIG_KEY_CHECKPOINTER)
-                                ),
-                                CONFIG_KEY_CHECKPOINT_MAP: {
-                                    **configurable.get(CONFIG_KEY_CHECKPOINT_MAP, {}),
-                                    parent_ns: checkpoint["id"],
-                                },
-                                CONFIG_KEY_CHECKPOINT_ID: None,
                                 CONFIG_KEY_CHECKPOINT_NS: task_checkpoint_ns,
                                 CONFIG_KEY_SCRATCHPAD: _scratchpad(
                                     config[CONF].get(CONFIG_KEY_SCRATCHPAD),
                                     pending_writes,
                                     task_id,
-                                    xxh3_128_hexdigest(task_checkpoint_ns.encode()),
+                                    task_checkpoint_ns,
                                     config[CONF].get(CONFIG_KEY_RESUME_MAP),
                                 ),
-                                CONFIG_KEY_PREVIOUS: checkpoint["channel_values"].get(
-                                    PREVIOUS, None
-                                ),
                             },
                         ),
                         triggers,
@@ -912,6 +925,65 @@ def prepare_single_task(
                 return PregelTask(task_id, name, task_path[:3])
 
 
+def _task_config_template(
+    config_cache: Optional[dict[tuple[str, bool], RunnableConfig]],
+    config: RunnableConfig,
+    name: str,
+    tags: Optional[Sequence[str]],
+    *,
+    checkpoint: Checkpoint,
+    parent_ns: str,
+    store: Optional[BaseStore],
+    checkpointer: Optional[BaseCheckpointSaver],
+    with_previous: bool,
+) -> RunnableConfig:
+    """Get the parts of a task config shared by all tasks of a node in a step."""
+    key = (name, with_previous)
+    if config_cache is not None and key in config_cache:
+        return config_cache[key]
+    configurable = config.get(CONF, {})
+    shared = {
+        CONFIG_KEY_STORE: (store or configurable.get(CONFIG_KEY_STORE)),
+        CONFIG_KEY_CHECKPOINTER: (
+            checkpointer or configurable.get(CONFIG_KEY_CHECKPOINTER)
+        ),
+        CONFIG_KEY_CHECKPOINT_MAP: {
+            **configurable.get(CONFIG_KEY_CHECKPOINT_MAP, {}),
+            parent_ns: checkpoint["id"],
+        },
+        CONFIG_KEY_CHECKPOINT_ID: None,
+    }
+    if with_previous:
+        shared[CONFIG_KEY_PREVIOUS] = checkpoint["channel_values"].get(PREVIOUS, None)
+    template = patch_config(
+        merge_configs(config, {"tags": tags}),
+        run_name=name,
+        configurable=shared,
+    )
+    if config_cache is not None:
+        config_cache[key] = template
+    return template
+
+
+def _task_config(
+    template: RunnableConfig,
+    metadata: dict[str, Any],
+    callbacks: Callbacks,
+    configurable: dict[str, Any],
+) -> RunnableConfig:
+    """Create a task config from a template, and the parts specific to the task."""
+    config = template.copy()
+    if base_metadata := template.get("metadata"):
+        config["metadata"] = {**base_metadata, **metadata}
+    else:
+        config["metadata"] = metadata
+    if callbacks is not None:
+        config["callbacks"] = callbacks
+        config.pop("run_id", None)
+    config[CONF] = {**template[CONF], **configurable}
+    return config
+
+
 def checkpoint_null_version(
     checkpoint: Checkpoint,
 ) -> Optional[V]:
@@ -934,9 +1006,8 @@ def _triggers(
                 return (chan,)
     else:
         for chan in proc.triggers:
-            if channels[chan].is_available() and versions.get(  # type: ignore[operator]
-                chan, null_version
-            ) > seen.get(chan, null_version):
+            version: Any = versions.get(chan, null_version)
+            if version > seen.get(chan, null_version) and channels[chan].is_available():
                 return (chan,)
     return EMPTY_SEQ
 
@@ -945,35 +1016,37 @@ def _scratchpad(
     parent_scratchpad: Optional[PregelScratchpad],
     pending_writes: list[PendingWrite],
     task_id: str,
-    namespace_hash: str,
+    task_checkpoint_ns: str,
     resume_map: Optional[dict[str, Any]],
 ) -> PregelScratchpad:
     if len(pending_writes) > 0:
-        # find global resume value
-        for w in pending_writes:
-            if w[0] == NULL_TASK_ID and w[1] == RESUME:
-                null_resume_write = w
-                break
-        else:
-            # None cannot be used as a resume value, because it would be difficult to
-            # distinguish from missing when used over http
-            null_resume_write = None
-
-        # find task-specific resume value
-        for w in pending_writes:
-            if w[0] == task_id and w[1] == RESUME:
-                task_resume_write = w[2]
-                if not isinstance(task_resume_write, list):
-                    task_resume_write = [task_resume_write]
-                break
+        # find global and task-specific resume values
+        # None cannot be used as a resume value, because it would be difficult to
+        # distinguish from missing when used over http
+        if isinstance(pending_writes, PendingWrites):
+            null_resume_write = pending_writes.null_resume
+            task_write = pending_writes.find(task_id, RESUME)
         else:
+            null_resume_write = next(
+                (w for w in pending_writes if w[0] == NULL_TASK_ID and w[1] == RESUME),
+                None,
+            )
+            task_write = next(
+                (w for w in pending_writes if w[0] == task_id and w[1] == RESUME),
+                None,
+            )
+        if task_write is None:
             task_resume_write = []
-        del w
+        elif isinstance(task_write[2], list):
+            task_resume_write = task_write[2]
+        else:
+            task_resume_write = [task_write[2]]
 
         # find namespace and task-specific resume value
-        if resume_map and namespace_hash in resume_map:
-            mapped_resume_write = resume_map[namespace_hash]
-            task_resume_write.append(mapped_resume_write)
+        if resume_map:
+            namespace_hash = xxh3_128_hexdigest(task_checkpoint_ns.encode())
+            if namespace_hash in resume_map:
+                task_resume_write.append(resume_map[namespace_hash])
 
     else:
         null_resume_write = None
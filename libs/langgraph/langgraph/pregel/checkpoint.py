@@ -1,11 +1,12 @@
-from collections.abc import Mapping
+import threading
+from collections.abc import Iterable, Mapping, Sequence
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Optional, SupportsIndex, Union
 
 from langgraph.channels.base import BaseChannel
-from langgraph.checkpoint.base import Checkpoint
+from langgraph.checkpoint.base import Checkpoint, PendingWrite
 from langgraph.checkpoint.base.id import uuid6
-from langgraph.constants import MISSING
+from langgraph.constants import MISSING, NULL_TASK_ID, RESUME
 
 LATEST_VERSION = 3
 
@@ -28,11 +29,29 @@ def create_checkpoint(
     step: int,
     *,
     id: Optional[str] = None,
+    updated_channels: Optional[Iterable[str]] = None,
 ) -> Checkpoint:
-    """Create a checkpoint for the given channels."""
+    """Create a checkpoint for the given channels.
+
+    If updated_channels is passed, only those channels are checkpointed, and the
+    values of all other channels are shared with the previous checkpoint."""
     ts = datetime.now(timezone.utc).isoformat()
     if channels is None:
         values = checkpoint["channel_values"]
+    elif updated_channels is not None:
+        previous = checkpoint["channel_values"]
+        if previous.keys() <= channels.keys():
+            values = previous.copy()
+        else:
+            values = {k: v for k, v in previous.items() if k in channels}
+        for k in updated_channels:
+            if k not in channels or k not in checkpoint["channel_versions"]:
+                continue
+            v = channels[k].checkpoint()
+            if v is MISSING:
+                values.pop(k, None)
+            else:
+                values[k] = v
     else:
         values = {}
         for k in channels:
@@ -50,3 +69,146 @@ def create_checkpoint(
         versions_seen=checkpoint["versions_seen"],
         pending_sends=checkpoint.get("pending_sends", []),
     )
+
+
+class PendingWrites(list[PendingWrite]):
+    """The pending writes of a checkpoint, as a list of (task_id, channel, value),
+    indexed by task id and by channel.
+
+    The index is kept up to date by all list methods, so that looking up the writes
+    of a task, or the resume value for the whole graph, doesn't scan every write."""
+
+    def __init__(self, writes: Iterable[PendingWrite] = ()) -> None:
+        super().__init__(writes)
+        self._lock = threading.RLock()
+        self._reindex()
+
+    def __reduce__(self) -> Any:
+        return (self.__class__, (list(self),))
+
+    @property
+    def null_resume(self) -> Optional[PendingWrite]:
+        """The first RESUME write not attached to a task, if any."""
+        return self._null_resume
+
+    def task_writes(self, task_id: str) -> Sequence[PendingWrite]:
+        """The writes of a task, in the order they were added."""
+        return self._by_task.get(task_id, ())
+
+    def channel_writes(self, channel: str) -> Sequence[PendingWrite]:
+        """The writes to a channel, in the order they were added."""
+        return self._by_channel.get(channel, ())
+
+    def find(self, task_id: str, channel: str) -> Optional[PendingWrite]:
+        """The first write of a task to a channel, if any."""
+        for w in self._by_task.get(task_id, ()):
+            if w[1] == channel:
+                return w
+        return None
+
+    def replace_task(self, task_id: str, writes: Iterable[PendingWrite]) -> None:
+        """Replace the writes of a task with new ones."""
+        with self._lock:
+            if task_id in self._by_task:
+                kept = [w for w in self if w[0] != task_id]
+                super().clear()
+                super().extend(kept)
+                self._reindex()
+            self.extend(writes)
+
+    # list methods
+
+    def append(self, write: PendingWrite) -> None:
+        with self._lock:
+            super().append(write)
+            self._index(write)
+
+    def extend(self, writes: Iterable[PendingWrite]) -> None:
+        with self._lock:
+            for w in writes:
+                super().append(w)
+                self._index(w)
+
+    def __iadd__(self, writes: Iterable[PendingWrite]) -> "PendingWrites":  # type: ignore[override,misc]
+        self.extend(writes)
+        return self
+
+    def remove(self, write: PendingWrite) -> None:
+        with self._lock:
+            idx = self.index(write)
+            removed = self[idx]
+            super().__delitem__(idx)
+            self._unindex(removed)
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._reindex()
+
+    def insert(self, index: SupportsIndex, write: PendingWrite) -> None:
+        with self._lock:
+            super().insert(index, write)
+            self._reindex()
+
+    def pop(self, index: SupportsIndex = -1) -> PendingWrite:
+        with self._lock:
+            write = super().pop(index)
+            self._unindex(write)
+            return write
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        with self._lock:
+            super().__setitem__(index, value)
+            self._reindex()
+
+    def __delitem__(self, index: Union[SupportsIndex, slice]) -> None:
+        with self._lock:
+            super().__delitem__(index)
+            self._reindex()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        with self._lock:
+            super().sort(*args, **kwargs)
+            self._reindex()
+
+    def reverse(self) -> None:
+        with self._lock:
+            super().reverse()
+            self._reindex()
+
+    # index
+
+    def _reindex(self) -> None:
+        self._by_task: dict[str, list[PendingWrite]] = {}
+        self._by_channel: dict[str, list[PendingWrite]] = {}
+        self._null_resume: Optional[PendingWrite] = None
+        for w in self:
+            self._index(w)
+
+    def _index(self, write: PendingWrite) -> None:
+        task_id, channel, _ = write
+        if task_id in self._by_task:
+            self._by_task[task_id].append(write)
+        else:
+            self._by_task[task_id] = [write]
+        if channel in self._by_channel:
+            self._by_channel[channel].append(write)
+        else:
+            self._by_channel[channel] = [write]
+        if task_id == NULL_TASK_ID and channel == RESUME and self._null_resume is None:
+            self._null_resume = write
+
+    def _unindex(self, write: PendingWrite) -> None:
+        task_id, channel, _ = write
+        for index, key in ((self._by_task, task_id), (self._by_channel, channel)):
+            writes = index[key]
+            # remove this exact write, not just an equal one
+            writes.pop(next(i for i, w in enumerate(writes) if w is write))
+            if not writes:
+                del index[key]
+        if write is self._null_resume:
+            self._null_resume = None
+            for w in self._by_task.get(NULL_TASK_ID, ()):
+                if w[1] == RESUME:
+                    self._null_resume = w
+                    break
@@ -1,5 +1,6 @@
 import asyncio
 import concurrent.futures
+import threading
 import time
 from collections.abc import Awaitable, Coroutine
 from contextlib import AbstractAsyncContextManager, AbstractContextManager, ExitStack
@@ -37,17 +38,78 @@ class Submit(Protocol[P, T]):
     ) -> concurrent.futures.Future[T]: ...
 
 
+class SharedExecutor(concurrent.futures.ThreadPoolExecutor):
+    """A thread pool executor that outlives individual graph runs.
+    Can be shared by many runs of one or more graphs (eg. for the whole process),
+    to avoid starting and stopping a thread pool on every sync invocation.
+
+    Runs started from one of its own worker threads (eg. subgraphs, or tasks
+    called from an entrypoint) use a private thread pool instead, so that worker
+    threads never block waiting on work queued behind them.
+
+    Args:
+        max_workers: Maximum number of worker threads.
+            Defaults to the ThreadPoolExecutor default.
+        warm: Whether to start all worker threads right away, rather than
+            on demand. Defaults to False.
+        thread_name_prefix: Prefix for the names of the worker threads.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        *,
+        warm: bool = False,
+        thread_name_prefix: str = "langgraph",
+    ) -> None:
+        self._worker_ids: set[int] = set()
+        super().__init__(
+            max_workers,
+            thread_name_prefix=thread_name_prefix,
+            initializer=self._register_worker,
+        )
+        if warm:
+            self.warm()
+
+    def _register_worker(self) -> None:
+        self._worker_ids.add(threading.get_ident())
+
+    def is_worker_thread(self) -> bool:
+        """Return True if called from one of the worker threads of this pool."""
+        return threading.get_ident() in self._worker_ids
+
+    def warm(self) -> None:
+        """Start all worker threads, blocking until they are running."""
+        barrier = threading.Barrier(self._max_workers)
+        futures = [self.submit(barrier.wait) for _ in range(self._max_workers)]
+        concurrent.futures.wait(futures)
+
+
 class BackgroundExecutor(AbstractContextManager):
     """A context manager that runs sync tasks in the background.
     Uses a thread pool executor to delegate tasks to separate threads.
     On exit,
     - cancels any (not yet started) tasks with `__cancel_on_exit__=True`
     - waits for all tasks to finish
-    - re-raises the first exception from tasks with `__reraise_on_exit__=True`"""
+    - re-raises the first exception from tasks with `__reraise_on_exit__=True`
 
-    def __init__(self, config: RunnableConfig) -> None:
+    If a SharedExecutor is passed, tasks are submitted to it (and it's left
+    running on exit), unless `max_concurrency` is set in config or this is
+    called from one of its worker threads, in which case a thread pool
+    is created for this run only."""
+
+    def __init__(
+        self, config: RunnableConfig, executor: Optional[SharedExecutor] = None
+    ) -> None:
         self.stack = ExitStack()
-        self.executor = self.stack.enter_context(get_executor_for_config(config))
+        if (
+            executor is not None
+            and not config.get("max_concurrency")
+            and not executor.is_worker_thread()
+        ):
+            self.executor: concurrent.futures.Executor = executor
+        else:
+            self.executor = self.stack.enter_context(get_executor_for_config(config))
         # mapping of Future to (__cancel_on_exit__, __reraise_on_exit__) flags
         self.tasks: dict[concurrent.futures.Future, tuple[bool, bool]] = {}
 
@@ -105,7 +167,7 @@ class BackgroundExecutor(AbstractContextManager):
         # wait for all tasks to finish
         if pending := {t for t in tasks if not t.done()}:
             concurrent.futures.wait(pending)
-        # shutdown the executor
+        # shutdown the executor, if owned by this context manager
         self.stack.__exit__(exc_type, exc_value, traceback)
         # if there's already an exception being raised, don't raise another one
         if exc_type is None:
@@ -2,6 +2,7 @@ import asyncio
 import binascii
 import concurrent.futures
 import dataclasses
+import threading
 from collections import defaultdict, deque
 from collections.abc import Iterator, Mapping, Sequence
 from contextlib import (
@@ -37,8 +38,6 @@ from langgraph.checkpoint.base import (
     Checkpoint,
     CheckpointMetadata,
     CheckpointTuple,
-    PendingWrite,
-    copy_checkpoint,
 )
 from langgraph.constants import (
     CONF,
@@ -90,7 +89,11 @@ from langgraph.pregel.algo import (
     should_interrupt,
     task_path_str,
 )
-from langgraph.pregel.checkpoint import create_checkpoint, empty_checkpoint
+from langgraph.pregel.checkpoint import (
+    PendingWrites,
+    create_checkpoint,
+    empty_checkpoint,
+)
 from langgraph.pregel.debug import (
     map_debug_checkpoint,
     map_debug_task_results,
@@ -102,6 +105,7 @@ from langgraph.pregel.debug import (
 from langgraph.pregel.executor import (
     AsyncBackgroundExecutor,
     BackgroundExecutor,
+    SharedExecutor,
     Submit,
 )
 from langgraph.pregel.io import (
@@ -170,6 +174,9 @@ class PregelLoop(LoopProtocol):
     checkpointer_get_next_version: GetNextVersion
     checkpointer_put_writes: Optional[Callable[[RunnableConfig, WritesT, str], Any]]
     checkpointer_put_writes_accepts_task_path: bool
+    checkpointer_put_writes_batch: Optional[
+        Callable[[RunnableConfig, Sequence[tuple[str, WritesT, str]]], Any]
+    ]
     _checkpointer_put_after_previous: Optional[
         Callable[
             [
@@ -182,6 +189,7 @@ class PregelLoop(LoopProtocol):
             Any,
         ]
     ]
+    _flush_put_writes: Callable[[], Any]
     _migrate_checkpoint: Optional[Callable[[Checkpoint], None]]
     submit: Submit
     channels: Mapping[str, BaseChannel]
@@ -191,7 +199,7 @@ class PregelLoop(LoopProtocol):
     checkpoint_ns: tuple[str, ...]
     checkpoint_config: RunnableConfig
     checkpoint_metadata: CheckpointMetadata
-    checkpoint_pending_writes: list[PendingWrite]
+    checkpoint_pending_writes: PendingWrites
     checkpoint_previous_versions: dict[str, Union[str, float, int]]
     prev_checkpoint_config: Optional[RunnableConfig]
 
@@ -200,7 +208,7 @@ class PregelLoop(LoopProtocol):
     ]
     tasks: dict[str, PregelExecutableTask]
     to_interrupt: list[PregelExecutableTask]
-    output: Union[None, dict[str, Any], Any] = None
+    has_output: bool = False
 
     # public
 
@@ -218,6 +226,7 @@ class PregelLoop(LoopProtocol):
         output_keys: Union[str, Sequence[str]],
         stream_keys: Union[str, Sequence[str]],
         trigger_to_nodes: Mapping[str, Sequence[str]],
+        notify_channels: Optional[Sequence[str]] = None,
         interrupt_after: Union[All, Sequence[str]] = EMPTY_SEQ,
         interrupt_before: Union[All, Sequence[str]] = EMPTY_SEQ,
         manager: Union[None, AsyncParentRunManager, ParentRunManager] = None,
@@ -253,10 +262,15 @@ class PregelLoop(LoopProtocol):
         )
         self._migrate_checkpoint = migrate_checkpoint
         self.trigger_to_nodes = trigger_to_nodes
+        self.notify_channels = notify_channels
         self.retry_policy = retry_policy
         self.cache_policy = cache_policy
         self.checkpoint_during = checkpoint_during
         self.debug = debug
+        # task writes waiting to be saved, see put_writes
+        self._put_writes_buffer: list[tuple[RunnableConfig, str, WritesT, str]] = []
+        self._put_writes_lock = threading.Lock()
+        self._put_writes_flushing = False
         if self.stream is not None and CONFIG_KEY_STREAM in config[CONF]:
             self.stream = DuplexStream(self.stream, config[CONF][CONFIG_KEY_STREAM])
         scratchpad: Optional[PregelScratchpad] = config[CONF].get(CONFIG_KEY_SCRATCHPAD)
@@ -320,12 +334,10 @@ class PregelLoop(LoopProtocol):
         # deduplicate writes to special channels, last write wins
         if all(w[0] in WRITES_IDX_MAP for w in writes):
             writes = list({w[0]: w for w in writes}.values())
-        # remove existing writes for this task
-        self.checkpoint_pending_writes = [
-            w for w in self.checkpoint_pending_writes if w[0] != task_id
-        ]
-        # save writes
-        self.checkpoint_pending_writes.extend((task_id, c, v) for c, v in writes)
+        # replace existing writes for this task
+        self.checkpoint_pending_writes.replace_task(
+            task_id, [(task_id, c, v) for c, v in writes]
+        )
         if checkpoint_during and self.checkpointer_put_writes is not None:
             config = patch_configurable(
                 self.checkpoint_config,
@@ -336,7 +348,32 @@ class PregelLoop(LoopProtocol):
                     CONFIG_KEY_CHECKPOINT_ID: self.checkpoint["id"],
                 },
             )
-            if self.checkpointer_put_writes_accepts_task_path:
+            # interrupts and errors end the run, so they're saved right away,
+            # instead of waiting for the batch being saved
+            if self.checkpointer_put_writes_batch is not None and writes[0][0] not in (
+                INTERRUPT,
+                ERROR,
+            ):
+                if hasattr(self, "tasks"):
+                    task = self.tasks.get(task_id)
+                else:
+                    task = None
+                # group commit: writes of tasks finishing while a batch is being
+                # saved are buffered, and saved together in the next batch
+                with self._put_writes_lock:
+                    self._put_writes_buffer.append(
+                        (
+                            config,
+                            task_id,
+                            writes,
+                            task_path_str(task.path) if task else "",
+                        )
+                    )
+                    start_flush = not self._put_writes_flushing
+                    self._put_writes_flushing = True
+                if start_flush:
+                    self.submit(self._flush_put_writes)
+            elif self.checkpointer_put_writes_accepts_task_path:
                 if hasattr(self, "tasks"):
                     task = self.tasks.get(task_id)
                 else:
@@ -359,6 +396,23 @@ class PregelLoop(LoopProtocol):
         if hasattr(self, "tasks"):
             self.output_writes(task_id, writes)
 
+    def _take_put_writes_batches(
+        self,
+    ) -> list[tuple[RunnableConfig, list[tuple[str, WritesT, str]]]]:
+        """Take the buffered task writes, grouped by checkpoint.
+        Returns an empty list, and marks the flush as done, if there are none."""
+        with self._put_writes_lock:
+            buffer, self._put_writes_buffer = self._put_writes_buffer, []
+            if not buffer:
+                self._put_writes_flushing = False
+        batches: dict[str, tuple[RunnableConfig, list[tuple[str, WritesT, str]]]] = {}
+        for config, task_id, writes, task_path in buffer:
+            checkpoint_id = config[CONF][CONFIG_KEY_CHECKPOINT_ID]
+            if checkpoint_id not in batches:
+                batches[checkpoint_id] = (config, [])
+            batches[checkpoint_id][1].append((task_id, writes, task_path))
+        return list(batches.values())
+
     def _put_pending_writes(self) -> None:
         if self.checkpointer_put_writes is None:
             return
@@ -379,6 +433,21 @@ class PregelLoop(LoopProtocol):
         for task_id, channel, value in self.checkpoint_pending_writes:
             by_task[task_id].append((channel, value))
         # submit writes to checkpointer
+        if self.checkpointer_put_writes_batch is not None:
+            tasks = self.tasks if hasattr(self, "tasks") else {}
+            self.submit(
+                self.checkpointer_put_writes_batch,
+                config,
+                [
+                    (
+                        task_id,
+                        writes,
+                        task_path_str(tasks[task_id].path) if task_id in tasks else "",
+                    )
+                    for task_id, writes in by_task.items()
+                ],
+            )
+            return
         for task_id, writes in by_task.items():
             if self.checkpointer_put_writes_accepts_task_path and hasattr(
                 self, "tasks"
@@ -497,6 +566,7 @@ class PregelLoop(LoopProtocol):
                 self.tasks.values(),
                 self.checkpointer_get_next_version,
                 self.trigger_to_nodes,
+                self.notify_channels,
             )
             # apply writes to managed values
             for key, values in mv_writes.items():
@@ -637,10 +707,11 @@ class PregelLoop(LoopProtocol):
     # private
 
     def _match_writes(self, tasks: Mapping[str, PregelExecutableTask]) -> None:
-        for tid, k, v in self.checkpoint_pending_writes:
-            if k in (ERROR, INTERRUPT, RESUME):
-                continue
-            if task := tasks.get(tid):
+        for tid in list(tasks):
+            for _, k, v in self.checkpoint_pending_writes.task_writes(tid):
+                if k in (ERROR, INTERRUPT, RESUME):
+                    continue
+                task = tasks[tid]
                 if k == SCHEDULED:
                     if v == max(
                         self.checkpoint["versions_seen"].get(INTERRUPT, {}).values(),
@@ -694,7 +765,7 @@ class PregelLoop(LoopProtocol):
                 self.put_writes(tid, ws)
         # apply NULL writes
         if null_writes := [
-            w[1:] for w in self.checkpoint_pending_writes if w[0] == NULL_TASK_ID
+            w[1:] for w in self.checkpoint_pending_writes.task_writes(NULL_TASK_ID)
         ]:
             mv_writes, _ = apply_writes(
                 self.checkpoint,
@@ -702,16 +773,20 @@ class PregelLoop(LoopProtocol):
                 [PregelTaskWrites((), INPUT, null_writes, [])],
                 self.checkpointer_get_next_version,
                 self.trigger_to_nodes,
+                self.notify_channels,
             )
             for key, values in mv_writes.items():
                 self._update_mv(key, values)
         # proceed past previous checkpoint
         if is_resuming:
-            self.checkpoint["versions_seen"].setdefault(INTERRUPT, {})
-            for k in self.channels:
-                if k in self.checkpoint["channel_versions"]:
-                    version = self.checkpoint["channel_versions"][k]
-                    self.checkpoint["versions_seen"][INTERRUPT][k] = version
+            self.checkpoint["versions_seen"][INTERRUPT] = {
+                **self.checkpoint["versions_seen"].get(INTERRUPT, {}),
+                **{
+                    k: self.checkpoint["channel_versions"][k]
+                    for k in self.channels
+                    if k in self.checkpoint["channel_versions"]
+                },
+            }
             # produce values output
             self._emit(
                 "values", map_output_values, self.output_keys, True, self.channels
@@ -755,6 +830,7 @@ class PregelLoop(LoopProtocol):
                 ],
                 self.checkpointer_get_next_version,
                 self.trigger_to_nodes,
+                self.notify_channels,
             )
             assert not mv_writes, "Can't write to SharedValues in graph input"
             # save input checkpoint
@@ -805,12 +881,20 @@ class PregelLoop(LoopProtocol):
         do_checkpoint = self._checkpointer_put_after_previous is not None and (
             exiting or self.checkpoint_during
         )
-        # create new checkpoint
+        # find channels updated since the last saved checkpoint
+        if do_checkpoint:
+            channel_versions = self.checkpoint["channel_versions"].copy()
+            new_versions = get_new_channel_versions(
+                self.checkpoint_previous_versions, channel_versions
+            )
+            self.checkpoint_previous_versions = channel_versions
+        # create new checkpoint, checkpointing only the updated channels
         self.checkpoint = create_checkpoint(
             self.checkpoint,
             self.channels if do_checkpoint else None,
             self.step,
             id=self.checkpoint["id"] if exiting else None,
+            updated_channels=new_versions if do_checkpoint else None,
         )
         # bail if no checkpointer
         if do_checkpoint and self._checkpointer_put_after_previous is not None:
@@ -837,12 +921,6 @@ class PregelLoop(LoopProtocol):
                 },
             }
 
-            channel_versions = self.checkpoint["channel_versions"].copy()
-            new_versions = get_new_channel_versions(
-                self.checkpoint_previous_versions, channel_versions
-            )
-            self.checkpoint_previous_versions = channel_versions
-
             # save it, without blocking
             # if there's a previous checkpoint save in progress, wait for it
             # ensuring checkpointers receive checkpoints in order
@@ -850,7 +928,17 @@ class PregelLoop(LoopProtocol):
                 self._checkpointer_put_after_previous,
                 getattr(self, "_put_checkpoint_fut", None),
                 self.checkpoint_config,
-                copy_checkpoint(self.checkpoint),
+                # channel values and per-node versions seen are never mutated
+                # in place, so they're shared with the live checkpoint
+                Checkpoint(
+                    v=self.checkpoint["v"],
+                    ts=self.checkpoint["ts"],
+                    id=self.checkpoint["id"],
+                    channel_values=self.checkpoint["channel_values"],
+                    channel_versions=channel_versions,
+                    versions_seen=self.checkpoint["versions_seen"].copy(),
+                    pending_sends=self.checkpoint.get("pending_sends", []).copy(),
+                ),
                 self.checkpoint_metadata,
                 new_versions,
             )
@@ -893,6 +981,7 @@ class PregelLoop(LoopProtocol):
                     self.tasks.values(),
                     self.checkpointer_get_next_version,
                     self.trigger_to_nodes,
+                    self.notify_channels,
                 )
                 for key, values in mv_writes.items():
                     self._update_mv(key, values)
@@ -911,13 +1000,20 @@ class PregelLoop(LoopProtocol):
                         [{INTERRUPT: cast(GraphInterrupt, exc_value).args[0]}]
                     ),
                 )
-            # save final output
-            self.output = read_channels(self.channels, self.output_keys)
+            # final output is read on demand
+            self.has_output = True
             # suppress interrupt
             return True
         elif exc_type is None:
-            # save final output
-            self.output = read_channels(self.channels, self.output_keys)
+            # final output is read on demand
+            self.has_output = True
+
+    @property
+    def output(self) -> Union[None, dict[str, Any], Any]:
+        """Final channel values of the run, read from the output channels."""
+        if not self.has_output:
+            return None
+        return read_channels(self.channels, self.output_keys)
 
     def _emit(
         self,
@@ -993,6 +1089,7 @@ class SyncPregelLoop(PregelLoop, AbstractContextManager):
         nodes: Mapping[str, PregelNode],
         specs: Mapping[str, Union[BaseChannel, ManagedValueSpec]],
         trigger_to_nodes: Mapping[str, Sequence[str]],
+        notify_channels: Optional[Sequence[str]] = None,
         manager: Union[None, AsyncParentRunManager, ParentRunManager] = None,
         interrupt_after: Union[All, Sequence[str]] = EMPTY_SEQ,
         interrupt_before: Union[All, Sequence[str]] = EMPTY_SEQ,
@@ -1004,6 +1101,7 @@ class SyncPregelLoop(PregelLoop, AbstractContextManager):
         retry_policy: Sequence[RetryPolicy] = (),
         cache_policy: Optional[CachePolicy] = None,
         checkpoint_during: bool = True,
+        executor: Optional[SharedExecutor] = None,
     ) -> None:
         super().__init__(
             input,
@@ -1023,11 +1121,13 @@ class SyncPregelLoop(PregelLoop, AbstractContextManager):
             debug=debug,
             migrate_checkpoint=migrate_checkpoint,
             trigger_to_nodes=trigger_to_nodes,
+            notify_channels=notify_channels,
             retry_policy=retry_policy,
             cache_policy=cache_policy,
             checkpoint_during=checkpoint_during,
         )
         self.stack = ExitStack()
+        self.executor = executor
         if checkpointer:
             self.checkpointer_get_next_version = checkpointer.get_next_version
             self.checkpointer_put_writes = checkpointer.put_writes
@@ -1035,11 +1135,46 @@ class SyncPregelLoop(PregelLoop, AbstractContextManager):
                 signature(checkpointer.put_writes).parameters.get("task_path")
                 is not None
             )
+            # only batch writes if the checkpointer can save them in one go
+            self.checkpointer_put_writes_batch = (
+                checkpointer.put_writes_batch
+                if type(checkpointer).put_writes_batch
+                is not BaseCheckpointSaver.put_writes_batch
+                else None
+            )
         else:
             self.checkpointer_get_next_version = increment
             self._checkpointer_put_after_previous = None  # type: ignore[assignment]
             self.checkpointer_put_writes = None
             self.checkpointer_put_writes_accepts_task_path = False
+            self.checkpointer_put_writes_batch = None
+
+    def _flush_put_writes(self) -> None:
+        """Save buffered task writes, until the buffer is empty."""
+        error: Optional[Exception] = None
+        while batches := self._take_put_writes_batches():
+            for config, writes in batches:
+                try:
+                    self.checkpointer_put_writes_batch(config, writes)  # type: ignore[misc]
+                except Exception as exc:
+                    # keep saving other batches, so failures aren't contagious
+                    error = error or exc
+        if error is not None:
+            raise error
+
+    def _flush_put_writes_on_exit(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        # save writes still buffered before the executor exits, as a flusher
+        # submitted from now on isn't waited for by a shared executor
+        try:
+            self._flush_put_writes()
+        except Exception:
+            if exc_type is None:
+                raise
 
     def _checkpointer_put_after_previous(
         self,
@@ -1149,13 +1284,16 @@ class SyncPregelLoop(PregelLoop, AbstractContextManager):
         self.checkpoint_id_saved = saved.checkpoint["id"]
         self.checkpoint = saved.checkpoint
         self.checkpoint_metadata = saved.metadata
-        self.checkpoint_pending_writes = (
+        self.checkpoint_pending_writes = PendingWrites(
             [(str(tid), k, v) for tid, k, v in saved.pending_writes]
             if saved.pending_writes is not None
             else []
         )
 
-        self.submit = self.stack.enter_context(BackgroundExecutor(self.config))
+        self.submit = self.stack.enter_context(
+            BackgroundExecutor(self.config, self.executor)
+        )
+        self.stack.push(self._flush_put_writes_on_exit)
         self.channels, self.managed = self.stack.enter_context(
             ChannelsManager(self.specs, self.checkpoint, self)
         )
@@ -1190,6 +1328,7 @@ class AsyncPregelLoop(PregelLoop, AbstractAsyncContextManager):
         nodes: Mapping[str, PregelNode],
         specs: Mapping[str, Union[BaseChannel, ManagedValueSpec]],
         trigger_to_nodes: Mapping[str, Sequence[str]],
+        notify_channels: Optional[Sequence[str]] = None,
         interrupt_after: Union[All, Sequence[str]] = EMPTY_SEQ,
         interrupt_before: Union[All, Sequence[str]] = EMPTY_SEQ,
         manager: Union[None, AsyncParentRunManager, ParentRunManager] = None,
@@ -1220,6 +1359,7 @@ class AsyncPregelLoop(PregelLoop, AbstractAsyncContextManager):
             debug=debug,
             migrate_checkpoint=migrate_checkpoint,
             trigger_to_nodes=trigger_to_nodes,
+            notify_channels=notify_channels,
             retry_policy=retry_policy,
             cache_policy=cache_policy,
             checkpoint_during=checkpoint_during,
@@ -1232,11 +1372,45 @@ class AsyncPregelLoop(PregelLoop, AbstractAsyncContextManager):
                 signature(checkpointer.aput_writes).parameters.get("task_path")
                 is not None
             )
+            # only batch writes if the checkpointer can save them in one go
+            self.checkpointer_put_writes_batch = (
+                checkpointer.aput_writes_batch
+                if type(checkpointer).aput_writes_batch
+                is not BaseCheckpointSaver.aput_writes_batch
+                else None
+            )
         else:
             self.checkpointer_get_next_version = increment
             self._checkpointer_put_after_previous = None  # type: ignore[assignment]
             self.checkpointer_put_writes = None
             self.checkpointer_put_writes_accepts_task_path = False
+            self.checkpointer_put_writes_batch = None
+
+    async def _flush_put_writes(self) -> None:
+        """Save buffered task writes, until the buffer is empty."""
+        error: Optional[Exception] = None
+        while batches := self._take_put_writes_batches():
+            for config, writes in batches:
+                try:
+                    await self.checkpointer_put_writes_batch(config, writes)  # type: ignore[misc]
+                except Exception as exc:
+                    # keep saving other batches, so failures aren't contagious
+                    error = error or exc
+        if error is not None:
+            raise error
+
+    async def _flush_put_writes_on_exit(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        # save writes still buffered before the background tasks are awaited
+        try:
+            await self._flush_put_writes()
+        except Exception:
+            if exc_type is None:
+                raise
 
     async def _checkpointer_put_after_previous(
         self,
@@ -1349,7 +1523,7 @@ class AsyncPregelLoop(PregelLoop, AbstractAsyncContextManager):
         self.checkpoint_id_saved = saved.checkpoint["id"]
         self.checkpoint = saved.checkpoint
         self.checkpoint_metadata = saved.metadata
-        self.checkpoint_pending_writes = (
+        self.checkpoint_pending_writes = PendingWrites(
             [(str(tid), k, v) for tid, k, v in saved.pending_writes]
             if saved.pending_writes is not None
             else []
@@ -1358,6 +1532,7 @@ class AsyncPregelLoop(PregelLoop, AbstractAsyncContextManager):
         self.submit = await self.stack.enter_async_context(
             AsyncBackgroundExecutor(self.config)
         )
+        self.stack.push_async_exit(self._flush_put_writes_on_exit)
         self.channels, self.managed = await self.stack.enter_async_context(
             AsyncChannelsManager(self.specs, self.checkpoint, self)
         )
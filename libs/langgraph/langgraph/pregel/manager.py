@@ -1,10 +1,12 @@
 import asyncio
 from collections.abc import AsyncIterator, Iterator, Mapping
 from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, contextmanager
-from typing import Union
+from functools import partial
+from typing import Any, Union
 
 from langgraph.channels.base import BaseChannel
 from langgraph.checkpoint.base import Checkpoint
+from langgraph.checkpoint.serde.lazy import Deferred, LazyDict
 from langgraph.constants import MISSING
 from langgraph.managed.base import (
     ConfiguredManagedValue,
@@ -37,10 +39,7 @@ def ChannelsManager(
             managed_specs[k] = v
     with ExitStack() as stack:
         yield (
-            {
-                k: v.from_checkpoint(checkpoint["channel_values"].get(k, MISSING))
-                for k, v in channel_specs.items()
-            },
+            channels_from_checkpoint(channel_specs, checkpoint),
             ManagedValueMapping(
                 {
                     key: stack.enter_context(
@@ -91,15 +90,34 @@ async def AsyncChannelsManager(
             done = set()
         yield (
             # channels: enter each channel with checkpoint
-            {
-                k: v.from_checkpoint(checkpoint["channel_values"].get(k, MISSING))
-                for k, v in channel_specs.items()
-            },
+            channels_from_checkpoint(channel_specs, checkpoint),
             # managed: build mapping from spec to result
             ManagedValueMapping({tasks[task]: task.result() for task in done}),
         )
 
 
+def channels_from_checkpoint(
+    specs: Mapping[str, BaseChannel], checkpoint: Checkpoint
+) -> dict[str, BaseChannel]:
+    """Create channels from the values stored in a checkpoint.
+
+    If the values were loaded lazily, channels are created on first access too,
+    so that only the values of channels actually used are deserialized."""
+    values = checkpoint["channel_values"]
+    if isinstance(values, LazyDict):
+        channels = LazyDict()
+        for k, v in specs.items():
+            channels[k] = Deferred(partial(_from_checkpoint, v, values, k))
+        return channels
+    return {k: v.from_checkpoint(values.get(k, MISSING)) for k, v in specs.items()}
+
+
+def _from_checkpoint(
+    spec: BaseChannel, values: Mapping[str, Any], key: str
+) -> BaseChannel:
+    return spec.from_checkpoint(values.get(key, MISSING))
+
+
 @contextmanager
 def noop_context() -> Iterator[None]:
     yield None
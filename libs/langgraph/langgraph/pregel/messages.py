@@ -1,4 +1,7 @@
+import operator
+import time
 from collections.abc import AsyncIterator, Iterator, Sequence
+from functools import reduce
 from typing import (
     Any,
     Callable,
@@ -14,7 +17,7 @@ from langchain_core.messages import BaseMessage
 from langchain_core.outputs import ChatGenerationChunk, LLMResult
 
 from langgraph.constants import NS_SEP, TAG_HIDDEN, TAG_NOSTREAM, TAG_NOSTREAM_ALT
-from langgraph.types import Command, StreamChunk
+from langgraph.types import Command, StreamChunk, TokenCoalescing
 
 try:
     from langchain_core.tracers._streaming import _StreamingCallbackHandler
@@ -32,10 +35,17 @@ class StreamMessagesHandler(BaseCallbackHandler, _StreamingCallbackHandler):
     run_inline = True
     """We want this callback to run in the main thread, to avoid order/locking issues."""
 
-    def __init__(self, stream: Callable[[StreamChunk], None]):
+    def __init__(
+        self,
+        stream: Callable[[StreamChunk], None],
+        coalescing: Optional[TokenCoalescing] = None,
+    ):
         self.stream = stream
+        self.coalescing = coalescing
         self.metadata: dict[UUID, Meta] = {}
         self.seen: set[Union[int, str]] = set()
+        # run ID -> [message ID, buffered chunks, time the oldest was received]
+        self.pending: dict[UUID, list[Any]] = {}
 
     def _emit(self, meta: Meta, message: BaseMessage, *, dedupe: bool = False) -> None:
         if dedupe and message.id in self.seen:
@@ -117,7 +127,34 @@ class StreamMessagesHandler(BaseCallbackHandler, _StreamingCallbackHandler):
             filtered_tags = [t for t in (tags or []) if not t.startswith("seq:step")]
             if filtered_tags:
                 meta[1]["tags"] = filtered_tags
-            self._emit(meta, chunk.message)
+            if self.coalescing is None:
+                self._emit(meta, chunk.message)
+            elif (pending := self.pending.get(run_id)) is None:
+                # the first token is emitted right away
+                self._emit(meta, chunk.message)
+                self.pending[run_id] = [chunk.message.id, [], 0.0]
+            else:
+                now = time.monotonic()
+                if not pending[1]:
+                    pending[2] = now
+                pending[1].append(chunk.message)
+                if (
+                    len(pending[1]) >= self.coalescing.max_tokens
+                    or now - pending[2] >= self.coalescing.max_delay
+                ):
+                    self._flush(run_id, meta)
+
+    def _flush(self, run_id: UUID, meta: Meta) -> None:
+        """Emit the tokens buffered for a chat model run, as a single chunk."""
+        pending = self.pending[run_id]
+        if not pending[1]:
+            return
+        message = reduce(operator.add, pending[1])
+        pending[1] = []
+        if message.id is None:
+            # keep the ID given to the first token
+            message.id = pending[0]
+        self._emit(meta, message)
 
     def on_llm_end(
         self,
@@ -127,6 +164,9 @@ class StreamMessagesHandler(BaseCallbackHandler, _StreamingCallbackHandler):
         parent_run_id: Optional[UUID] = None,
         **kwargs: Any,
     ) -> Any:
+        if run_id in self.pending and (meta := self.metadata.get(run_id)):
+            self._flush(run_id, meta)
+        self.pending.pop(run_id, None)
         self.metadata.pop(run_id, None)
 
     def on_llm_error(
@@ -137,6 +177,9 @@ class StreamMessagesHandler(BaseCallbackHandler, _StreamingCallbackHandler):
         parent_run_id: Optional[UUID] = None,
         **kwargs: Any,
     ) -> Any:
+        if run_id in self.pending and (meta := self.metadata.get(run_id)):
+            self._flush(run_id, meta)
+        self.pending.pop(run_id, None)
         self.metadata.pop(run_id, None)
 
     def on_chain_start(
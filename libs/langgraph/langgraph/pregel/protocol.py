@@ -55,6 +55,7 @@ class PregelProtocol(
         filter: Optional[dict[str, Any]] = None,
         before: Optional[RunnableConfig] = None,
         limit: Optional[int] = None,
+        metadata_only: bool = False,
     ) -> Iterator[StateSnapshot]: ...
 
     @abstractmethod
@@ -65,6 +66,7 @@ class PregelProtocol(
         filter: Optional[dict[str, Any]] = None,
         before: Optional[RunnableConfig] = None,
         limit: Optional[int] = None,
+        metadata_only: bool = False,
     ) -> AsyncIterator[StateSnapshot]: ...
 
     @abstractmethod
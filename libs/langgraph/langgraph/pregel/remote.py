@@ -426,6 +426,7 @@ class RemoteGraph(PregelProtocol):
         filter: Optional[dict[str, Any]] = None,
         before: Optional[RunnableConfig] = None,
         limit: Optional[int] = None,
+        metadata_only: bool = False,
     ) -> Iterator[StateSnapshot]:
         """Get the state history of a thread.
 
@@ -437,6 +438,10 @@ class RemoteGraph(PregelProtocol):
             filter: Metadata to filter on.
             before: A `RunnableConfig` that includes checkpoint metadata.
             limit: Max number of states to return.
+            metadata_only: Whether to return only the config, metadata, timestamp
+                and parent config of each state, as `Pregel.get_state_history`
+                does, with empty `values`, `next`, `tasks` and `interrupts`.
+                The server still sends the full states.
 
         Returns:
             States of the thread.
@@ -452,7 +457,12 @@ class RemoteGraph(PregelProtocol):
             checkpoint=self._get_checkpoint(merged_config),
         )
         for state in states:
-            yield self._create_state_snapshot(state)
+            snapshot = self._create_state_snapshot(state)
+            if metadata_only:
+                snapshot = snapshot._replace(
+                    values={}, next=(), tasks=(), interrupts=()
+                )
+            yield snapshot
 
     async def aget_state_history(
         self,
@@ -461,6 +471,7 @@ class RemoteGraph(PregelProtocol):
         filter: Optional[dict[str, Any]] = None,
         before: Optional[RunnableConfig] = None,
         limit: Optional[int] = None,
+        metadata_only: bool = False,
     ) -> AsyncIterator[StateSnapshot]:
         """Get the state history of a thread.
 
@@ -472,6 +483,10 @@ class RemoteGraph(PregelProtocol):
             filter: Metadata to filter on.
             before: A `RunnableConfig` that includes checkpoint metadata.
             limit: Max number of states to return.
+            metadata_only: Whether to return only the config, metadata, timestamp
+                and parent config of each state, as `Pregel.get_state_history`
+                does, with empty `values`, `next`, `tasks` and `interrupts`.
+                The server still sends the full states.
 
         Returns:
             States of the thread.
@@ -487,7 +502,12 @@ class RemoteGraph(PregelProtocol):
             checkpoint=self._get_checkpoint(merged_config),
         )
         for state in states:
-            yield self._create_state_snapshot(state)
+            snapshot = self._create_state_snapshot(state)
+            if metadata_only:
+                snapshot = snapshot._replace(
+                    values={}, next=(), tasks=(), interrupts=()
+                )
+            yield snapshot
 
     def bulk_update_state(
         self,
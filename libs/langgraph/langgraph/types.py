@@ -123,6 +123,21 @@ class RetryPolicy(NamedTuple):
     """List of exception classes that should trigger a retry, or a callable that returns True for exceptions that should trigger a retry."""
 
 
+class TokenCoalescing(NamedTuple):
+    """Configuration for merging LLM tokens streamed with stream_mode="messages".
+
+    The first token of each message is emitted right away. The following tokens
+    are merged into a single message chunk, emitted once `max_tokens` tokens
+    are buffered, with the first token received `max_delay` seconds or more
+    after the oldest buffered one, or when the message ends.
+    """
+
+    max_tokens: int = 16
+    """Maximum number of tokens to merge into one message chunk."""
+    max_delay: float = 0.05
+    """Time after which buffered tokens are emitted with the next token. In seconds."""
+
+
 KeyFuncT = TypeVar("KeyFuncT", bound=Callable[..., Union[str, bytes]])
 
 
@@ -380,6 +395,59 @@ class StreamProtocol:
         self.modes = modes
 
 
+class QueueStats(NamedTuple):
+    """Counters of a `SyncQueue` or `AsyncQueue`, since it was created."""
+
+    puts: int
+    max_depth: int
+    """Largest number of items held by the queue at once."""
+    evicted: int
+    """Items removed by the `evict` function to make room for newer ones."""
+    blocked: int
+    """Puts that waited for the queue to have room."""
+    blocked_time: float
+    """Total time spent waiting for the queue to have room, in seconds."""
+
+
+class StreamBuffer(NamedTuple):
+    """Bound on the number of chunks buffered by `stream()` and `astream()` until
+    they are consumed, to apply backpressure when the consumer lags behind.
+
+    When `maxsize` chunks are buffered, a new chunk first makes room according
+    to `overflow`:
+    - "block": nothing is removed.
+    - "drop": the oldest buffered "messages" or "custom" chunk is removed.
+    - "coalesce": a new "values" chunk replaces the oldest buffered "values"
+        chunk of the same graph or subgraph.
+
+    If no chunk was removed, nodes emitting "messages" or "custom" chunks wait
+    until the consumer catches up. Async nodes, and chunks emitted by the graph
+    itself, never wait, and are buffered beyond `maxsize` instead.
+    """
+
+    maxsize: int
+    """Maximum number of chunks to buffer."""
+    overflow: Literal["block", "drop", "coalesce"] = "block"
+    """What to do with buffered chunks when the buffer is full."""
+    on_stats: Optional[Callable[[QueueStats], None]] = None
+    """Called with the stats of the buffer (eg. its max depth) when a run ends."""
+
+    def evict(self, queue: deque[StreamChunk], chunk: StreamChunk) -> bool:
+        """Remove a buffered chunk to make room for `chunk`, as allowed by
+        `overflow`. Returns whether a chunk was removed."""
+        if self.overflow == "drop":
+            for i, (_, mode, _) in enumerate(queue):
+                if mode == "messages" or mode == "custom":
+                    del queue[i]
+                    return True
+        elif self.overflow == "coalesce" and chunk[1] == "values":
+            for i, (ns, mode, _) in enumerate(queue):
+                if mode == "values" and ns == chunk[0]:
+                    del queue[i]
+                    return True
+        return False
+
+
 class LoopProtocol:
     config: RunnableConfig
     store: Optional["BaseStore"]
@@ -1,21 +1,115 @@
 # type: ignore
 
 import asyncio
+import concurrent.futures
 import queue
 import sys
 import threading
 import types
 from collections import deque
 from time import monotonic
-from typing import Optional
+from typing import Any, Callable, Optional
+
+from langgraph.types import QueueStats
 
 PY_310 = sys.version_info >= (3, 10)
 
 
 class AsyncQueue(asyncio.Queue):
-    """Async unbounded FIFO queue with a wait() method.
+    """Async FIFO queue with a wait() method.
+
+    Subclassed from asyncio.Queue, adding a wait() method. If `maxsize` is
+    greater than 0, `evict` is called when the queue is full, with the deque of
+    queued items and the new item, and returns whether it removed an item to make
+    room. Otherwise put() waits until there's room, while put_nowait() adds
+    the item regardless, instead of raising QueueFull."""
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        *,
+        evict: Optional[Callable[[deque, Any], bool]] = None,
+    ) -> None:
+        super().__init__(maxsize)
+        self._evict = evict
+        self._closed = False
+        self._puts = 0
+        self._max_depth = 0
+        self._evicted = 0
+        self._blocked = 0
+        self._blocked_time = 0.0
+
+    def put_nowait(self, item) -> None:
+        """Put an item into the queue without blocking, even if it is full."""
+        if self.full():
+            self._make_room(item)
+        self._append(item)
+
+    async def put(self, item) -> None:
+        """Put an item into the queue. If it is full, and no item can be evicted,
+        wait until there's room or the queue is closed.
+
+        Adapted from Queue.put()."""
+        if self.full() and not self._closed and not self._make_room(item):
+            start = monotonic()
+            self._blocked += 1
+            try:
+                while self.full() and not self._closed:
+                    if PY_310:
+                        putter = self._get_loop().create_future()
+                    else:
+                        putter = self._loop.create_future()
+                    self._putters.append(putter)
+                    try:
+                        await putter
+                    except:
+                        putter.cancel()  # Just in case putter is not done yet.
+                        try:
+                            # Clean self._putters from canceled putters.
+                            self._putters.remove(putter)
+                        except ValueError:
+                            # The putter could be removed from self._putters
+                            # by a previous get_nowait call.
+                            pass
+                        if not self.full() and not putter.cancelled():
+                            # We were woken up by get_nowait(), but can't take
+                            # the call.  Wake up the next in line.
+                            self._wakeup_next(self._putters)
+                        raise
+            finally:
+                self._blocked_time += monotonic() - start
+        self._append(item)
+
+    def _make_room(self, item) -> bool:
+        if self._evict is not None and self._evict(self._queue, item):
+            self._evicted += 1
+            self._unfinished_tasks -= 1
+            return True
+        return False
+
+    def _append(self, item) -> None:
+        self._puts += 1
+        self._put(item)
+        self._unfinished_tasks += 1
+        self._finished.clear()
+        self._max_depth = max(self._max_depth, self.qsize())
+        self._wakeup_next(self._getters)
 
-    Subclassed from asyncio.Queue, adding a wait() method."""
+    def close(self) -> None:
+        """Stop waiting for room in the queue, now and in future puts."""
+        self._closed = True
+        while self._putters:
+            self._wakeup_next(self._putters)
+
+    def stats(self) -> QueueStats:
+        """Return the put, eviction and blocking counters."""
+        return QueueStats(
+            puts=self._puts,
+            max_depth=self._max_depth,
+            evicted=self._evicted,
+            blocked=self._blocked,
+            blocked_time=self._blocked_time,
+        )
 
     async def wait(self) -> None:
         """If queue is empty, wait until an item is available.
@@ -74,22 +168,65 @@ class Semaphore(threading.Semaphore):
 
 
 class SyncQueue:
-    """Unbounded FIFO queue with a wait() method.
+    """FIFO queue with wait() and waiter() methods.
     Adapted from pure Python implementation of queue.SimpleQueue.
+
+    If `maxsize` is greater than 0, `evict` is called when the queue is full,
+    with the deque of queued items and the new item, and returns whether it
+    removed an item to make room. Otherwise put() blocks until there's room.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        maxsize: int = 0,
+        *,
+        evict: Optional[Callable[[deque, Any], bool]] = None,
+    ):
+        self.maxsize = maxsize
         self._queue = deque()
         self._count = Semaphore(0)
+        self._evict = evict
+        self._not_full = threading.Condition(threading.Lock())
+        self._waiters: list[concurrent.futures.Future] = []
+        self._closed = False
+        self._puts = 0
+        self._max_depth = 0
+        self._evicted = 0
+        self._blocked = 0
+        self._blocked_time = 0.0
 
     def put(self, item, block=True, timeout=None):
         """Put the item on the queue.
 
-        The optional 'block' and 'timeout' arguments are ignored, as this method
-        never blocks.  They are provided for compatibility with the Queue class.
+        If the queue is full, and no item can be evicted, and optional arg 'block'
+        is true, block until there's room, at most 'timeout' seconds if it is
+        not None, or until the queue is closed. The item is then added even if
+        the queue is still full.
         """
-        self._queue.append(item)
+        if timeout is not None and timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number")
+        with self._not_full:
+            self._puts += 1
+            if self.maxsize > 0 and len(self._queue) >= self.maxsize:
+                if self._evict is not None and self._evict(self._queue, item):
+                    # replaces the evicted item, so the count is unchanged
+                    self._evicted += 1
+                    self._queue.append(item)
+                    return
+                if block and not self._closed:
+                    start = monotonic()
+                    self._blocked += 1
+                    self._not_full.wait_for(
+                        lambda: len(self._queue) < self.maxsize or self._closed,
+                        timeout,
+                    )
+                    self._blocked_time += monotonic() - start
+            self._queue.append(item)
+            self._max_depth = max(self._max_depth, len(self._queue))
+            waiters, self._waiters = self._waiters, []
         self._count.release()
+        for waiter in waiters:
+            waiter.set_result(None)
 
     def get(self, block=True, timeout=None):
         """Remove and return an item from the queue.
@@ -106,10 +243,45 @@ class SyncQueue:
             raise ValueError("'timeout' must be a non-negative number")
         if not self._count.acquire(block, timeout):
             raise queue.Empty
-        try:
-            return self._queue.popleft()
-        except IndexError:
-            raise queue.Empty
+        with self._not_full:
+            try:
+                item = self._queue.popleft()
+            except IndexError:
+                raise queue.Empty
+            self._not_full.notify()
+        return item
+
+    def waiter(self) -> concurrent.futures.Future:
+        """Return a future that is done once the queue maybe isn't empty,
+        without using a thread to wait for it."""
+        fut: concurrent.futures.Future = concurrent.futures.Future()
+        with self._not_full:
+            if self._queue or self._closed:
+                fut.set_result(None)
+            else:
+                self._waiters.append(fut)
+        return fut
+
+    def close(self):
+        """Stop blocking puts, now and in the future, and resolve pending
+        waiters."""
+        with self._not_full:
+            self._closed = True
+            self._not_full.notify_all()
+            waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            waiter.set_result(None)
+
+    def stats(self) -> QueueStats:
+        """Return the put, eviction and blocking counters."""
+        with self._not_full:
+            return QueueStats(
+                puts=self._puts,
+                max_depth=self._max_depth,
+                evicted=self._evicted,
+                blocked=self._blocked,
+                blocked_time=self._blocked_time,
+            )
 
     def wait(self, block=True, timeout=None):
         """If queue is empty, wait until an item maybe is available,
@@ -130,4 +302,4 @@ class SyncQueue:
     __class_getitem__ = classmethod(types.GenericAlias)
 
 
-__all__ = ["AsyncQueue", "SyncQueue"]
+__all__ = ["AsyncQueue", "QueueStats", "SyncQueue"]
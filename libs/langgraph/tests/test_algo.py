@@ -1,6 +1,29 @@
+import operator
+
+from langgraph.channels.binop import BinaryOperatorAggregate
+from langgraph.channels.ephemeral_value import EphemeralValue
+from langgraph.channels.last_value import LastValue
+from langgraph.channels.named_barrier_value import NamedBarrierValueAfterFinish
 from langgraph.checkpoint.base import empty_checkpoint
-from langgraph.constants import PULL, PUSH
-from langgraph.pregel.algo import prepare_next_tasks, task_path_str
+from langgraph.constants import (
+    CONF,
+    CONFIG_KEY_TASK_ID,
+    NULL_TASK_ID,
+    PULL,
+    PUSH,
+    RESUME,
+    Send,
+)
+from langgraph.graph import StateGraph
+from langgraph.pregel import _notify_channels
+from langgraph.pregel.algo import (
+    PregelTaskWrites,
+    apply_writes,
+    increment,
+    prepare_next_tasks,
+    task_path_str,
+)
+from langgraph.pregel.checkpoint import PendingWrites
 from langgraph.pregel.manager import ChannelsManager
 
 
@@ -64,3 +87,107 @@ def test_tuple_str() -> None:
         f"~{PUSH}, ~{PUSH}, 0000000002, 0000000001",
         f"~{PUSH}, ~{PUSH}, ~{PUSH}, 0000000002, 0000000001, 0000000003",
     ]
+
+
+def test_apply_writes_notify_channels() -> None:
+    specs = {
+        "a": LastValue(int),
+        "b": EphemeralValue(int),
+        "c": BinaryOperatorAggregate(int, operator.add),
+        "d": NamedBarrierValueAfterFinish(str, {"x"}),
+    }
+    notify = _notify_channels(specs)
+    assert notify == ("b", "d")
+
+    for notify_channels in (notify, None):
+        checkpoint = empty_checkpoint()
+        with ChannelsManager(specs, checkpoint, {}) as (channels, _):
+            task = PregelTaskWrites((), "node", [("a", 1), ("b", 2), ("d", "x")], ["a"])
+            _, updated = apply_writes(
+                checkpoint, channels, [task], increment, {}, notify_channels
+            )
+            # last step, so barrier is notified of finish
+            assert updated == {"a", "b", "d"}
+            assert checkpoint["channel_versions"] == {"a": 1, "b": 1, "d": 1}
+            # next step consumes the barrier and clears the ephemeral value,
+            # both versioned after the highest version seen after consuming
+            task = PregelTaskWrites((), "node", [("c", 3)], ["d"])
+            _, updated = apply_writes(
+                checkpoint, channels, [task], increment, {}, notify_channels
+            )
+            assert updated == {"c"}
+            assert checkpoint["channel_versions"] == {"a": 1, "b": 3, "c": 3, "d": 2}
+            assert channels["a"].get() == 1
+            assert not channels["b"].is_available()
+
+
+def test_pending_writes_index() -> None:
+    writes = PendingWrites([("a", "foo", 1), (NULL_TASK_ID, RESUME, "yes")])
+    writes.extend([("b", "foo", 2), ("a", "bar", 3)])
+    assert writes == [
+        ("a", "foo", 1),
+        (NULL_TASK_ID, RESUME, "yes"),
+        ("b", "foo", 2),
+        ("a", "bar", 3),
+    ]
+    assert writes.task_writes("a") == [("a", "foo", 1), ("a", "bar", 3)]
+    assert writes.channel_writes("foo") == [("a", "foo", 1), ("b", "foo", 2)]
+    assert writes.find("a", "bar") == ("a", "bar", 3)
+    assert writes.find("b", "bar") is None
+    assert writes.null_resume == (NULL_TASK_ID, RESUME, "yes")
+
+    # replacing keeps the order of other writes
+    writes.replace_task("a", [("a", "baz", 4)])
+    assert writes == [
+        (NULL_TASK_ID, RESUME, "yes"),
+        ("b", "foo", 2),
+        ("a", "baz", 4),
+    ]
+    assert writes.task_writes("a") == [("a", "baz", 4)]
+    assert writes.channel_writes("foo") == [("b", "foo", 2)]
+
+    writes.remove((NULL_TASK_ID, RESUME, "yes"))
+    assert writes.null_resume is None
+    assert writes.task_writes(NULL_TASK_ID) == ()
+    writes.clear()
+    assert writes.task_writes("b") == ()
+
+
+def test_prepare_next_tasks_config_template() -> None:
+    graph = (
+        StateGraph(dict)
+        .add_node("work", lambda s: s, metadata={"kind": "worker"})
+        .set_entry_point("work")
+        .compile()
+    )
+    checkpoint = empty_checkpoint()
+    checkpoint["pending_sends"] = [Send("work", i) for i in range(3)]
+    config = {
+        CONF: {"checkpoint_ns": ""},
+        "metadata": {"user": "u"},
+        "tags": ["t"],
+    }
+    with ChannelsManager(graph.channels, checkpoint, config) as (channels, managed):
+        tasks = prepare_next_tasks(
+            checkpoint,
+            [],
+            graph.nodes,
+            channels,
+            managed,
+            config,
+            1,
+            for_execution=True,
+        )
+    assert len(tasks) == 3
+    configs = [t.config for t in tasks.values()]
+    # shared parts are built once, task specific parts are not shared
+    assert configs[0]["tags"] is configs[1]["tags"]
+    assert len({id(c[CONF]) for c in configs}) == 3
+    assert len({id(c["metadata"]) for c in configs}) == 3
+    for task_id, c in zip(tasks, configs):
+        assert c["run_name"] == "work"
+        assert c[CONF][CONFIG_KEY_TASK_ID] == task_id
+        assert c[CONF]["checkpoint_map"] == {"": checkpoint["id"]}
+        assert c["metadata"]["user"] == "u"
+        assert c["metadata"]["kind"] == "worker"
+        assert c["metadata"]["langgraph_checkpoint_ns"] == f"work:{task_id}"
@@ -1,3 +1,4 @@
+import copy
 import enum
 import functools
 import gc
@@ -18,6 +19,7 @@ from typing import Annotated, Any, Literal, Optional, Union, get_type_hints
 
 import httpx
 import pytest
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.language_models import GenericFakeChatModel
 from langchain_core.runnables import (
     RunnableConfig,
@@ -40,19 +42,28 @@ from langgraph.channels.last_value import LastValue
 from langgraph.channels.topic import Topic
 from langgraph.checkpoint.base import (
     BaseCheckpointSaver,
+    ChannelVersions,
     Checkpoint,
     CheckpointMetadata,
     CheckpointTuple,
 )
 from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 from langgraph.config import get_stream_writer
-from langgraph.constants import CONFIG_KEY_NODE_FINISHED, ERROR, PULL, START
+from langgraph.constants import (
+    CONFIG_KEY_NODE_FINISHED,
+    ERROR,
+    INTERRUPT,
+    PULL,
+    START,
+)
 from langgraph.errors import InvalidUpdateError
 from langgraph.func import entrypoint, task
 from langgraph.graph import END, Graph, StateGraph
 from langgraph.graph.message import MessageGraph, MessagesState, add_messages
 from langgraph.prebuilt.tool_node import ToolNode
 from langgraph.pregel import Channel, GraphRecursionError, Pregel, StateSnapshot
+from langgraph.pregel.executor import SharedExecutor
 from langgraph.pregel.loop import SyncPregelLoop
 from langgraph.pregel.retry import RetryPolicy
 from langgraph.pregel.runner import PregelRunner
@@ -64,7 +75,9 @@ from langgraph.types import (
     PregelTask,
     Send,
     StateUpdate,
+    StreamBuffer,
     StreamWriter,
+    TokenCoalescing,
     interrupt,
 )
 from tests.agents import AgentAction, AgentFinish
@@ -1817,6 +1830,14 @@ def test_invoke_checkpoint_three(
     assert cursored[0].config == thread_1_history[1].config
     # the last checkpoint
     assert thread_1_history[0].values["total"] == 16
+    # metadata-only history skips values and tasks
+    assert [
+        (c.config, c.metadata, c.created_at, c.parent_config, c.values, c.next)
+        for c in app.get_state_history(thread_1, metadata_only=True)
+    ] == [
+        (c.config, c.metadata, c.created_at, c.parent_config, {}, ())
+        for c in thread_1_history
+    ]
     # the first "loop" checkpoint
     assert thread_1_history[-2].values["total"] == 2
     # can get each checkpoint using aget with config
@@ -7519,6 +7540,38 @@ def test_tags_stream_mode_messages() -> None:
     ]
 
 
+def test_stream_mode_messages_coalescing() -> None:
+    def coalesced(coalescing: Optional[TokenCoalescing]) -> Pregel:
+        model = GenericFakeChatModel(messages=iter(["a b c d e f g h"]))
+        return (
+            StateGraph(MessagesState)
+            .add_node(
+                "call_model",
+                lambda state: {"messages": model.invoke(state["messages"])},
+            )
+            .add_edge(START, "call_model")
+            .compile(stream_coalescing=coalescing)
+        )
+
+    tokens = list(coalesced(None).stream({"messages": "hi"}, stream_mode="messages"))
+    assert len(tokens) == 15
+    graph = coalesced(TokenCoalescing(max_tokens=4, max_delay=60))
+    chunks = list(
+        graph.with_config(tags=["meow"]).stream(
+            {"messages": "hi"}, stream_mode="messages"
+        )
+    )
+    assert [c.content for c, _ in chunks] == ["a", " b c", " d e", " f g", " h"]
+    assert len({c.id for c, _ in chunks}) == 1
+    assert chunks[0][1]["tags"] == ["meow"]
+    assert all(meta == chunks[0][1] for _, meta in chunks)
+    # tokens held back longer than max_delay are emitted with the next one
+    graph = coalesced(TokenCoalescing(max_tokens=4, max_delay=0))
+    assert [
+        c.content for c, _ in graph.stream({"messages": "hi"}, stream_mode="messages")
+    ] == [c.content for c, _ in tokens]
+
+
 def test_stream_mode_messages_command() -> None:
     from langchain_core.messages import HumanMessage
 
@@ -7784,6 +7837,53 @@ def test_get_stream_writer() -> None:
     ]
 
 
+def test_stream_buffer() -> None:
+    class State(TypedDict):
+        foo: str
+
+    done = threading.Event()
+
+    def my_node(state):
+        writer = get_stream_writer()
+        for i in range(20):
+            writer(i)
+        done.set()
+        return state
+
+    builder = StateGraph(State).add_node(my_node).add_edge(START, "my_node")
+    stats = []
+
+    # producer waits for the consumer to catch up, no chunk is lost
+    graph = builder.compile(stream_buffer=StreamBuffer(3, on_stats=stats.append))
+    chunks = []
+    for c in graph.stream({"foo": "bar"}, stream_mode="custom"):
+        if not chunks:
+            time.sleep(0.1)
+        chunks.append(c)
+    assert chunks == list(range(20))
+    assert stats[-1].puts == 20
+    assert stats[-1].max_depth == 3
+    assert stats[-1].evicted == 0
+    assert stats[-1].blocked > 0
+
+    # oldest chunks are dropped while the consumer lags behind
+    done.clear()
+    graph = builder.compile(
+        stream_buffer=StreamBuffer(3, "drop", on_stats=stats.append)
+    )
+    chunks = []
+    for c in graph.stream({"foo": "bar"}, stream_mode="custom"):
+        if not chunks:
+            assert done.wait(1)
+        chunks.append(c)
+    assert chunks[-3:] == [17, 18, 19]
+    assert chunks == sorted(chunks)
+    assert stats[-1].puts == 20
+    assert stats[-1].max_depth == 3
+    assert stats[-1].evicted == 20 - len(chunks)
+    assert stats[-1].blocked == 0
+
+
 def test_stream_messages_dedupe_inputs() -> None:
     from langchain_core.messages import AIMessage
 
@@ -8769,3 +8869,272 @@ def test_get_graph_root_channel(snapshot: SnapshotAssertion) -> None:
 
     assert json.dumps(graph.get_graph().to_json(), indent=2) == snapshot
     assert graph.get_graph().draw_mermaid(with_styles=False) == snapshot
+
+
+def test_shared_executor() -> None:
+    class State(TypedDict):
+        items: Annotated[list[str], operator.add]
+
+    thread_names: set[str] = set()
+
+    def inner(state: State) -> State:
+        thread_names.add(threading.current_thread().name)
+        return {"items": ["inner"]}
+
+    subgraph = StateGraph(State).add_node(inner).add_edge(START, "inner").compile()
+
+    @task
+    def double(x: int) -> int:
+        return x * 2
+
+    @entrypoint()
+    def outer(n: int) -> list[int]:
+        thread_names.add(threading.current_thread().name)
+        return [f.result() for f in [double(i) for i in range(n)]]
+
+    def fanout(state: State) -> list[Send]:
+        return [Send("sub", {"items": []}), Send("func", {"items": []})]
+
+    def func(state: State) -> State:
+        thread_names.add(threading.current_thread().name)
+        return {"items": [str(outer.invoke(3))]}
+
+    graph = (
+        StateGraph(State)
+        .add_node("sub", subgraph)
+        .add_node(func)
+        .add_conditional_edges(START, fanout)
+        .compile()
+    )
+    with SharedExecutor(max_workers=2, warm=True) as executor:
+        assert len(executor._threads) == 2
+        graph.executor = executor
+        # concurrent runs, with nested runs falling back to their own thread pool
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(lambda _: graph.invoke({"items": []}), range(8)))
+        assert results == [{"items": ["inner", "[0, 2, 4]"]}] * 8
+        assert len(executor._threads) == 2
+        assert {n for n in thread_names if n.startswith("langgraph_")}
+
+
+def test_checkpoint_structural_sharing() -> None:
+    class State(TypedDict):
+        a: list[str]
+        b: str
+        c: str
+
+    saved: list[tuple[Checkpoint, Checkpoint, ChannelVersions]] = []
+
+    class RecordingSaver(InMemorySaver):
+        def put(self, config, checkpoint, metadata, new_versions):
+            saved.append((checkpoint, copy.deepcopy(checkpoint), new_versions))
+            return super().put(config, checkpoint, metadata, new_versions)
+
+    graph = (
+        StateGraph(State)
+        .add_node("one", lambda s: {"b": "one"})
+        .add_node("two", lambda s: {"c": "two"})
+        .add_edge(START, "one")
+        .add_edge("one", "two")
+        .compile(checkpointer=RecordingSaver())
+    )
+    config = {"configurable": {"thread_id": "1"}}
+    assert graph.invoke({"a": ["x"], "b": "", "c": ""}, config) == {
+        "a": ["x"],
+        "b": "one",
+        "c": "two",
+    }
+    assert len(saved) == 4
+    # snapshots passed to the saver are not modified by later steps
+    for checkpoint, at_put, _ in saved:
+        assert checkpoint == at_put
+    # unchanged channel values are shared between consecutive checkpoints
+    (_, _, _), (input_, _, _), (one, _, one_versions), (two, _, _) = saved
+    assert "a" not in one_versions
+    assert one["channel_values"]["a"] is input_["channel_values"]["a"]
+    assert two["channel_values"]["a"] is input_["channel_values"]["a"]
+    assert two["channel_values"]["b"] is one["channel_values"]["b"]
+    assert two["versions_seen"]["one"] is one["versions_seen"]["one"]
+    assert graph.get_state(config).values == {"a": ["x"], "b": "one", "c": "two"}
+
+
+def test_lazy_channel_values() -> None:
+    class State(TypedDict):
+        question: str
+        docs: list[str]
+        answer: str
+
+    class AnswerInput(TypedDict):
+        question: str
+
+    loaded: list[Any] = []
+
+    class RecordingSerializer(JsonPlusSerializer):
+        def loads_typed(self, data: tuple[str, bytes]) -> Any:
+            value = super().loads_typed(data)
+            loaded.append(value)
+            return value
+
+    def answer(state: AnswerInput) -> dict:
+        return {"answer": state["question"] + "!"}
+
+    graph = (
+        StateGraph(State)
+        .add_node("retrieve", lambda s: {"docs": ["doc"] * 100})
+        .add_node("respond", answer, input=AnswerInput)
+        .add_edge(START, "retrieve")
+        .add_edge("retrieve", "respond")
+        .compile(
+            checkpointer=InMemorySaver(serde=RecordingSerializer()),
+            interrupt_before=["respond"],
+        )
+    )
+    config = {"configurable": {"thread_id": "1"}}
+    graph.invoke({"question": "why"}, config)
+    loaded.clear()
+
+    # resuming only deserializes the channels read by the next step
+    assert [*graph.stream(None, config, stream_mode="updates")] == [
+        {"respond": {"answer": "why!"}}
+    ]
+    assert "why" in loaded
+    assert ["doc"] * 100 not in loaded
+
+    # the unchanged value is still saved in the next checkpoint
+    assert graph.get_state(config).values == {
+        "question": "why",
+        "docs": ["doc"] * 100,
+        "answer": "why!",
+    }
+
+
+def test_lazy_channel_values_run_output() -> None:
+    class State(TypedDict):
+        question: str
+        answer: str
+
+    class RecordingHandler(BaseCallbackHandler):
+        def __init__(self) -> None:
+            self.outputs: list[Any] = []
+
+        def on_chain_end(
+            self,
+            outputs: Any,
+            *,
+            parent_run_id: Optional[uuid.UUID] = None,
+            **kwargs: Any,
+        ) -> None:
+            if parent_run_id is None:
+                self.outputs.append(outputs)
+
+    graph = (
+        StateGraph(State)
+        .add_node("respond", lambda s: {"answer": s["question"] + "!"})
+        .add_edge(START, "respond")
+        .compile(checkpointer=InMemorySaver())
+    )
+    handler = RecordingHandler()
+    config = {"configurable": {"thread_id": "1"}, "callbacks": [handler]}
+    graph.invoke({"question": "why"}, config)
+    # callback handlers receive the final channel values as the run output
+    assert graph.invoke(None, config) == {"question": "why", "answer": "why!"}
+    assert handler.outputs == [
+        {"question": "why", "answer": "why!"},
+        {"question": "why", "answer": "why!"},
+    ]
+
+
+def test_put_writes_batch() -> None:
+    class State(TypedDict):
+        items: Annotated[list[int], operator.add]
+
+    batches: list[list[str]] = []
+    fail = True
+
+    class BatchingSaver(InMemorySaver):
+        def put_writes_batch(self, config, writes):
+            batches.append([task_id for task_id, _, _ in writes])
+            super().put_writes_batch(config, writes)
+
+    def worker(item: int) -> dict:
+        if item == 13 and fail:
+            # fail after the other tasks are done
+            time.sleep(0.2)
+            raise ValueError("unlucky")
+        time.sleep(0.01)
+        return {"items": [item]}
+
+    graph = (
+        StateGraph(State)
+        .add_node("worker", worker)
+        .add_conditional_edges(
+            START, lambda s: [Send("worker", i) for i in range(20)], ["worker"]
+        )
+        .compile(checkpointer=BatchingSaver())
+    )
+    config = {"configurable": {"thread_id": "1"}}
+    with pytest.raises(ValueError, match="unlucky"):
+        graph.invoke({"items": []}, config)
+
+    # writes of all tasks are saved in fewer round-trips, the error on its own
+    saved = graph.checkpointer.get_tuple(config)
+    assert sorted(v[0] for _, c, v in saved.pending_writes if c == "items") == [
+        i for i in range(20) if i != 13
+    ]
+    assert [c for _, c, _ in saved.pending_writes].count(ERROR) == 1
+    # the input task and the 19 workers that succeeded
+    assert sum(len(b) for b in batches) == 20
+    assert len(batches) < 21
+
+    # resuming only runs the failed task
+    fail = False
+    batches.clear()
+    assert sorted(graph.invoke(None, config)["items"]) == list(range(20))
+    assert batches == [[AnyStr()]]
+
+
+def test_put_writes_batch_interrupt() -> None:
+    class State(TypedDict):
+        items: Annotated[list[int], operator.add]
+
+    batches: list[list[str]] = []
+
+    class BatchingSaver(InMemorySaver):
+        def put_writes_batch(self, config, writes):
+            # slow, so that writes are still buffered when the run is interrupted
+            time.sleep(0.05)
+            batches.append([task_id for task_id, _, _ in writes])
+            super().put_writes_batch(config, writes)
+
+    def worker(item: int) -> dict:
+        if item == 7:
+            time.sleep(0.1)
+            interrupt("approve")
+        return {"items": [item]}
+
+    graph = (
+        StateGraph(State)
+        .add_node("worker", worker)
+        .add_conditional_edges(
+            START, lambda s: [Send("worker", i) for i in range(10)], ["worker"]
+        )
+        .compile(checkpointer=BatchingSaver())
+    )
+    config = {"configurable": {"thread_id": "1"}}
+    with SharedExecutor(max_workers=4) as executor:
+        graph.executor = executor
+        graph.invoke({"items": []}, config)
+
+        # writes of the interrupted run are saved by the time it returns
+        saved = graph.checkpointer.get_tuple(config)
+        assert sorted(v[0] for _, c, v in saved.pending_writes if c == "items") == [
+            i for i in range(10) if i != 7
+        ]
+        assert [c for _, c, _ in saved.pending_writes].count(INTERRUPT) == 1
+        # the input task and the 9 workers that finished
+        assert sum(len(b) for b in batches) == 10
+
+        # resuming only runs the interrupted task
+        assert sorted(graph.invoke(Command(resume="yes"), config)["items"]) == list(
+            range(10)
+        )
@@ -45,7 +45,14 @@ from langgraph.checkpoint.base import (
     CheckpointTuple,
 )
 from langgraph.checkpoint.memory import InMemorySaver
-from langgraph.constants import CONFIG_KEY_NODE_FINISHED, ERROR, PULL, PUSH, START
+from langgraph.constants import (
+    CONFIG_KEY_NODE_FINISHED,
+    ERROR,
+    INTERRUPT,
+    PULL,
+    PUSH,
+    START,
+)
 from langgraph.errors import InvalidUpdateError, NodeInterrupt
 from langgraph.func import entrypoint, task
 from langgraph.graph import END, Graph, StateGraph
@@ -63,7 +70,9 @@ from langgraph.types import (
     PregelTask,
     Send,
     StateUpdate,
+    StreamBuffer,
     StreamWriter,
+    TokenCoalescing,
     interrupt,
 )
 from tests.any_str import AnyStr, AnyVersion, FloatBetween, UnsortedSequence
@@ -4119,6 +4128,14 @@ async def test_invoke_checkpoint_three(
             thread_1_history[0].config["configurable"]["checkpoint_id"]
             > thread_1_history[1].config["configurable"]["checkpoint_id"]
         )
+        # metadata-only history skips values and tasks
+        assert [
+            (c.config, c.metadata, c.created_at, c.parent_config, c.values, c.next)
+            async for c in app.aget_state_history(thread_1, metadata_only=True)
+        ] == [
+            (c.config, c.metadata, c.created_at, c.parent_config, {}, ())
+            for c in thread_1_history
+        ]
         # cursor pagination
         cursored = [
             c
@@ -8361,6 +8378,96 @@ async def test_tags_stream_mode_messages() -> None:
     ]
 
 
+async def test_stream_buffer() -> None:
+    class State(TypedDict):
+        foo: str
+
+    def sync_node(state: State, writer: StreamWriter):
+        for i in range(20):
+            writer(i)
+        return state
+
+    async def async_node(state: State, writer: StreamWriter):
+        for i in range(20):
+            writer(i)
+        return state
+
+    stats = []
+
+    # sync nodes wait for the consumer to catch up, no chunk is lost
+    graph = (
+        StateGraph(State)
+        .add_node(sync_node)
+        .add_edge(START, "sync_node")
+        .compile(stream_buffer=StreamBuffer(3, on_stats=stats.append))
+    )
+    chunks = []
+    async for c in graph.astream({"foo": "bar"}, stream_mode="custom"):
+        if not chunks:
+            await asyncio.sleep(0.1)
+        chunks.append(c)
+    assert chunks == list(range(20))
+    assert stats[-1].puts == 20
+    assert stats[-1].max_depth == 3
+    assert stats[-1].evicted == 0
+    assert stats[-1].blocked > 0
+
+    # oldest chunks are dropped while the consumer lags behind
+    graph = (
+        StateGraph(State)
+        .add_node(async_node)
+        .add_edge(START, "async_node")
+        .compile(stream_buffer=StreamBuffer(3, "drop", on_stats=stats.append))
+    )
+    chunks = [c async for c in graph.astream({"foo": "bar"}, stream_mode="custom")]
+    assert chunks[-3:] == [17, 18, 19]
+    assert chunks == sorted(chunks)
+    assert stats[-1].puts == 20
+    assert stats[-1].max_depth == 3
+    assert stats[-1].evicted == 20 - len(chunks)
+    assert stats[-1].blocked == 0
+
+
+async def test_stream_mode_messages_coalescing() -> None:
+    def coalesced(coalescing: Optional[TokenCoalescing]) -> Pregel:
+        model = GenericFakeChatModel(messages=iter(["a b c d e f g h"]))
+
+        async def call_model(state, config):
+            return {"messages": await model.ainvoke(state["messages"], config)}
+
+        return (
+            StateGraph(MessagesState)
+            .add_node(call_model)
+            .add_edge(START, "call_model")
+            .compile(stream_coalescing=coalescing)
+        )
+
+    tokens = [
+        c
+        async for c in coalesced(None).astream(
+            {"messages": "hi"}, stream_mode="messages"
+        )
+    ]
+    assert len(tokens) == 15
+    graph = coalesced(TokenCoalescing(max_tokens=4, max_delay=60))
+    chunks = [
+        c
+        async for c in graph.with_config(tags=["meow"]).astream(
+            {"messages": "hi"}, stream_mode="messages"
+        )
+    ]
+    assert [c.content for c, _ in chunks] == ["a", " b c", " d e", " f g", " h"]
+    assert len({c.id for c, _ in chunks}) == 1
+    assert chunks[0][1]["tags"] == ["meow"]
+    assert all(meta == chunks[0][1] for _, meta in chunks)
+    # tokens held back longer than max_delay are emitted with the next one
+    graph = coalesced(TokenCoalescing(max_tokens=4, max_delay=0))
+    assert [
+        c.content
+        async for c, _ in graph.astream({"messages": "hi"}, stream_mode="messages")
+    ] == [c.content for c, _ in tokens]
+
+
 async def test_stream_mode_messages_command() -> None:
     from langchain_core.messages import HumanMessage
 
@@ -9148,3 +9255,97 @@ async def test_draw_invalid():
             {"source": "nothing", "target": "__end__"},
         ],
     }
+
+
+async def test_aput_writes_batch() -> None:
+    class State(TypedDict):
+        items: Annotated[list[int], operator.add]
+
+    batches: list[list[str]] = []
+    fail = True
+
+    class BatchingSaver(InMemorySaver):
+        async def aput_writes_batch(self, config, writes):
+            batches.append([task_id for task_id, _, _ in writes])
+            await super().aput_writes_batch(config, writes)
+
+    async def worker(item: int) -> dict:
+        if item == 13 and fail:
+            # fail after the other tasks are done
+            await asyncio.sleep(0.2)
+            raise ValueError("unlucky")
+        await asyncio.sleep(0.01)
+        return {"items": [item]}
+
+    graph = (
+        StateGraph(State)
+        .add_node("worker", worker)
+        .add_conditional_edges(
+            START, lambda s: [Send("worker", i) for i in range(20)], ["worker"]
+        )
+        .compile(checkpointer=BatchingSaver())
+    )
+    config = {"configurable": {"thread_id": "1"}}
+    with pytest.raises(ValueError, match="unlucky"):
+        await graph.ainvoke({"items": []}, config)
+
+    # writes of all tasks are saved in fewer round-trips, the error on its own
+    saved = await graph.checkpointer.aget_tuple(config)
+    assert sorted(v[0] for _, c, v in saved.pending_writes if c == "items") == [
+        i for i in range(20) if i != 13
+    ]
+    assert [c for _, c, _ in saved.pending_writes].count(ERROR) == 1
+    # the input task and the 19 workers that succeeded
+    assert sum(len(b) for b in batches) == 20
+    assert len(batches) < 21
+
+    # resuming only runs the failed task
+    fail = False
+    batches.clear()
+    assert sorted((await graph.ainvoke(None, config))["items"]) == list(range(20))
+    assert batches == [[AnyStr()]]
+
+
+async def test_aput_writes_batch_interrupt() -> None:
+    class State(TypedDict):
+        items: Annotated[list[int], operator.add]
+
+    batches: list[list[str]] = []
+
+    class BatchingSaver(InMemorySaver):
+        async def aput_writes_batch(self, config, writes):
+            # slow, so that writes are still buffered when the run is interrupted
+            await asyncio.sleep(0.05)
+            batches.append([task_id for task_id, _, _ in writes])
+            await super().aput_writes_batch(config, writes)
+
+    async def worker(item: int) -> dict:
+        if item == 7:
+            await asyncio.sleep(0.1)
+            interrupt("approve")
+        return {"items": [item]}
+
+    graph = (
+        StateGraph(State)
+        .add_node("worker", worker)
+        .add_conditional_edges(
+            START, lambda s: [Send("worker", i) for i in range(10)], ["worker"]
+        )
+        .compile(checkpointer=BatchingSaver())
+    )
+    config = {"configurable": {"thread_id": "1"}}
+    await graph.ainvoke({"items": []}, config)
+
+    # writes of the interrupted run are saved by the time it returns
+    saved = await graph.checkpointer.aget_tuple(config)
+    assert sorted(v[0] for _, c, v in saved.pending_writes if c == "items") == [
+        i for i in range(10) if i != 7
+    ]
+    assert [c for _, c, _ in saved.pending_writes].count(INTERRUPT) == 1
+    # the input task and the 9 workers that finished
+    assert sum(len(b) for b in batches) == 10
+
+    # resuming only runs the interrupted task
+    assert sorted(
+        (await graph.ainvoke(Command(resume="yes"), config))["items"]
+    ) == list(range(10))
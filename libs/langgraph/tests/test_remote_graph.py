@@ -306,6 +306,11 @@ def test_get_state_history():
         interrupts=(),
     )
 
+    # with metadata_only, values and next are left empty, as with Pregel
+    assert list(remote_pregel.get_state_history(config, metadata_only=True)) == [
+        state_history_snapshot[0]._replace(values={}, next=(), tasks=(), interrupts=())
+    ]
+
 
 @pytest.mark.anyio
 async def test_aget_state_history():
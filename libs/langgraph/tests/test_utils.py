@@ -19,12 +19,14 @@ from typing_extensions import NotRequired, Required, TypedDict
 
 from langgraph.graph import END, StateGraph
 from langgraph.graph.graph import CompiledGraph
+from langgraph.types import StreamBuffer
 from langgraph.utils.config import _is_not_empty
 from langgraph.utils.fields import (
     _is_optional_type,
     get_enhanced_type_hints,
     get_field_default,
 )
+from langgraph.utils.queue import AsyncQueue, QueueStats, SyncQueue
 from langgraph.utils.runnable import (
     is_async_callable,
     is_async_generator,
@@ -298,3 +300,39 @@ def test_is_not_empty() -> None:
     assert not _is_not_empty([])
     assert not _is_not_empty(())
     assert not _is_not_empty({})
+
+
+def test_stream_buffer_coalesce() -> None:
+    buffer = StreamBuffer(2, "coalesce")
+    chunks = [
+        ((), "values", 1),
+        (("sub",), "values", 1),
+        # replaces the oldest values chunk of the same namespace
+        ((), "values", 2),
+        (("sub",), "values", 2),
+        # nothing to coalesce, buffered beyond maxsize
+        ((), "updates", 3),
+    ]
+    expected = [
+        ((), "values", 2),
+        (("sub",), "values", 2),
+        ((), "updates", 3),
+    ]
+
+    sync_queue = SyncQueue(2, evict=buffer.evict)
+    for c in chunks:
+        sync_queue.put(c, block=False)
+    assert [sync_queue.get(block=False) for _ in range(3)] == expected
+    assert sync_queue.empty()
+    assert sync_queue.stats() == QueueStats(
+        puts=5, max_depth=3, evicted=2, blocked=0, blocked_time=0.0
+    )
+
+    async_queue = AsyncQueue(2, evict=buffer.evict)
+    for c in chunks:
+        async_queue.put_nowait(c)
+    assert [async_queue.get_nowait() for _ in range(3)] == expected
+    assert async_queue.empty()
+    assert async_queue.stats() == QueueStats(
+        puts=5, max_depth=3, evicted=2, blocked=0, blocked_time=0.0
+    )